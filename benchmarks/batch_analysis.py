@@ -0,0 +1,86 @@
+"""
+Benchmark del análisis por lotes (tools/batch_analyzer.py).
+
+Analiza N documentos markdown sintéticos de tamaño variable de una vez con
+``analyze_batch`` y, como referencia, uno a uno con ``ContentAnalyzerTool``
+(sin caché de párrafos). Comprueba sobre una muestra que las métricas por
+documento coinciden con las de la herramienta.
+
+Uso:
+    python -m benchmarks.batch_analysis --documents 5000 --min-words 200 --max-words 1500
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import AcademicConfig
+from tools.content_analyzer import ContentAnalyzerTool
+from tools.document_model import ParsedDocument
+from benchmarks.content_analysis import build_document
+
+# Métricas de la tabla por lotes y la sección de ContentAnalyzerTool que las calcula
+CHECKED_METRICS = {
+    "_get_content_metrics": ["word_count", "sentence_count", "paragraph_count", "average_words_per_sentence"],
+    "_extract_keywords": ["total_unique_words", "keyword_density"],
+    "_analyze_content_structure": ["headers_count", "bullet_points", "links_count", "has_good_structure"],
+    "_calculate_readability": ["flesch_score", "reading_level", "avg_syllables_per_word"],
+    "_analyze_seo_factors": ["seo_score", "has_intro", "has_conclusion"]
+}
+
+
+def mismatches(tool: ContentAnalyzerTool, documents: list, rows: list) -> int:
+    """Documentos cuyas métricas por lotes difieren de las de la herramienta"""
+    failed = 0
+    for content, row in zip(documents, rows):
+        doc = ParsedDocument(content)
+        for section, names in CHECKED_METRICS.items():
+            expected = getattr(tool, section)(doc)
+            if "error" not in expected and any(expected[name] != row[name] for name in names):
+                failed += 1
+                break
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del análisis por lotes")
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--min-words", type=int, default=200)
+    parser.add_argument("--max-words", type=int, default=1500)
+    parser.add_argument("--sample", type=int, default=500, help="Documentos analizados también uno a uno")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    documents = [build_document(rng.randint(args.min_words, args.max_words), seed=i) for i in range(args.documents)]
+    AcademicConfig.CONTENT_ANALYSIS["paragraph_cache_size"] = 0
+    tool = ContentAnalyzerTool()
+
+    start = time.perf_counter()
+    analysis = tool.analyze_batch(documents)
+    batch_seconds = time.perf_counter() - start
+
+    sample = documents[:args.sample]
+    start = time.perf_counter()
+    for content in sample:
+        tool._run(content)
+    per_document_seconds = (time.perf_counter() - start) / max(len(sample), 1)
+
+    rows = analysis.rows()
+    print(json.dumps({
+        "documents": args.documents,
+        "total_words": analysis.aggregates()["total_words"],
+        "vocabulary_size": analysis.term_matrix.shape[1],
+        "matrix_nonzeros": int(analysis.term_matrix.data.size),
+        "batch_seconds": round(batch_seconds, 2),
+        "one_by_one_seconds_estimated": round(per_document_seconds * args.documents, 2),
+        "speedup": round(per_document_seconds * args.documents / batch_seconds, 2),
+        "sample_mismatches": mismatches(tool, sample, rows[:args.sample])
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
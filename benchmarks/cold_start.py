@@ -0,0 +1,101 @@
+"""
+Benchmark reproducible del cold start del entry point de Lambda.
+
+Cada medición se hace en un intérprete nuevo (``python -X importtime``) para
+reportar el tiempo de import por módulo y el tiempo total de inicialización
+hasta servir la primera respuesta de cada acción ligera.
+
+Uso:
+    python -m benchmarks.cold_start --runs 5
+    python -m benchmarks.cold_start --max-init-ms 250   # falla si hay regresión
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Evento que se sirve tras importar el entry point en cada escenario
+SCENARIOS = {
+    "options_preflight": {"httpMethod": "OPTIONS"},
+    "health_check": {"action": "health_check"},
+    "get_status": {"action": "get_status"}
+}
+
+# Módulos que no deberían cargarse para las acciones ligeras
+HEAVY_MODULES = ("crewai", "langchain", "langchain_community", "langchain_openai", "nltk",
+                 "agents", "tools", "crew.content_crew")
+
+SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import lambda_function
+imported = time.perf_counter()
+lambda_function.lambda_handler(json.loads(sys.argv[1]), None)
+served = time.perf_counter()
+heavy = sorted(m for m in sys.modules if m.split('.')[0] in {heavy_roots} or m in {heavy_full})
+print(json.dumps({{"import_ms": (imported - start) * 1000, "init_ms": (served - start) * 1000, "heavy_modules": heavy}}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( +)(\S+)")
+
+
+def run_scenario(event: dict) -> dict:
+    """Ejecuta un escenario en un proceso nuevo y parsea -X importtime"""
+    roots = {m for m in HEAVY_MODULES if "." not in m}
+    full = {m for m in HEAVY_MODULES if "." in m}
+    code = SNIPPET.format(heavy_roots=repr(roots), heavy_full=repr(full))
+
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, json.dumps(event)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+    modules = {}
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            _, cumulative, _, module = match.groups()
+            modules[module] = int(cumulative) / 1000
+
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["slowest_imports_ms"] = dict(sorted(modules.items(), key=lambda item: -item[1])[:15])
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de cold start del entry point")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-init-ms", type=float, default=None,
+                        help="Umbral de regresión para la mediana de init_ms")
+    args = parser.parse_args()
+
+    report = {}
+    failed = False
+
+    for name, event in SCENARIOS.items():
+        runs = [run_scenario(event) for _ in range(args.runs)]
+        init_median = statistics.median(run["init_ms"] for run in runs)
+        heavy = runs[-1]["heavy_modules"]
+
+        report[name] = {
+            "import_ms_median": round(statistics.median(run["import_ms"] for run in runs), 2),
+            "init_ms_median": round(init_median, 2),
+            "heavy_modules_loaded": heavy,
+            "slowest_imports_ms": runs[-1]["slowest_imports_ms"]
+        }
+
+        if heavy or (args.max_init_ms is not None and init_median > args.max_init_ms):
+            failed = True
+
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark del análisis completo de ContentAnalyzerTool.
+
+Compara la implementación actual con la de una revisión anterior de
+``tools/content_analyzer.py`` (por defecto la previa al modelo de documento
+analizado una sola vez), sobre documentos markdown sintéticos de distintos
+tamaños, y comprueba que ambas producen exactamente el mismo resultado.
+
+Con ``--drafts N`` mide además el re-análisis de N borradores sucesivos que
+solo cambian en un párrafo, con y sin la caché de párrafos.
+
+Uso:
+    python -m benchmarks.content_analysis --words 5000 50000 --repeat 5 --drafts 10
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config.settings import AcademicConfig
+from tools.content_analyzer import ContentAnalyzerTool
+import tools.paragraph_cache as paragraph_cache
+
+# Última revisión en la que cada métrica volvía a partir y recorrer el texto
+BASELINE_REF = "e113a04"
+
+VOCABULARY = ("content marketing strategy digital seo brand engagement analytics roi conversion automation "
+              "personalization video blog email influencer campaign audience customer experience data insights "
+              "trends growth optimization performance metrics the a of to and in for with is are datos tendencia "
+              "ejemplo futuro acción estrategia contenido").split()
+
+
+def build_document(words: int, seed: int = 7) -> str:
+    """Documento markdown con headers, párrafos, listas, enlaces y formato"""
+    rng = random.Random(seed)
+    blocks, written, section = [], 0, 0
+    while written < words:
+        if written % 600 < 100:
+            section += 1
+            blocks.append(f"## Sección {section}: {' '.join(rng.choices(VOCABULARY, k=4))}")
+        sentences = []
+        for _ in range(rng.randint(3, 6)):
+            sentence = rng.choices(VOCABULARY, k=rng.randint(8, 22))
+            if rng.random() < 0.1:
+                sentence.append(f"**{rng.choice(VOCABULARY)}**")
+            if rng.random() < 0.05:
+                sentence.append(f"https://example.com/{rng.randint(1, 999)}")
+            if rng.random() < 0.1:
+                sentence.append(f"{rng.randint(1, 99)}%")
+            sentences.append(" ".join(sentence).capitalize() + rng.choice([".", ".", "!", "?"]))
+            written += len(sentence)
+        blocks.append(" ".join(sentences))
+        if rng.random() < 0.2:
+            blocks.append("\n".join(f"- {' '.join(rng.choices(VOCABULARY, k=6))}" for _ in range(4)))
+            written += 24
+    return "\n\n".join(blocks)
+
+
+def load_baseline(ref: str) -> types.ModuleType:
+    """Carga ``tools/content_analyzer.py`` tal como estaba en ``ref``"""
+    source = subprocess.run(["git", "show", f"{ref}:tools/content_analyzer.py"], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout
+    module = types.ModuleType("baseline_content_analyzer")
+    exec(compile(source, f"{ref}:tools/content_analyzer.py", "exec"), module.__dict__)
+    return module
+
+
+def measure(tool, content: str, repeat: int):
+    timings, output = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = tool._run(content)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), output
+
+
+def build_drafts(content: str, drafts: int, seed: int = 11) -> list:
+    """Borradores sucesivos: cada uno amplía un párrafo al azar del anterior"""
+    rng = random.Random(seed)
+    blocks, versions = content.split("\n\n"), []
+    for _ in range(drafts):
+        index = rng.randrange(len(blocks))
+        blocks[index] += " Frase añadida en la revisión del borrador."
+        versions.append("\n\n".join(blocks))
+    return versions
+
+
+def use_paragraph_cache(size: int) -> None:
+    """Activa una caché de párrafos nueva de ``size`` entradas (0 la desactiva)"""
+    AcademicConfig.CONTENT_ANALYSIS["paragraph_cache_size"] = size
+    paragraph_cache._paragraph_cache = None
+
+
+def measure_drafts(content: str, drafts: int, cache_size: int):
+    """Latencia mediana por borrador sin caché de párrafos y con una caché nueva"""
+    tool, versions, results = ContentAnalyzerTool(), build_drafts(content, drafts), {}
+    for label, size in (("uncached", 0), ("cached", cache_size)):
+        use_paragraph_cache(size)
+        tool._run(content)
+        timings, outputs = [], []
+        for version in versions:
+            start = time.perf_counter()
+            outputs.append(tool._run(version))
+            timings.append((time.perf_counter() - start) * 1000)
+        results[label] = {"median_ms": round(statistics.median(timings), 2), "outputs": outputs}
+        if size:
+            stats = paragraph_cache.get_paragraph_cache_stats()
+            results[label].update(hit_rate=stats["hit_rate"], saved_ms_per_call=round(stats["saved_ms"] / drafts, 2))
+    use_paragraph_cache(0)
+
+    identical = results["uncached"].pop("outputs") == results["cached"].pop("outputs")
+    return {**results, "speedup": round(results["uncached"]["median_ms"] / results["cached"]["median_ms"], 2),
+            "identical_output": identical}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del análisis de contenido")
+    parser.add_argument("--words", type=int, nargs="+", default=[5000, 50000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline-ref", default=BASELINE_REF)
+    parser.add_argument("--drafts", type=int, default=0, help="Borradores sucesivos a re-analizar (0 = no medir)")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline_ref).ContentAnalyzerTool()
+    current = ContentAnalyzerTool()
+    # La comparación con la revisión anterior mide el análisis completo, sin caché de párrafos
+    cache_size = AcademicConfig.CONTENT_ANALYSIS["paragraph_cache_size"] or 4096
+    use_paragraph_cache(0)
+
+    results = {}
+    for words in args.words:
+        content = build_document(words)
+        baseline_ms, baseline_output = measure(baseline, content, args.repeat)
+        current_ms, current_output = measure(current, content, args.repeat)
+        results[str(words)] = {
+            "baseline_ms": round(baseline_ms, 2),
+            "current_ms": round(current_ms, 2),
+            "speedup": round(baseline_ms / current_ms, 2),
+            "identical_output": baseline_output == current_output
+        }
+        if args.drafts:
+            results[str(words)]["drafts"] = measure_drafts(content, args.drafts, cache_size)
+
+    print(json.dumps({"baseline_ref": args.baseline_ref, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark del backend de búsqueda local (índice BM25 mapeado en memoria).
+
+Genera un corpus sintético, construye el índice y mide: tiempo de
+construcción, tiempo de carga de un índice existente (lo que paga un
+arranque en frío), latencia de consulta, coste de indexar unos pocos
+documentos nuevos de forma incremental y, como referencia, la latencia de
+recorrer todos los documentos en memoria contando términos.
+
+Uso:
+    python -m benchmarks.local_search --documents 5000 --queries 200
+"""
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.bm25_index import BM25Index
+
+TOPIC_WORDS = ("content marketing strategy video seo engagement conversion roi analytics influencer social media "
+               "personalization automation storytelling audience brand email newsletter webinar podcast b2b b2c "
+               "funnel retention budget report survey benchmark trend campaign search ranking backlinks keyword "
+               "interactive user generated community ai generative copywriting distribution channel").split()
+# Vocabulario con frecuencias tipo Zipf, como el de un corpus real: pocos términos muy comunes y una cola larga
+VOCABULARY = TOPIC_WORDS + [f"term{i}" for i in range(20000)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def write_corpus(directory: str, count: int, start: int = 0, words: int = 400) -> None:
+    rng = random.Random(start)
+    for i in range(start, start + count):
+        body = " ".join(rng.choices(VOCABULARY, weights=WEIGHTS, k=words))
+        with open(os.path.join(directory, f"doc-{i:06d}.md"), "w", encoding="utf-8") as f:
+            f.write(f"# Documento {i}\n{body}.\n")
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del índice BM25 local")
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--incremental", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    queries = [" ".join(rng.sample(TOPIC_WORDS, 2) + rng.sample(VOCABULARY[len(TOPIC_WORDS):2000], 1))
+               for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        corpus, index_path = os.path.join(workdir, "corpus"), os.path.join(workdir, "index")
+        os.makedirs(corpus)
+        write_corpus(corpus, args.documents)
+
+        start = time.perf_counter()
+        index = BM25Index(index_path)
+        index.update(corpus)
+        build_seconds = time.perf_counter() - start
+        index.close()
+
+        start = time.perf_counter()
+        index = BM25Index(index_path)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            index.search(query, 10)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        write_corpus(corpus, args.incremental, start=args.documents)
+        start = time.perf_counter()
+        changes = index.update(corpus)
+        incremental_ms = (time.perf_counter() - start) * 1000
+        stats = index.get_stats()
+        index.close()
+
+        # Referencia: recorrer los documentos en memoria contando términos en cada consulta
+        documents = []
+        for filename in os.listdir(corpus):
+            with open(os.path.join(corpus, filename), encoding="utf-8") as f:
+                documents.append(Counter(re.findall(r'\w+', f.read().lower())))
+        scan_latencies = []
+        for query in queries[:20]:
+            start = time.perf_counter()
+            terms = query.split()
+            sorted((sum(counts[term] for term in terms) for counts in documents), reverse=True)[:10]
+            scan_latencies.append((time.perf_counter() - start) * 1000)
+
+    print(json.dumps({
+        "documents": args.documents,
+        "build_seconds": round(build_seconds, 2),
+        "load_ms": round(load_ms, 2),
+        "query_p50_ms": round(statistics.median(latencies), 2),
+        "query_p95_ms": round(percentile(latencies, 0.95), 2),
+        "scan_p50_ms": round(statistics.median(scan_latencies), 2),
+        "incremental": {"changes": changes, "ms": round(incremental_ms, 1)},
+        "index": stats
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark de búsquedas múltiples contra un servidor local que imita a Serper.
+
+Compara el camino anterior (un ``requests.post`` bloqueante por consulta,
+una conexión nueva cada vez, en serie) con ``run_many`` (fan-out concurrente
+sobre la sesión aiohttp compartida de ``SerperClient``).
+
+Uso:
+    python -m benchmarks.search_fanout --queries 10 25 50 --latency-ms 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from aiohttp import web
+
+from tools.serper_client import SerperClient
+
+
+def start_stand_in_server(latency_ms: float) -> str:
+    """Arranca un servidor tipo Serper en un hilo de fondo y devuelve su URL"""
+    async def search(request: web.Request) -> web.Response:
+        payload = await request.json()
+        await asyncio.sleep(latency_ms / 1000)
+        organic = [
+            {"title": f"{payload['q']} #{i}", "link": f"https://example.com/{i}", "snippet": "Lorem ipsum " * 10}
+            for i in range(payload.get("num", 10))
+        ]
+        return web.json_response({"organic": organic})
+
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    address = {}
+
+    async def serve():
+        app = web.Application()
+        app.router.add_post("/search", search)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        address["port"] = site._server.sockets[0].getsockname()[1]
+        ready.set()
+
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    asyncio.run_coroutine_threadsafe(serve(), loop)
+    ready.wait()
+    return f"http://127.0.0.1:{address['port']}/search"
+
+
+def run_sequential(endpoint: str, queries: list) -> float:
+    """Camino anterior: una petición bloqueante y una conexión nueva por consulta"""
+    start = time.perf_counter()
+    for query in queries:
+        response = requests.post(endpoint, json={"q": query, "num": 10, "gl": "us", "hl": "en"},
+                                 headers={"X-API-KEY": "bench", "Content-Type": "application/json"})
+        response.raise_for_status()
+        response.json()
+    return time.perf_counter() - start
+
+
+def run_concurrent(client: SerperClient, queries: list) -> float:
+    """Camino de run_many: fan-out concurrente sobre la sesión compartida"""
+    start = time.perf_counter()
+    results = client.search_many([{"q": query, "num": 10, "gl": "us", "hl": "en"} for query in queries], "bench")
+    errors = [result for result in results if isinstance(result, Exception)]
+    if errors:
+        raise errors[0]
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de búsquedas concurrentes")
+    parser.add_argument("--queries", type=int, nargs="+", default=[10, 25, 50])
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    endpoint = start_stand_in_server(args.latency_ms)
+    client = SerperClient(endpoint, timeout_seconds=30, max_concurrency=args.concurrency)
+    client.search_many([{"q": "warmup"}], "bench")  # Abre el pool de conexiones
+
+    results = {}
+    for count in args.queries:
+        queries = [f"content marketing trend {i}" for i in range(count)]
+        sequential = run_sequential(endpoint, queries)
+        concurrent = run_concurrent(client, queries)
+        results[str(count)] = {
+            "sequential_seconds": round(sequential, 3),
+            "run_many_seconds": round(concurrent, 3),
+            "sequential_qps": round(count / sequential, 1),
+            "run_many_qps": round(count / concurrent, 1),
+            "speedup": round(sequential / concurrent, 1)
+        }
+
+    client.close()
+    print(json.dumps({"latency_ms": args.latency_ms, "concurrency": args.concurrency, "results": results},
+                     indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark de tokens de los resultados de búsqueda que recibe el agente.
+
+Sobre un conjunto grabado de respuestas de Serper (con el texto extraído de
+las páginas de los primeros resultados) compara el formato anterior (un
+f-string multilínea con sangría por resultado) con el formato compacto de
+``render_results``, sin presupuesto y con el presupuesto configurado.
+
+``benchmarks/data/search_queries.json`` es una muestra con la forma de las
+respuestas de Serper; ``--record`` la regraba con respuestas reales
+(requiere SERPER_API_KEY).
+
+Uso:
+    python -m benchmarks.search_tokens --budget 1500
+    python -m benchmarks.search_tokens --record
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.tokens import count_tokens
+from tools.result_renderer import render_results
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "search_queries.json")
+
+
+def legacy_format(data: dict, pages: dict) -> str:
+    """Formato anterior de WebSearchTool._format_results"""
+    results = []
+    for result in data.get('organic', []):
+        entry = f"""
+                Título: {result.get('title', 'N/A')}
+                URL: {result.get('link', 'N/A')}
+                Snippet: {result.get('snippet', 'N/A')}
+                """
+        page_text = pages.get(result.get('link'))
+        if page_text:
+            entry += f"Contenido de la página:\n{page_text}\n"
+        results.append(entry)
+    for news in data.get('news', [])[:3]:
+        results.append(f"""
+                [NOTICIA] Título: {news.get('title', 'N/A')}
+                URL: {news.get('link', 'N/A')}
+                Snippet: {news.get('snippet', 'N/A')}
+                Fecha: {news.get('date', 'N/A')}
+                """)
+    return "\n".join(results) if results else "No se encontraron resultados"
+
+
+def record(path: str) -> None:
+    """Regraba las consultas del conjunto con respuestas reales de Serper y las páginas descargadas"""
+    from tools.serper_client import get_serper_client
+    from tools.web_search_tool import WebSearchTool
+
+    with open(path, encoding="utf-8") as f:
+        queries = [item["query"] for item in json.load(f)]
+
+    payloads = [WebSearchTool._build_payload(query, 10) for query in queries]
+    responses = get_serper_client().search_many(payloads, os.environ["SERPER_API_KEY"])
+    errors = [response for response in responses if isinstance(response, Exception)]
+    if errors:
+        raise errors[0]
+    pages = WebSearchTool._fetch_top_pages(responses)
+
+    recorded = []
+    for query, response in zip(queries, responses):
+        links = {result.get('link') for result in response.get('organic', [])}
+        recorded.append({"query": query, "response": response,
+                         "pages": {url: text for url, text in pages.items() if url in links}})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(recorded, f, indent=1, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de tokens de resultados de búsqueda")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--budget", type=int, default=1500)
+    parser.add_argument("--snippet-chars", type=int, default=300)
+    parser.add_argument("--page-chars", type=int, default=1200)
+    parser.add_argument("--record", action="store_true")
+    args = parser.parse_args()
+
+    if args.record:
+        record(args.data)
+
+    with open(args.data, encoding="utf-8") as f:
+        recorded = json.load(f)
+
+    totals = {"legacy": 0, "compact": 0, "budgeted": 0}
+    queries = {}
+    for item in recorded:
+        legacy = count_tokens(legacy_format(item["response"], item["pages"]))
+        compact = render_results(item["response"], item["pages"], snippet_chars=args.snippet_chars,
+                                 page_chars=args.page_chars)[1]
+        _, budgeted, dropped = render_results(item["response"], item["pages"], token_budget=args.budget,
+                                              snippet_chars=args.snippet_chars, page_chars=args.page_chars)
+        queries[item["query"]] = {"legacy_tokens": legacy, "compact_tokens": compact,
+                                  "budgeted_tokens": budgeted, "results_dropped": dropped}
+        totals["legacy"] += legacy
+        totals["compact"] += compact
+        totals["budgeted"] += budgeted
+
+    print(json.dumps({
+        "queries": len(recorded),
+        "budget": args.budget,
+        "totals": totals,
+        "compact_savings": round(1 - totals["compact"] / totals["legacy"], 3),
+        "budgeted_savings": round(1 - totals["budgeted"] / totals["legacy"], 3),
+        "per_query": queries
+    }, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark del análisis en streaming (tools/streaming_analyzer.py).
+
+Genera un volcado markdown sintético de N MB como fragmentos (igual que
+llegarían las páginas obtenidas) y lo analiza en streaming y, como
+referencia, uniéndolo en un solo string para ``ContentAnalyzerTool._run``.
+Mide tiempo y pico de memoria (tracemalloc) de cada camino y comprueba que
+el resultado es idéntico.
+
+Uso:
+    python -m benchmarks.streaming_analysis --megabytes 20
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import AcademicConfig
+from tools.content_analyzer import ContentAnalyzerTool
+from benchmarks.content_analysis import build_document
+
+PAGE_WORDS = 2000
+FRAGMENT_CHARS = 16 * 1024
+
+
+def iter_dump(megabytes: float):
+    """Fragmentos de ~16 KB de un volcado de páginas sintéticas hasta ``megabytes``"""
+    limit, written, page = int(megabytes * 1024 * 1024), 0, 0
+    while written < limit:
+        text = build_document(PAGE_WORDS, seed=page) + "\n\n"
+        for start in range(0, len(text), FRAGMENT_CHARS):
+            yield text[start:start + FRAGMENT_CHARS]
+        written += len(text)
+        page += 1
+
+
+def traced(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, {"seconds": round(seconds, 2), "peak_mb": round(peak / 1024 / 1024, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del análisis en streaming")
+    parser.add_argument("--megabytes", type=float, default=20)
+    args = parser.parse_args()
+
+    AcademicConfig.CONTENT_ANALYSIS["paragraph_cache_size"] = 0
+    tool = ContentAnalyzerTool()
+
+    streamed, streaming = traced(lambda: tool.analyze_stream(iter_dump(args.megabytes)))
+    in_memory_output, in_memory = traced(lambda: tool._run("".join(iter_dump(args.megabytes))))
+
+    print(json.dumps({
+        "megabytes": args.megabytes,
+        "streaming": streaming,
+        "in_memory": in_memory,
+        "identical_output": streamed == in_memory_output
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
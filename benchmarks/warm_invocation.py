@@ -0,0 +1,64 @@
+"""
+Benchmark del overhead por invocación en caliente de ``generate_article``.
+
+Mide lo que hace la ruta de generación antes de la primera llamada al LLM:
+tomar un crew del pool (``CrewPool.acquire``), crear las tareas del run
+(``create_tasks``) y armar el grafo de tareas que ejecuta el crew. Compara
+construir el crew en cada invocación (comportamiento anterior, pool sin
+crews inactivos) contra reutilizarlo desde el pool del contenedor. No se
+llama al LLM ni a Serper: basta con que las claves tengan cualquier valor.
+
+Uso:
+    python -m benchmarks.warm_invocation --iterations 20
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crew.crew_pool import CrewPool
+
+
+def measure(pool: CrewPool, iterations: int, topic: str) -> dict:
+    """Mide la preparación de un run de generación usando el pool indicado"""
+    latencies = []
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        with pool.acquire("academic") as crew:
+            crew.create_tasks(topic)
+            crew.get_task_graph()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    # La primera invocación de cada modo paga la construcción inicial
+    warm = latencies[1:] or latencies
+    return {
+        "first_ms": round(latencies[0], 2),
+        "warm_mean_ms": round(statistics.mean(warm), 2),
+        "warm_p95_ms": round(sorted(warm)[int(len(warm) * 0.95) - 1 if len(warm) > 1 else 0], 2),
+        "pool_stats": pool.get_stats()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de invocaciones en caliente")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--topic", default="AI en content marketing")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+    os.environ.setdefault("SERPER_API_KEY", "benchmark")
+
+    results = {
+        "before_fresh_crew_per_invocation": measure(CrewPool(max_idle_per_type=0), args.iterations, args.topic),
+        "after_pooled_crew": measure(CrewPool(), args.iterations, args.topic)
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
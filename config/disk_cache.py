@@ -0,0 +1,115 @@
+import os
+import time
+import sqlite3
+import threading
+from typing import Dict, Any, Optional
+
+
+class DiskCache:
+    """
+    Caché clave/valor persistente en SQLite, acotada en tamaño y con TTL.
+
+    Sirve tanto en Lambda (``/tmp``, que sobrevive entre invocaciones en
+    caliente) como en local. Al superar ``max_bytes`` se desalojan las
+    entradas usadas hace más tiempo (LRU); las entradas más antiguas que
+    ``ttl_seconds`` se consideran expiradas y se eliminan al leerlas.
+    """
+
+    def __init__(self, path: str, max_bytes: int, ttl_seconds: Optional[float] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "writes": 0, "hit_bytes": 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache_entries (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Optional[str]:
+        """Devuelve el valor guardado o None si no existe o expiró"""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT value, size, created_at FROM cache_entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            value, size, created_at = row
+            if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._stats["hits"] += 1
+            self._stats["hit_bytes"] += size
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """Guarda un valor y desaloja entradas LRU si se supera el tamaño máximo"""
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._stats["writes"] += 1
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Elimina las entradas usadas hace más tiempo hasta volver a ``max_bytes``"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size in conn.execute("SELECT key, size FROM cache_entries ORDER BY accessed_at ASC"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+
+        conn.executemany("DELETE FROM cache_entries WHERE key = ?", evicted)
+        self._stats["evictions"] += len(evicted)
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM cache_entries")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores de uso del proceso y ocupación actual de la caché"""
+        with self._lock, self._connect() as conn:
+            entries, total = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()
+            stats = dict(self._stats)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats.update({
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hit_rate": round(stats["hits"] / lookups, 3) if lookups else 0.0
+        })
+        return stats
@@ -0,0 +1,169 @@
+import json
+import time
+import hashlib
+import logging
+import threading
+import litellm
+from typing import Dict, List, Any, Optional
+from crewai import LLM
+from config.disk_cache import DiskCache
+from config.settings import AcademicConfig
+from config.rate_limiter import AdaptiveRateLimiter, RETRYABLE_STATUS, parse_retry_after
+from config.llm_usage import record_llm_usage
+
+logger = logging.getLogger(__name__)
+
+_llm_cache: Optional[DiskCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+# Parámetros de la petición que no cambian la respuesta: quedan fuera de la clave de caché
+NON_KEY_PARAMS = frozenset({"api_key", "timeout"})
+
+
+def build_llm_cache_key(params: Dict[str, Any]) -> str:
+    """Clave de caché: todos los parámetros de la petición a litellm (modelo, muestreo, stop, formato y el prompt completo)"""
+    payload = json.dumps(
+        {key: value for key, value in params.items() if key not in NON_KEY_PARAMS},
+        ensure_ascii=False, sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _error_status(error: Exception) -> Optional[int]:
+    """Código HTTP de un error de litellm/OpenAI (None si no viene de una respuesta HTTP)"""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status if isinstance(status, int) else None
+
+
+def _error_retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    return parse_retry_after(headers.get('retry-after'))
+
+
+class RateLimitedLLM(LLM):
+    """
+    LLM de crewai que pasa por el limitador compartido del proveedor.
+
+    Los 429/5xx reducen la concurrencia del limitador y se reintentan con
+    backoff exponencial con jitter (o lo que indique ``Retry-After``).
+
+    El consumo de tokens de cada respuesta (``response.usage``) se notifica
+    al sink del hilo que hizo la llamada (``config.llm_usage``).
+    """
+
+    def __init__(self, model: str, limiter: Optional[AdaptiveRateLimiter] = None, **kwargs):
+        super().__init__(model=model, **kwargs)
+        self.limiter = limiter
+
+    def _completion_params(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Parámetros que ``LLM.call`` de crewai 0.63 envía a ``litellm.completion`` (sin los None)"""
+        params = {
+            "model": self.model,
+            "messages": messages,
+            "timeout": self.timeout,
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "n": self.n,
+            "stop": self.stop,
+            "max_tokens": self.max_tokens or self.max_completion_tokens,
+            "presence_penalty": self.presence_penalty,
+            "frequency_penalty": self.frequency_penalty,
+            "logit_bias": self.logit_bias,
+            "response_format": self.response_format,
+            "seed": self.seed,
+            "logprobs": self.logprobs,
+            "top_logprobs": self.top_logprobs,
+            "api_base": self.base_url,
+            "api_version": self.api_version,
+            "api_key": self.api_key,
+            **self.kwargs,
+        }
+        return {key: value for key, value in params.items() if value is not None}
+
+    def _complete(self, messages: List[Dict[str, str]], callbacks: List[Any] = []) -> str:
+        """Igual que ``LLM.call`` de crewai 0.63, pero registra el consumo de la respuesta"""
+        if callbacks:
+            litellm.callbacks = callbacks
+
+        response = litellm.completion(**self._completion_params(messages))
+
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            record_llm_usage(getattr(usage, 'prompt_tokens', 0) or 0, getattr(usage, 'completion_tokens', 0) or 0)
+        return response["choices"][0]["message"]["content"]
+
+    def call(self, messages: List[Dict[str, str]], callbacks: List[Any] = []) -> str:
+        if self.limiter is None:
+            return self._complete(messages, callbacks=callbacks)
+
+        max_retries = AcademicConfig.RATE_LIMITS["max_retries"]
+        for attempt in range(max_retries + 1):
+            self.limiter.acquire()
+            released = False
+            try:
+                response = self._complete(messages, callbacks=callbacks)
+                self.limiter.release(200)
+                released = True
+                return response
+            except Exception as e:
+                status = _error_status(e)
+                # Sin código HTTP (p. ej. un error al procesar la respuesta) no es una señal de saturación
+                if status is None:
+                    raise
+                retry_after = _error_retry_after(e)
+                self.limiter.release(status, retry_after)
+                released = True
+                if status not in RETRYABLE_STATUS or attempt == max_retries:
+                    raise
+                delay = self.limiter.backoff_delay(attempt, retry_after)
+                logger.warning(f"{self.model} respondió {status}; reintento {attempt + 1} en {delay:.1f}s")
+            finally:
+                # Cualquier otra salida (error sin código HTTP, BaseException) devuelve el hueco sin ajustar
+                if not released:
+                    self.limiter.abandon()
+            time.sleep(delay)
+
+
+class CachedLLM(RateLimitedLLM):
+    """
+    LLM de crewai con caché persistente de respuestas.
+
+    Las respuestas se reutilizan cuando coinciden todos los parámetros de la
+    petición (modelo, temperatura, top_p, max_tokens, seed, stop, formato...)
+    y los mensajes; con ``bypass=True`` no se consulta la caché, pero la respuesta
+    nueva sí se guarda (refresca la entrada). Los aciertos no consumen cupo
+    del limitador.
+    """
+
+    def __init__(self, model: str, cache: DiskCache, limiter: Optional[AdaptiveRateLimiter] = None, **kwargs):
+        super().__init__(model=model, limiter=limiter, **kwargs)
+        self.cache = cache
+        self.bypass = False
+
+    def call(self, messages: List[Dict[str, str]], callbacks: List[Any] = []) -> str:
+        key = build_llm_cache_key(self._completion_params(messages))
+
+        if not self.bypass:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.debug(f"Respuesta de LLM servida desde caché ({self.model})")
+                return cached
+
+        response = super().call(messages, callbacks=callbacks)
+        if response:
+            self.cache.set(key, response)
+        return response
+
+
+def get_llm_cache() -> DiskCache:
+    """Caché de respuestas de LLM del proceso (compartida por todos los crews del contenedor)"""
+    global _llm_cache
+    settings = AcademicConfig.LLM_CACHE
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = DiskCache(settings["path"], settings["max_bytes"], settings["ttl_seconds"])
+    return _llm_cache
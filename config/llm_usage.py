@@ -0,0 +1,48 @@
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+# Destino del consumo de tokens de las llamadas al LLM hechas desde el hilo actual (la tarea en ejecución)
+_local = threading.local()
+
+
+def empty_usage() -> Dict[str, int]:
+    return {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0, "successful_requests": 0}
+
+
+def set_llm_usage_sink(sink: Optional[Callable[[int, int], None]]) -> Optional[Callable[[int, int], None]]:
+    """Registra quién recibe el consumo de las llamadas al LLM de este hilo; devuelve el sink anterior"""
+    previous = getattr(_local, 'sink', None)
+    _local.sink = sink
+    return previous
+
+
+def record_llm_usage(prompt_tokens: int, completion_tokens: int) -> None:
+    """Notifica el consumo de una respuesta del LLM al sink del hilo (si hay uno activo)"""
+    sink = getattr(_local, 'sink', None)
+    if sink is not None:
+        sink(prompt_tokens, completion_tokens)
+
+
+@contextmanager
+def track_llm_usage() -> Iterator[Dict[str, int]]:
+    """
+    Acumula el consumo de las llamadas al LLM hechas desde este hilo.
+
+    A diferencia de los contadores de los agentes de crewai (que dependen de
+    ``litellm.callbacks``, global al proceso), cada llamada se atribuye al
+    hilo que la hizo, así que tareas concurrentes no se mezclan.
+    """
+    usage = empty_usage()
+
+    def sink(prompt_tokens: int, completion_tokens: int) -> None:
+        usage["prompt_tokens"] += prompt_tokens
+        usage["completion_tokens"] += completion_tokens
+        usage["total_tokens"] += prompt_tokens + completion_tokens
+        usage["successful_requests"] += 1
+
+    previous = set_llm_usage_sink(sink)
+    try:
+        yield usage
+    finally:
+        set_llm_usage_sink(previous)
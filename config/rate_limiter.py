@@ -0,0 +1,163 @@
+import time
+import random
+import asyncio
+import threading
+from typing import Dict, Any, Optional
+from config.settings import AcademicConfig
+
+# Respuestas que indican saturación del proveedor: se reduce la concurrencia y se reintenta
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+DECREASE_COOLDOWN_SECONDS = 1.0
+
+
+class AdaptiveRateLimiter:
+    """
+    Limitador de un proveedor compartido por todo el proceso.
+
+    Combina un token bucket (``rate_per_second`` con ráfagas de hasta
+    ``burst``) con un límite de concurrencia adaptativo AIMD: cada respuesta
+    correcta lo aumenta en 1/límite (≈ +1 por ventana completa) y cada
+    429/5xx lo reduce a la mitad. Un ``Retry-After`` bloquea el bucket
+    hasta que vence.
+    """
+
+    def __init__(self, name: str, rate_per_second: float, burst: int, max_concurrency: int,
+                 min_concurrency: int = 1):
+        self.name = name
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency_limit = float(max_concurrency)
+
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "throttled_waits": 0, "throttled_seconds": 0.0,
+                       "rate_limited_responses": 0, "retries": 0}
+
+    def _reserve(self) -> float:
+        """Toma un token y un hueco de concurrencia; si no hay, devuelve cuánto esperar"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate_per_second)
+            self._last_refill = now
+
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self._in_flight >= int(self.concurrency_limit):
+                return 0.05
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate_per_second
+
+            self._tokens -= 1
+            self._in_flight += 1
+            self._stats["requests"] += 1
+            return 0.0
+
+    def _record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._stats["throttled_waits"] += 1
+            self._stats["throttled_seconds"] += seconds
+
+    def acquire(self) -> None:
+        """Bloquea el hilo hasta poder enviar una petición"""
+        waited = 0.0
+        while (delay := self._reserve()) > 0:
+            time.sleep(delay)
+            waited += delay
+        if waited:
+            self._record_wait(waited)
+
+    async def acquire_async(self) -> None:
+        """Variante para corrutinas: espera sin bloquear el event loop"""
+        waited = 0.0
+        while (delay := self._reserve()) > 0:
+            await asyncio.sleep(delay)
+            waited += delay
+        if waited:
+            self._record_wait(waited)
+
+    def release(self, status: Optional[int] = None, retry_after: Optional[float] = None) -> None:
+        """Libera el hueco y ajusta la concurrencia según el resultado (``status`` None = error de red)"""
+        with self._lock:
+            self._in_flight = max(self._in_flight - 1, 0)
+
+            if status is not None and status not in RETRYABLE_STATUS:
+                self.concurrency_limit = min(self.max_concurrency,
+                                             self.concurrency_limit + 1 / self.concurrency_limit)
+                return
+
+            # Una sola reducción por ráfaga: las peticiones en vuelo suelen fallar todas a la vez
+            now = time.monotonic()
+            if now - self._last_decrease >= DECREASE_COOLDOWN_SECONDS:
+                self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit / 2)
+                self._last_decrease = now
+            self._stats["rate_limited_responses"] += 1
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+    def abandon(self) -> None:
+        """Libera el hueco de una petición interrumpida (p. ej. cancelada) sin ajustar la concurrencia"""
+        with self._lock:
+            self._in_flight = max(self._in_flight - 1, 0)
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Espera antes del reintento ``attempt``: Retry-After si lo hay, si no backoff exponencial con jitter"""
+        with self._lock:
+            self._stats["retries"] += 1
+        if retry_after:
+            return retry_after
+        settings = AcademicConfig.RATE_LIMITS
+        ceiling = min(settings["backoff_max_seconds"], settings["backoff_base_seconds"] * 2 ** attempt)
+        return random.uniform(0, ceiling)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                "rate_per_second": self.rate_per_second,
+                "burst": self.burst,
+                "concurrency_limit": round(self.concurrency_limit, 2),
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight
+            })
+        stats["throttled_seconds"] = round(stats["throttled_seconds"], 3)
+        return stats
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Interpreta la cabecera Retry-After en segundos (las fechas HTTP se ignoran)"""
+    try:
+        return max(float(value), 0.0) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+_limiters: Dict[str, AdaptiveRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> AdaptiveRateLimiter:
+    """Limitador del proceso para un proveedor configurado en AcademicConfig.RATE_LIMITS"""
+    with _limiters_lock:
+        if provider not in _limiters:
+            settings = AcademicConfig.RATE_LIMITS[provider]
+            _limiters[provider] = AdaptiveRateLimiter(
+                provider,
+                rate_per_second=settings["rate_per_second"],
+                burst=settings["burst"],
+                max_concurrency=settings["max_concurrency"],
+                min_concurrency=settings.get("min_concurrency", 1)
+            )
+        return _limiters[provider]
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Límites actuales y contadores de throttling de los proveedores usados en el proceso"""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {provider: limiter.get_stats() for provider, limiter in limiters.items()}
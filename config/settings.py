@@ -1,7 +1,9 @@
 import os
-from typing import Dict, Any
-from langchain_openai import ChatOpenAI
-from langchain_community.llms import Ollama
+from typing import Dict, Any, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from langchain_community.llms import Ollama
+    from config.llm_cache import CachedLLM, RateLimitedLLM
 
 class ModelConfig:
     """Configuración de modelos de IA"""
@@ -9,21 +11,59 @@ class ModelConfig:
     def __init__(self):
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
         self.serper_api_key = os.getenv('SERPER_API_KEY')  # Para búsquedas web
+        self._models: Dict[str, Any] = {}  # Clientes LLM reutilizados entre agentes
         
-    def get_openai_model(self, model_name: str = "gpt-4-turbo-preview") -> ChatOpenAI:
-        """Obtiene modelo de OpenAI"""
-        return ChatOpenAI(
-            model=model_name,
-            temperature=0.7,
-            api_key=self.openai_api_key
-        )
-    
-    def get_local_model(self, model_name: str = "llama3.1:8b") -> Ollama:
+    def get_openai_model(self, model_name: str = "gpt-4-turbo-preview") -> "RateLimitedLLM":
+        """Obtiene modelo de OpenAI (limitado y con caché de respuestas si está habilitada)"""
+        key = f"openai:{model_name}"
+        if key not in self._models:
+            # Import perezoso: acelera el cold start
+            from config.llm_cache import CachedLLM, RateLimitedLLM, get_llm_cache
+            from config.rate_limiter import get_rate_limiter
+            
+            limiter = get_rate_limiter("openai")
+            if AcademicConfig.LLM_CACHE["enabled"]:
+                self._models[key] = CachedLLM(
+                    model=model_name,
+                    cache=get_llm_cache(),
+                    limiter=limiter,
+                    temperature=0.7,
+                    api_key=self.openai_api_key
+                )
+            else:
+                self._models[key] = RateLimitedLLM(
+                    model=model_name,
+                    limiter=limiter,
+                    temperature=0.7,
+                    api_key=self.openai_api_key
+                )
+        return self._models[key]
+    
+    def get_local_model(self, model_name: str = "llama3.1:8b") -> Union["Ollama", "CachedLLM"]:
         """Obtiene modelo local (si está disponible)"""
-        return Ollama(
-            model=model_name,
-            temperature=0.7
-        )
+        key = f"local:{model_name}"
+        if key not in self._models:
+            if AcademicConfig.LLM_CACHE["enabled"]:
+                from config.llm_cache import CachedLLM, get_llm_cache
+                self._models[key] = CachedLLM(
+                    model=f"ollama/{model_name}",
+                    cache=get_llm_cache(),
+                    temperature=0.7,
+                    base_url=os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
+                )
+            else:
+                from langchain_community.llms import Ollama
+                self._models[key] = Ollama(
+                    model=model_name,
+                    temperature=0.7
+                )
+        return self._models[key]
+    
+    def set_cache_bypass(self, bypass: bool) -> None:
+        """Activa o desactiva la consulta a la caché de respuestas para los próximos runs"""
+        for model in self._models.values():
+            if hasattr(model, 'bypass'):
+                model.bypass = bypass
     
     def get_default_model(self):
         """Obtiene el modelo por defecto basado en disponibilidad"""
@@ -139,6 +179,137 @@ class AcademicConfig:
         "total_timeout": 1800     # 30 minutos total
     }
     
+    # Configuración de ejecución de tareas
+    EXECUTION = {
+        "process": "parallel",     # parallel (DAG según task.context) o sequential
+        "max_concurrency": 3       # Tareas ejecutándose a la vez en modo parallel
+    }
+    
+    # Presupuesto de tokens del contexto que recibe cada tarea de sus dependencias
+    CONTEXT_COMPACTION = {
+        "enabled": os.getenv('CONTEXT_COMPACTION_ENABLED', 'true').lower() == 'true',
+        "default_budget_tokens": None,  # Sin límite para tareas no listadas
+        "task_budgets": {
+            "desarrollo": 9000,
+            "discusion": 9000,
+            "conclusiones": 8000,
+            "bibliografia": 8000
+        }
+    }
+    
+    # Checkpoints de salidas por tarea (para reanudar runs interrumpidos)
+    CHECKPOINTS = {
+        "enabled": os.getenv('CHECKPOINTS_ENABLED', 'true').lower() == 'true',
+        "path": os.getenv('CHECKPOINT_DB_PATH', '/tmp/crewai/checkpoints.db'),
+        "ttl_seconds": int(os.getenv('CHECKPOINT_TTL_HOURS', '24')) * 3600  # Tras esto un run ya no se puede reanudar
+    }
+    
+    # Jobs asíncronos de generación
+    JOBS = {
+        "path": os.getenv('JOB_DB_PATH', '/tmp/crewai/jobs.db'),
+        "max_workers": int(os.getenv('JOB_MAX_WORKERS', '4')),  # Jobs ejecutándose a la vez
+        "dispatch": os.getenv('JOB_DISPATCH', 'thread')          # thread o lambda (auto-invocación asíncrona)
+    }
+    
+    # Generación en batch con investigación compartida por cluster de tópicos
+    BATCH = {
+        "max_topics": 50,
+        "max_parallel_topics": int(os.getenv('BATCH_MAX_PARALLEL_TOPICS', '3')),
+        "similarity_threshold": 0.3   # Jaccard mínimo entre tópicos para compartir investigación
+    }
+    
+    # Caché persistente de respuestas de LLM (modelo + temperatura + prompt completo)
+    LLM_CACHE = {
+        "enabled": os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true',
+        "path": os.getenv('LLM_CACHE_PATH', '/tmp/crewai/llm_cache.db'),
+        "max_bytes": int(os.getenv('LLM_CACHE_MAX_MB', '256')) * 1024 * 1024,
+        "ttl_seconds": int(os.getenv('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+    }
+    
+    # Búsqueda web (Serper)
+    SEARCH = {
+        "endpoint": os.getenv('SERPER_ENDPOINT', 'https://google.serper.dev/search'),
+        "timeout_seconds": float(os.getenv('SEARCH_TIMEOUT_SECONDS', '15')),
+        "max_concurrency": int(os.getenv('SEARCH_MAX_CONCURRENCY', '8')),  # Búsquedas en vuelo a la vez
+        "connection_limit": 16     # Conexiones keep-alive del pool compartido
+    }
+    
+    # Backends de búsqueda en orden de preferencia (serper, searxng, local) y cómo combinarlos
+    SEARCH_BACKENDS = {
+        "backends": [name.strip() for name in os.getenv('SEARCH_BACKENDS', 'serper').split(',') if name.strip()],
+        "strategy": os.getenv('SEARCH_BACKEND_STRATEGY', 'failover'),  # single, failover o race
+        # Sin respuesta en este tiempo se lanza también el siguiente backend
+        "latency_budget_seconds": float(os.getenv('SEARCH_LATENCY_BUDGET_SECONDS', '3')),
+        "searxng_endpoint": os.getenv('SEARXNG_ENDPOINT', ''),
+        "local_corpus_path": os.getenv('LOCAL_CORPUS_PATH', '/tmp/crewai/corpus'),
+        # Índice BM25 del corpus (puede empaquetarse ya construido) y cada cuánto se resincroniza (0 = solo al inicio)
+        "local_index_path": os.getenv('LOCAL_INDEX_PATH', '/tmp/crewai/bm25_index'),
+        "local_index_refresh_seconds": float(os.getenv('LOCAL_INDEX_REFRESH_SECONDS', '300'))
+    }
+    
+    # Caché persistente de respuestas de Serper (consulta normalizada + gl/hl/num)
+    SEARCH_CACHE = {
+        "enabled": os.getenv('SEARCH_CACHE_ENABLED', 'true').lower() == 'true',
+        "path": os.getenv('SEARCH_CACHE_PATH', '/tmp/crewai/search_cache.db'),
+        "max_bytes": int(os.getenv('SEARCH_CACHE_MAX_MB', '64')) * 1024 * 1024,
+        "ttl_seconds": int(os.getenv('SEARCH_CACHE_TTL_SECONDS', str(24 * 3600)))
+    }
+    
+    # Grabación/reproducción de búsquedas para benchmarks y pruebas sin red (off, record, replay)
+    SEARCH_CASSETTE = {
+        "mode": os.getenv('SEARCH_CASSETTE_MODE', 'off').lower(),
+        "path": os.getenv('SEARCH_CASSETTE_PATH', '/tmp/crewai/search_cassette.json'),
+        # Latencia simulada por lote en replay; sin definir se usa la grabada
+        "latency_ms": float(os.getenv('SEARCH_CASSETTE_LATENCY_MS')) if os.getenv('SEARCH_CASSETTE_LATENCY_MS') else None
+    }
+    
+    # Descarga de las páginas de los primeros resultados y extracción de su texto principal
+    PAGE_FETCH = {
+        "enabled": os.getenv('PAGE_FETCH_ENABLED', 'true').lower() == 'true',
+        "top_n": int(os.getenv('PAGE_FETCH_TOP_N', '3')),        # Resultados orgánicos descargados por consulta
+        "timeout_seconds": float(os.getenv('PAGE_FETCH_TIMEOUT_SECONDS', '10')),
+        "max_bytes": 2 * 1024 * 1024,      # Se deja de leer la respuesta al superar este tamaño
+        "max_chars": int(os.getenv('PAGE_FETCH_MAX_CHARS', '3000')),  # Texto extraído por página
+        "per_host_limit": 2,
+        "max_concurrency": 8,
+        "cache_path": os.getenv('PAGE_CACHE_PATH', '/tmp/crewai/page_cache.db'),
+        "cache_max_bytes": int(os.getenv('PAGE_CACHE_MAX_MB', '128')) * 1024 * 1024,
+        "cache_ttl_seconds": int(os.getenv('PAGE_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+    }
+    
+    # Formato compacto de los resultados de búsqueda que recibe el agente
+    SEARCH_RENDER = {
+        "token_budget": int(os.getenv('SEARCH_TOKEN_BUDGET', '1500')),  # Por llamada, repartido entre consultas
+        "snippet_chars": int(os.getenv('SEARCH_SNIPPET_CHARS', '300')),
+        "page_chars": int(os.getenv('SEARCH_PAGE_CHARS', '1200'))       # Extracto de página por resultado
+    }
+    
+    # Limitadores por proveedor compartidos por el proceso (token bucket + concurrencia AIMD)
+    RATE_LIMITS = {
+        "serper": {
+            "rate_per_second": float(os.getenv('SERPER_RATE_PER_SECOND', '5')),
+            "burst": 10,
+            "max_concurrency": 8
+        },
+        "openai": {
+            "rate_per_second": float(os.getenv('OPENAI_RATE_PER_SECOND', '3')),
+            "burst": 6,
+            "max_concurrency": 6
+        },
+        "max_retries": int(os.getenv('RATE_LIMIT_MAX_RETRIES', '4')),
+        "backoff_base_seconds": 1.0,
+        "backoff_max_seconds": 30.0
+    }
+    
+    # Analizador de contenido: JSON con las listas de términos que sustituyen a las de por defecto, caché de párrafos y streaming
+    CONTENT_ANALYSIS = {
+        "terms_path": os.getenv('ANALYZER_TERMS_PATH', ''),
+        # Párrafos cuyas métricas parciales se guardan en memoria (0 desactiva la caché)
+        "paragraph_cache_size": int(os.getenv('ANALYZER_PARAGRAPH_CACHE_SIZE', '4096')),
+        # Caracteres que el análisis en streaming acumula como máximo antes de cortar en un salto de línea
+        "stream_buffer_chars": int(os.getenv('ANALYZER_STREAM_BUFFER_CHARS', str(1024 * 1024)))
+    }
+    
     # Configuración de calidad
     QUALITY_METRICS = {
         "min_word_count_per_section": 200,
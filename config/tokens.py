@@ -0,0 +1,17 @@
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Cuenta tokens con tiktoken si está disponible (aproximación de 4 caracteres por token si no)"""
+    global _encoding
+    if not text:
+        return 0
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return max(1, len(text) // 4)
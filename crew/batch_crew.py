@@ -0,0 +1,153 @@
+import re
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
+from config.settings import AcademicConfig
+from crew.crew_pool import CrewPool, get_crew_pool
+
+logger = logging.getLogger(__name__)
+
+# Palabras vacías ignoradas al comparar tópicos
+TOPIC_STOP_WORDS = {
+    'el', 'la', 'los', 'las', 'de', 'del', 'en', 'y', 'para', 'con', 'un', 'una', 'por', 'al',
+    'the', 'of', 'in', 'and', 'for', 'to', 'a', 'an', 'on', 'with'
+}
+
+
+def topic_terms(topic: str) -> set:
+    """Normaliza un tópico a su conjunto de términos relevantes"""
+    words = re.findall(r'\w+', topic.lower())
+    return {word for word in words if word not in TOPIC_STOP_WORDS and len(word) > 2}
+
+
+def cluster_topics(topics: List[str], threshold: float) -> List[List[str]]:
+    """
+    Agrupa tópicos relacionados por similitud de Jaccard entre sus términos.
+
+    Cada tópico se une al primer cluster cuya unión de términos supere el
+    umbral; si ninguno lo hace, abre un cluster nuevo.
+    """
+    clusters: List[Dict[str, Any]] = []
+
+    for topic in topics:
+        terms = topic_terms(topic)
+        for cluster in clusters:
+            union = cluster["terms"] | terms
+            similarity = len(cluster["terms"] & terms) / len(union) if union else 1.0
+            if similarity >= threshold:
+                cluster["topics"].append(topic)
+                cluster["terms"] |= terms
+                break
+        else:
+            clusters.append({"topics": [topic], "terms": set(terms)})
+
+    return [cluster["topics"] for cluster in clusters]
+
+
+class BatchArticleGenerator:
+    """
+    Genera artículos para muchos tópicos compartiendo la etapa de investigación.
+
+    Para cada cluster de tópicos relacionados se ejecuta una sola vez
+    investigación + análisis; después las secciones de cada tópico se
+    generan en paralelo (acotado) reutilizando esas salidas como contexto.
+    """
+
+    def __init__(self, pool: Optional[CrewPool] = None, max_parallel_topics: Optional[int] = None,
+                 similarity_threshold: Optional[float] = None):
+        self.pool = pool or get_crew_pool()
+        self.max_parallel_topics = max_parallel_topics or AcademicConfig.BATCH["max_parallel_topics"]
+        self.similarity_threshold = (similarity_threshold if similarity_threshold is not None
+                                     else AcademicConfig.BATCH["similarity_threshold"])
+
+    def run(self, topics: List[str]) -> Dict[str, Any]:
+        """Ejecuta el batch completo y devuelve resultados por tópico y totales"""
+        topics = [topic for topic in dict.fromkeys(topics) if topic]
+        if not topics:
+            return {"success": False, "error": "La lista de tópicos está vacía"}
+        if len(topics) > AcademicConfig.BATCH["max_topics"]:
+            return {"success": False, "error": f"Máximo {AcademicConfig.BATCH['max_topics']} tópicos por batch"}
+
+        start = time.perf_counter()
+        clusters = cluster_topics(topics, self.similarity_threshold)
+        logger.info(f"Batch de {len(topics)} tópicos agrupado en {len(clusters)} clusters")
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel_topics) as pool:
+            shared_stages = list(pool.map(self._run_shared_stage, clusters))
+
+            jobs = []
+            for cluster, shared in zip(clusters, shared_stages):
+                for topic in cluster:
+                    jobs.append((topic, shared))
+            topic_results = list(pool.map(lambda job: self._run_topic(*job), jobs))
+
+        wall_clock = round(time.perf_counter() - start, 3)
+        return {
+            "success": all(result["success"] for result in topic_results),
+            "clusters": [
+                {"topics": cluster, "shared_stage": self._summarize_stage(shared)}
+                for cluster, shared in zip(clusters, shared_stages)
+            ],
+            "results": {result["topic"]: result for result in topic_results},
+            "report": self._build_report(shared_stages, topic_results, wall_clock)
+        }
+
+    def _run_shared_stage(self, cluster: List[str]) -> Dict[str, Any]:
+        """Investigación y análisis compartidos por todos los tópicos del cluster"""
+        with self.pool.acquire("academic") as crew:
+            shared = crew.run_shared_stage(cluster)
+        shared["topics_count"] = len(cluster)
+        return shared
+
+    def _run_topic(self, topic: str, shared: Dict[str, Any]) -> Dict[str, Any]:
+        """Genera las secciones de un tópico a partir de la investigación compartida"""
+        with self.pool.acquire("academic") as crew:
+            result = crew.run_crew(topic=topic, seed_outputs=shared["outputs"])
+
+        metadata = result.get("metadata", {})
+        return {
+            "topic": topic,
+            "success": result.get("success", False),
+            "error": result.get("error"),
+            "run_id": result.get("run_id"),
+            "outputs": result.get("outputs"),
+            "token_usage": metadata.get("token_usage", {}),
+            "wall_clock_seconds": metadata.get("wall_clock_seconds")
+        }
+
+    @staticmethod
+    def _summarize_stage(shared: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "token_usage": shared["token_usage"],
+            "wall_clock_seconds": shared["wall_clock_seconds"]
+        }
+
+    @staticmethod
+    def _build_report(shared_stages: List[Dict[str, Any]], topic_results: List[Dict[str, Any]],
+                      wall_clock: float) -> Dict[str, Any]:
+        """Totales del batch y estimación frente a N ejecuciones independientes"""
+        shared_tokens = sum(stage["token_usage"].get("total_tokens", 0) for stage in shared_stages)
+        shared_seconds = sum(stage["wall_clock_seconds"] for stage in shared_stages)
+        topic_tokens = sum(result["token_usage"].get("total_tokens", 0) for result in topic_results)
+        topic_seconds = sum(result["wall_clock_seconds"] or 0 for result in topic_results)
+
+        # Sin compartir, cada tópico habría pagado la investigación de su cluster
+        independent_tokens = topic_tokens + sum(
+            stage["token_usage"].get("total_tokens", 0) * stage["topics_count"] for stage in shared_stages
+        )
+        independent_seconds = topic_seconds + sum(
+            stage["wall_clock_seconds"] * stage["topics_count"] for stage in shared_stages
+        )
+
+        return {
+            "topics": len(topic_results),
+            "clusters": len(shared_stages),
+            "total_tokens": shared_tokens + topic_tokens,
+            "shared_stage_tokens": shared_tokens,
+            "wall_clock_seconds": wall_clock,
+            "estimated_independent_tokens": independent_tokens,
+            "estimated_independent_serial_seconds": round(independent_seconds, 3),
+            "estimated_tokens_saved": independent_tokens - (shared_tokens + topic_tokens),
+            "shared_stage_seconds": round(shared_seconds, 3)
+        }
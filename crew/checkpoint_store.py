@@ -0,0 +1,97 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+from config.settings import AcademicConfig
+
+
+def build_run_key(run_id: str, topic: Optional[str], prompt_hash: str) -> str:
+    """Construye la clave de checkpoint a partir del run id, el tópico y el hash de prompts"""
+    topic_hash = hashlib.sha256((topic or "").encode("utf-8")).hexdigest()[:16]
+    return f"{run_id}:{topic_hash}:{prompt_hash}"
+
+
+class CheckpointStore(ABC):
+    """Interfaz base para persistir las salidas de cada tarea de un run"""
+
+    @abstractmethod
+    def save(self, run_key: str, task_name: str, output: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def load(self, run_key: str) -> Dict[str, str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self, run_key: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """Borra los checkpoints caducados; devuelve cuántos se borraron"""
+        raise NotImplementedError
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """Checkpoints en SQLite local (por defecto en /tmp para Lambda); caducan tras ``ttl_seconds``"""
+
+    def __init__(self, path: str, ttl_seconds: Optional[int] = None):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS task_checkpoints (
+                    run_key TEXT NOT NULL,
+                    task_name TEXT NOT NULL,
+                    output TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (run_key, task_name)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS task_checkpoints_created ON task_checkpoints (created_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def save(self, run_key: str, task_name: str, output: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO task_checkpoints VALUES (?, ?, ?, ?)",
+                (run_key, task_name, output, time.time())
+            )
+
+    def _oldest_valid(self) -> float:
+        return time.time() - self.ttl_seconds if self.ttl_seconds else 0.0
+
+    def load(self, run_key: str) -> Dict[str, str]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT task_name, output FROM task_checkpoints WHERE run_key = ? AND created_at >= ?",
+                (run_key, self._oldest_valid())
+            ).fetchall()
+        return {task_name: output for task_name, output in rows}
+
+    def clear(self, run_key: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM task_checkpoints WHERE run_key = ?", (run_key,))
+
+    def purge_expired(self) -> int:
+        if not self.ttl_seconds:
+            return 0
+        with self._lock, self._connect() as conn:
+            return conn.execute("DELETE FROM task_checkpoints WHERE created_at < ?",
+                                (self._oldest_valid(),)).rowcount
+
+
+def get_checkpoint_store(path: Optional[str] = None) -> CheckpointStore:
+    """Obtiene el store de checkpoints configurado"""
+    return SQLiteCheckpointStore(path or AcademicConfig.CHECKPOINTS["path"], AcademicConfig.CHECKPOINTS["ttl_seconds"])
@@ -1,5 +1,21 @@
+import time
+import uuid
+import hashlib
+import logging
+from typing import Dict, List, Any, Optional, Callable
 from crewai import Crew, Process
-from config.settings import ModelConfig
+from config.settings import ModelConfig, AcademicConfig
+from crew.task_executor import ParallelTaskExecutor
+from crew.checkpoint_store import CheckpointStore, get_checkpoint_store, build_run_key
+from crew.crew_status import describe_crew_status
+from crew.context_compactor import get_context_compactor
+from crew.run_metrics import RunMetrics
+from tools.search_cache import get_search_cache_stats
+from tools.search_cassette import get_search_cassette_stats
+from tools.search_backends import get_search_router_stats
+from tools.paragraph_cache import get_paragraph_cache_stats
+from config.rate_limiter import get_rate_limiter_stats
+from config.llm_usage import track_llm_usage
 from agents.research_agent import ResearchAgent
 from agents.analyst_agent import AnalystAgent
 from agents.abstract_keywords_agent import AbstractKeywordsAgent
@@ -9,9 +25,12 @@ from agents.discusion_agent import DiscusionAgent
 from agents.conclusiones_agent import ConclusionesAgent
 from agents.bibliografia_agent import BibliografiaAgent
 
+logger = logging.getLogger(__name__)
+
 class ContentMarketingCrew:
-    def __init__(self):
+    def __init__(self, checkpoint_store: Optional[CheckpointStore] = None):
         self.model_config = ModelConfig()
+        self.checkpoint_store = checkpoint_store
         
         # Inicializar agentes
         self.research_agent = ResearchAgent(self.model_config)
@@ -33,7 +52,20 @@ class ContentMarketingCrew:
         self.conclusions_synthesizer = self.conclusiones_agent.create_agent()
         self.bibliography_specialist = self.bibliografia_agent.create_agent()
         
-        # Crear tareas
+        # Crear tareas (se recrean en cada run para no compartir estado entre ejecuciones)
+        self.create_tasks()
+        
+        # Hash de los prompts base: invalida checkpoints si cambian las tareas
+        self.prompt_hash = self._compute_prompt_hash()
+    
+    def create_tasks(self, topic: str = None, focus_sections: bool = False) -> None:
+        """
+        Crea un juego nuevo de tareas (estado por run) sobre los agentes ya inicializados.
+        
+        Con ``focus_sections`` el tópico se indica también en las tareas de redacción,
+        necesario cuando la investigación recibida como contexto cubre varios tópicos.
+        """
+        self._reset_agent_state()
         self.research_task = self.research_agent.create_research_task(self.researcher)
         self.analysis_task = self.analyst_agent.create_analysis_task(self.analyst)
         self.abstract_task = self.abstract_keywords_agent.create_abstract_task(self.abstract_writer)
@@ -43,6 +75,24 @@ class ContentMarketingCrew:
         self.conclusiones_task = self.conclusiones_agent.create_conclusiones_task(self.conclusions_synthesizer)
         self.bibliografia_task = self.bibliografia_agent.create_bibliografia_task(self.bibliography_specialist)
         
+        # Personalizar el topic si se proporciona
+        if topic:
+            self.research_task.description = f"""
+                Realiza una investigación exhaustiva sobre las últimas tendencias en content marketing 
+                específicamente relacionadas con: {topic}
+                
+                {self.research_task.description}
+                """
+        
+        if topic and focus_sections:
+            for task in [self.abstract_task, self.desarrollo_task, self.resultados_task,
+                         self.discusion_task, self.conclusiones_task, self.bibliografia_task]:
+                task.description = f"""
+                Enfoca esta sección específicamente en el tópico: {topic}
+                
+                {task.description}
+                """
+        
         # Configurar dependencias entre tareas
         self.analysis_task.context = [self.research_task]
         self.abstract_task.context = [self.research_task, self.analysis_task]
@@ -54,6 +104,15 @@ class ContentMarketingCrew:
         self.bibliografia_task.context = [self.research_task, self.analysis_task, self.desarrollo_task, 
                                          self.resultados_task, self.discusion_task]
     
+    def _reset_agent_state(self) -> None:
+        """
+        Limpia el estado por run de los agentes de crewai, que se reutilizan entre runs del pool:
+        los resultados de herramientas acumulados y el contador de reintentos por error.
+        """
+        for agent in self.get_agents().values():
+            agent.tools_results = []
+            agent._times_executed = 0
+    
     def create_crew(self) -> Crew:
         """Crea y configura el crew completo con todos los agentes especializados"""
         return Crew(
@@ -82,85 +141,203 @@ class ContentMarketingCrew:
             # memory=True,  # Habilitar memoria para contexto compartido
         )
     
-    def run_crew(self, topic: str = None) -> dict:
-        """Ejecuta el crew completo con todos los agentes especializados"""
+    def get_task_graph(self) -> Dict[str, Any]:
+        """Devuelve las tareas del crew indexadas por el nombre de su sección"""
+        return {
+            "research": self.research_task,
+            "analysis": self.analysis_task,
+            "abstract_keywords": self.abstract_task,
+            "desarrollo": self.desarrollo_task,
+            "resultados": self.resultados_task,
+            "discusion": self.discusion_task,
+            "conclusiones": self.conclusiones_task,
+            "bibliografia": self.bibliografia_task
+        }
+    
+    def get_agents(self) -> Dict[str, Any]:
+        """Devuelve los agentes del crew indexados por nombre"""
+        return {
+            "researcher": self.researcher,
+            "analyst": self.analyst,
+            "abstract_writer": self.abstract_writer,
+            "content_developer": self.content_developer,
+            "results_analyst": self.results_analyst,
+            "discussion_strategist": self.discussion_strategist,
+            "conclusions_synthesizer": self.conclusions_synthesizer,
+            "bibliography_specialist": self.bibliography_specialist
+        }
+    
+    def _compute_prompt_hash(self) -> str:
+        """Calcula un hash estable de las descripciones y salidas esperadas de las tareas"""
+        digest = hashlib.sha256()
+        for name, task in self.get_task_graph().items():
+            digest.update(f"{name}|{task.description}|{task.expected_output}".encode("utf-8"))
+        return digest.hexdigest()[:16]
+    
+    def _get_checkpoint_store(self) -> Optional[CheckpointStore]:
+        """Obtiene (o crea) el store de checkpoints si está habilitado"""
+        if self.checkpoint_store is None and AcademicConfig.CHECKPOINTS["enabled"]:
+            self.checkpoint_store = get_checkpoint_store()
+        return self.checkpoint_store
+    
+    def run_crew(self, topic: str = None, max_concurrency: Optional[int] = None,
+                 run_id: Optional[str] = None, resume: bool = False,
+                 on_task_start: Optional[Callable[[str], None]] = None,
+                 on_task_complete: Optional[Callable[[str, str], None]] = None,
+                 seed_outputs: Optional[Dict[str, str]] = None, use_cache: bool = True) -> dict:
+        """
+        Ejecuta el crew completo con todos los agentes especializados.
+        
+        Cada salida completada se guarda como checkpoint bajo ``run_id``; con
+        ``resume=True`` se omiten las tareas ya completadas en ese run.
+        ``on_task_start``/``on_task_complete`` permiten seguir el progreso por tarea.
+        ``seed_outputs`` aporta salidas ya calculadas (p. ej. investigación compartida
+        en un batch) que no se vuelven a ejecutar.
+        Con ``use_cache=False`` las llamadas al LLM no se sirven desde la caché de respuestas.
+        """
+        run_id = run_id or uuid.uuid4().hex
+        run_key = build_run_key(run_id, topic, self.prompt_hash)
+        metrics = RunMetrics(run_id)
+        
+        if AcademicConfig.EXECUTION["process"] == "sequential" and (resume or seed_outputs):
+            # Process.sequential de crewai no guarda checkpoints ni puede saltarse tareas ya completadas
+            return {
+                "success": False,
+                "run_id": run_id,
+                "error": "Reanudar un run o partir de salidas previas requiere EXECUTION['process'] = 'parallel'",
+                "details": "El modo sequential siempre ejecuta todas las tareas"
+            }
+        
         try:
-            # Personalizar el topic si se proporciona
-            if topic:
-                self.research_task.description = f"""
-                Realiza una investigación exhaustiva sobre las últimas tendencias en content marketing 
-                específicamente relacionadas con: {topic}
+            self.model_config.set_cache_bypass(not use_cache)
+            self.create_tasks(topic, focus_sections=bool(seed_outputs))
+            
+            if AcademicConfig.EXECUTION["process"] == "sequential":
+                execution = self._run_sequential()
+            else:
+                store = self._get_checkpoint_store()
+                completed_outputs = dict(seed_outputs or {})
+                if store and resume:
+                    completed_outputs.update(store.load(run_key))
+                if completed_outputs:
+                    logger.info(f"Reanudando run {run_id}: {len(completed_outputs)} tareas ya completadas")
+                    if on_task_complete:
+                        for name, output in completed_outputs.items():
+                            on_task_complete(name, output)
                 
-                {self.research_task.description}
-                """
+                def task_completed(name: str, output: str) -> None:
+                    if store:
+                        store.save(run_key, name, output)
+                    if on_task_complete:
+                        on_task_complete(name, output)
+                
+                executor = ParallelTaskExecutor(
+                    self.get_task_graph(),
+                    max_concurrency=max_concurrency or AcademicConfig.EXECUTION["max_concurrency"],
+                    context_compactor=get_context_compactor(),
+                    metrics=metrics
+                )
+                execution = executor.run(
+                    completed_outputs=completed_outputs,
+                    on_task_start=on_task_start,
+                    on_task_complete=task_completed
+                )
+                if store:
+                    # Los checkpoints de este run se conservan hasta caducar (se puede volver a pedir su resultado)
+                    store.purge_expired()
             
-            crew = self.create_crew()
-            result = crew.kickoff()
+            outputs = execution["outputs"]
+            run_metrics = metrics.log(topic=topic, success=True)
             
             return {
                 "success": True,
-                "result": result,
+                "run_id": run_id,
+                "result": outputs.get("bibliografia"),
                 "topic": topic or "Tendencias generales en content marketing",
-                "outputs": {
-                    "research": getattr(self.research_task, 'output', None),
-                    "analysis": getattr(self.analysis_task, 'output', None),
-                    "abstract_keywords": getattr(self.abstract_task, 'output', None),
-                    "desarrollo": getattr(self.desarrollo_task, 'output', None),
-                    "resultados": getattr(self.resultados_task, 'output', None),
-                    "discusion": getattr(self.discusion_task, 'output', None),
-                    "conclusiones": getattr(self.conclusiones_task, 'output', None),
-                    "bibliografia": getattr(self.bibliografia_task, 'output', None)
-                },
+                "outputs": {name: outputs.get(name) for name in self.get_task_graph()},
                 "metadata": {
                     "agents_count": 8,
-                    "tasks_executed": 8,
-                    "specialized_sections": [
-                        "research", "analysis", "abstract_keywords", 
-                        "desarrollo", "resultados", "discusion", 
-                        "conclusiones", "bibliografia"
-                    ]
+                    "tasks_executed": len(execution["task_timings"]),
+                    "specialized_sections": list(self.get_task_graph()),
+                    "process": AcademicConfig.EXECUTION["process"],
+                    "task_timings": execution["task_timings"],
+                    "wall_clock_seconds": execution["wall_clock_seconds"],
+                    "resumed_tasks": execution.get("skipped_tasks", []),
+                    "context_compaction": execution.get("context_stats", {}),
+                    "token_usage": execution.get("token_usage") or metrics.token_usage(),
+                    "output_length": sum(len(text.split()) for text in outputs.values() if text),
+                    "llm_cache": self._llm_cache_stats(use_cache),
+                    "search_cache": get_search_cache_stats(),
+                    "search_cassette": get_search_cassette_stats(),
+                    "search_backends": get_search_router_stats(),
+                    "paragraph_cache": get_paragraph_cache_stats(),
+                    "rate_limits": get_rate_limiter_stats(),
+                    "metrics": run_metrics
                 }
             }
             
         except Exception as e:
+            metrics.log(topic=topic, success=False, error=str(e))
             return {
                 "success": False,
+                "run_id": run_id,
                 "error": str(e),
                 "details": "Error durante la ejecución del crew especializado"
             }
     
+    def run_shared_stage(self, topics: List[str], max_concurrency: Optional[int] = None,
+                         use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Ejecuta solo investigación y análisis para un grupo de tópicos relacionados.
+        
+        Las salidas se reutilizan como ``seed_outputs`` de cada artículo del grupo.
+        """
+        # El crew viene del pool: no se hereda el bypass de la caché que dejó el run anterior
+        self.model_config.set_cache_bypass(not use_cache)
+        self.create_tasks(topic="; ".join(topics))
+        metrics = RunMetrics(uuid.uuid4().hex)
+        
+        executor = ParallelTaskExecutor(
+            {"research": self.research_task, "analysis": self.analysis_task},
+            max_concurrency=max_concurrency or AcademicConfig.EXECUTION["max_concurrency"],
+            metrics=metrics
+        )
+        execution = executor.run()
+        
+        return {
+            "outputs": execution["outputs"],
+            "task_timings": execution["task_timings"],
+            "wall_clock_seconds": execution["wall_clock_seconds"],
+            "token_usage": metrics.token_usage()
+        }
+    
+    @staticmethod
+    def _llm_cache_stats(use_cache: bool) -> Dict[str, Any]:
+        """Estadísticas de la caché de respuestas de LLM del contenedor"""
+        if not AcademicConfig.LLM_CACHE["enabled"]:
+            return {"enabled": False}
+        from config.llm_cache import get_llm_cache
+        return {"enabled": True, "bypassed": not use_cache, **get_llm_cache().get_stats()}
+    
+    def _run_sequential(self) -> Dict[str, Any]:
+        """Ejecuta el crew con Process.sequential y normaliza el resultado"""
+        start = time.perf_counter()
+        # Process.sequential ejecuta todas las tareas en este hilo
+        with track_llm_usage() as usage:
+            self.create_crew().kickoff()
+        
+        outputs = {}
+        for name, task in self.get_task_graph().items():
+            task_output = getattr(task, 'output', None)
+            outputs[name] = getattr(task_output, 'raw', None)
+        
+        return {
+            "outputs": outputs,
+            "task_timings": {name: {} for name in outputs},
+            "wall_clock_seconds": round(time.perf_counter() - start, 3),
+            "token_usage": usage
+        }
+    
     def get_crew_status(self) -> dict:
         """Obtiene el estado actual del crew especializado"""
-        return {
-            "agents": {
-                "researcher": "initialized",
-                "analyst": "initialized",
-                "abstract_writer": "initialized",
-                "content_developer": "initialized",
-                "results_analyst": "initialized",
-                "discussion_strategist": "initialized",
-                "conclusions_synthesizer": "initialized",
-                "bibliography_specialist": "initialized"
-            },
-            "tasks": {
-                "research": "pending",
-                "analysis": "pending",
-                "abstract_keywords": "pending",
-                "desarrollo": "pending",
-                "resultados": "pending",
-                "discusion": "pending",
-                "conclusiones": "pending",
-                "bibliografia": "pending"
-            },
-            "workflow": {
-                "type": "sequential_specialized",
-                "total_agents": 8,
-                "total_tasks": 8,
-                "estimated_completion_time": "20-30 minutes",
-                "specialization_level": "academic_quality"
-            },
-            "model_config": {
-                "openai_available": bool(self.model_config.openai_api_key),
-                "default_model": "OpenAI" if self.model_config.openai_api_key else "Local"
-            }
-        }
\ No newline at end of file
+        return describe_crew_status(openai_available=bool(self.model_config.openai_api_key))
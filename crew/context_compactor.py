@@ -0,0 +1,125 @@
+import re
+from typing import Dict, Any, Optional, Tuple
+from config.settings import AcademicConfig
+from config.tokens import count_tokens
+
+# Líneas que se conservan textualmente con máxima prioridad
+HEADING_PATTERN = re.compile(r'^\s*(#{1,6}\s+\S|\*\*[^*]+\*\*:?\s*$|[A-ZÁÉÍÓÚÑ0-9 ]{6,}:?\s*$)')
+URL_PATTERN = re.compile(r'https?://\S+')
+STAT_PATTERN = re.compile(r'\d+(?:[.,]\d+)?\s?%|\$\s?\d|\b\d{4}\b|\b\d+(?:[.,]\d+)+\b')
+
+GAP_MARKER = "[...]"
+
+
+def _line_priority(line: str) -> int:
+    """Prioridad de una línea: encabezados y URLs > estadísticas > resto"""
+    if HEADING_PATTERN.match(line) or URL_PATTERN.search(line):
+        return 3
+    if STAT_PATTERN.search(line):
+        return 2
+    return 1 if line.strip() else 0
+
+
+class ContextCompactor:
+    """
+    Compacta las salidas de tareas previas antes de inyectarlas como contexto.
+
+    El recorte es extractivo: se eligen líneas completas por prioridad
+    (encabezados, URLs, estadísticas y después el texto en orden de aparición)
+    hasta agotar el presupuesto de tokens, por lo que lo que se conserva es
+    siempre textual.
+    """
+
+    def __init__(self, task_budgets: Optional[Dict[str, int]] = None,
+                 default_budget: Optional[int] = None):
+        self.task_budgets = task_budgets or {}
+        self.default_budget = default_budget
+
+    def budget_for(self, task_name: str) -> Optional[int]:
+        """Presupuesto de tokens de contexto para una tarea (None = sin límite)"""
+        return self.task_budgets.get(task_name, self.default_budget)
+
+    def compact(self, task_name: str, upstream: Dict[str, str], divider: str) -> Tuple[str, Dict[str, Any]]:
+        """Devuelve el contexto compactado para ``task_name`` y sus estadísticas de tokens"""
+        budget = self.budget_for(task_name)
+        original = divider.join(text for text in upstream.values() if text)
+        pre_tokens = count_tokens(original)
+
+        if budget is None or pre_tokens <= budget:
+            return original, {"budget": budget, "pre_tokens": pre_tokens, "post_tokens": pre_tokens,
+                              "compacted": False}
+
+        # Reparto equitativo del presupuesto; lo que no usa una salida corta pasa a las demás
+        sizes = {name: count_tokens(text) for name, text in upstream.items() if text}
+        shares = self._allocate(sizes, budget - count_tokens(divider) * max(len(sizes) - 1, 0))
+        parts = [self.trim(upstream[name], shares[name]) for name in sizes]
+
+        compacted = divider.join(parts)
+        return compacted, {"budget": budget, "pre_tokens": pre_tokens,
+                           "post_tokens": count_tokens(compacted), "compacted": True}
+
+    @staticmethod
+    def _allocate(sizes: Dict[str, int], budget: int) -> Dict[str, int]:
+        """Reparte el presupuesto entre salidas (max-min fairness)"""
+        shares = {}
+        remaining = dict(sizes)
+        available = max(budget, 0)
+
+        while remaining:
+            fair_share = available // len(remaining)
+            small = {name: size for name, size in remaining.items() if size <= fair_share}
+            if not small:
+                for name in remaining:
+                    shares[name] = fair_share
+                break
+            for name, size in small.items():
+                shares[name] = size
+                available -= size
+                del remaining[name]
+
+        return shares
+
+    @staticmethod
+    def trim(text: str, budget: int) -> str:
+        """Recorta un texto a ``budget`` tokens conservando líneas completas por prioridad"""
+        if count_tokens(text) <= budget:
+            return text
+
+        lines = text.split("\n")
+        candidates = sorted(
+            ((priority, index) for index, line in enumerate(lines)
+             if (priority := _line_priority(line)) > 0),
+            key=lambda item: (-item[0], item[1])
+        )
+
+        selected = set()
+        used = 0
+        for _, index in candidates:
+            cost = count_tokens(lines[index]) + 2  # Salto de línea y posible marcador de hueco
+            if used + cost > budget:
+                continue
+            selected.add(index)
+            used += cost
+
+        output = []
+        skipped = False
+        for index, line in enumerate(lines):
+            if index in selected:
+                if skipped:
+                    output.append(GAP_MARKER)
+                    skipped = False
+                output.append(line)
+            elif line.strip():
+                skipped = True
+        if skipped:
+            output.append(GAP_MARKER)
+
+        return "\n".join(output)
+
+
+def get_context_compactor() -> Optional[ContextCompactor]:
+    """Crea el compactador con los presupuestos de AcademicConfig (None si está deshabilitado)"""
+    settings = AcademicConfig.CONTEXT_COMPACTION
+    if not settings["enabled"]:
+        return None
+    return ContextCompactor(settings["task_budgets"], settings["default_budget_tokens"])
@@ -0,0 +1,100 @@
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _build_crew(crew_type: str):
+    """Construye un crew nuevo del tipo solicitado (importa el stack de agentes bajo demanda)"""
+    if crew_type == "basic":
+        from crew.basic_content_crew import BasicContentMarketingCrew
+        return BasicContentMarketingCrew()
+
+    from crew.content_crew import ContentMarketingCrew
+    return ContentMarketingCrew()
+
+
+class CrewPool:
+    """
+    Pool de crews que sobrevive entre invocaciones en caliente de Lambda.
+
+    Los agentes, herramientas y clientes LLM de cada crew se construyen una
+    sola vez; cada run recibe tareas nuevas (``create_tasks``) y un crew solo
+    se presta a una petición a la vez.
+    """
+
+    def __init__(self, factory: Callable[[str], Any] = _build_crew, max_idle_per_type: int = 4):
+        self.factory = factory
+        self.max_idle_per_type = max_idle_per_type
+        self._idle: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"created": 0, "reused": 0, "build_seconds": 0.0}
+
+    @contextmanager
+    def acquire(self, crew_type: str = "academic"):
+        """Presta un crew del pool (o lo construye si no hay ninguno libre)"""
+        crew_type = "basic" if crew_type == "basic" else "academic"
+        crew = self._checkout(crew_type)
+        try:
+            yield crew
+        finally:
+            self._release(crew_type, crew)
+
+    def _checkout(self, crew_type: str):
+        with self._lock:
+            idle = self._idle.setdefault(crew_type, [])
+            if idle:
+                self._stats["reused"] += 1
+                return idle.pop()
+
+        start = time.perf_counter()
+        crew = self.factory(crew_type)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._stats["created"] += 1
+            self._stats["build_seconds"] += elapsed
+        logger.info(f"Crew '{crew_type}' construido en {elapsed:.2f}s")
+        return crew
+
+    def _release(self, crew_type: str, crew) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(crew_type, [])
+            if len(idle) < self.max_idle_per_type:
+                idle.append(crew)
+
+    def is_warm(self, crew_type: str = "academic") -> bool:
+        """Indica si hay un crew ya construido disponible para el tipo dado"""
+        with self._lock:
+            return bool(self._idle.get(crew_type))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estadísticas de reutilización del pool"""
+        with self._lock:
+            return {
+                **self._stats,
+                "build_seconds": round(self._stats["build_seconds"], 3),
+                "idle": {crew_type: len(crews) for crew_type, crews in self._idle.items()}
+            }
+
+    def clear(self) -> None:
+        """Descarta todos los crews inactivos"""
+        with self._lock:
+            self._idle.clear()
+
+
+_crew_pool: Optional[CrewPool] = None
+_crew_pool_lock = threading.Lock()
+
+
+def get_crew_pool() -> CrewPool:
+    """Obtiene el pool de crews del contenedor (se crea de forma perezosa)"""
+    global _crew_pool
+    if _crew_pool is None:
+        with _crew_pool_lock:
+            if _crew_pool is None:
+                _crew_pool = CrewPool()
+    return _crew_pool
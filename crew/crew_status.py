@@ -0,0 +1,44 @@
+import os
+from typing import Dict
+from config.settings import AcademicConfig
+
+# Nombres de agentes y secciones del crew académico
+CREW_AGENTS = [
+    "researcher", "analyst", "abstract_writer", "content_developer",
+    "results_analyst", "discussion_strategist", "conclusions_synthesizer",
+    "bibliography_specialist"
+]
+
+CREW_SECTIONS = [
+    "research", "analysis", "abstract_keywords", "desarrollo",
+    "resultados", "discusion", "conclusiones", "bibliografia"
+]
+
+
+def describe_crew_status(agents_state: str = "initialized", openai_available: bool = None,
+                         task_states: Dict[str, str] = None) -> dict:
+    """
+    Describe el estado del crew especializado sin importar el stack de agentes.
+
+    Permite servir health checks y consultas de estado sin construir el crew;
+    ``task_states`` sobrescribe el estado 'pending' con el progreso real de un job.
+    """
+    if openai_available is None:
+        openai_available = bool(os.getenv('OPENAI_API_KEY'))
+
+    return {
+        "agents": {agent: agents_state for agent in CREW_AGENTS},
+        "tasks": {section: (task_states or {}).get(section, "pending") for section in CREW_SECTIONS},
+        "workflow": {
+            "type": f"{AcademicConfig.EXECUTION['process']}_specialized",
+            "max_concurrency": AcademicConfig.EXECUTION["max_concurrency"],
+            "total_agents": len(CREW_AGENTS),
+            "total_tasks": len(CREW_SECTIONS),
+            "estimated_completion_time": "20-30 minutes",
+            "specialization_level": "academic_quality"
+        },
+        "model_config": {
+            "openai_available": openai_available,
+            "default_model": "OpenAI" if openai_available else "Local"
+        }
+    }
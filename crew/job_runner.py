@@ -0,0 +1,125 @@
+import os
+import json
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional
+from config.settings import AcademicConfig
+from crew.crew_pool import get_crew_pool
+from crew.batch_crew import BatchArticleGenerator
+from crew.crew_status import CREW_SECTIONS
+from crew.job_store import JobStore, get_job_store, JOB_RUNNING, JOB_DONE, JOB_FAILED
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+    """
+    Encola jobs de generación y los ejecuta en segundo plano.
+
+    Con ``dispatch='thread'`` el job corre en un pool de hilos del mismo
+    proceso. Con ``dispatch='lambda'`` la función se auto-invoca de forma
+    asíncrona (``InvocationType='Event'``) con la acción ``run_job``; en ese
+    caso el job store debe estar en almacenamiento compartido (p. ej. EFS).
+    """
+
+    def __init__(self, store: Optional[JobStore] = None, max_workers: Optional[int] = None,
+                 dispatch: Optional[str] = None):
+        self.store = store or get_job_store()
+        self.dispatch = dispatch or AcademicConfig.JOBS["dispatch"]
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or AcademicConfig.JOBS["max_workers"],
+            thread_name_prefix="crew-job"
+        )
+
+    def submit(self, params: Dict[str, Any]) -> str:
+        """Registra un job nuevo y lo despacha; devuelve su job id"""
+        job_id = uuid.uuid4().hex
+        # El run id identifica los checkpoints; se reutiliza el del cliente al reanudar
+        params = {**params, "run_id": params.get("run_id") or job_id}
+        # Los batch y el crew básico solo reportan progreso a nivel de job
+        task_names = CREW_SECTIONS if params.get("crew_type") != "basic" and not params.get("topics") else []
+
+        self.store.create_job(job_id, params, task_names)
+
+        if self.dispatch == "lambda":
+            self._invoke_lambda(job_id)
+        else:
+            self._executor.submit(self.run_job, job_id)
+
+        logger.info(f"Job {job_id} encolado ({self.dispatch})")
+        return job_id
+
+    def _invoke_lambda(self, job_id: str) -> None:
+        """Dispara la ejecución del job en una invocación asíncrona de la propia función"""
+        import boto3
+
+        boto3.client('lambda').invoke(
+            FunctionName=os.environ['AWS_LAMBDA_FUNCTION_NAME'],
+            InvocationType='Event',
+            Payload=json.dumps({'action': 'run_job', 'job_id': job_id}).encode('utf-8')
+        )
+
+    def run_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Ejecuta un job registrado actualizando su progreso en el store"""
+        job = self.store.get_job(job_id, include_result=False)
+        if job is None:
+            logger.error(f"Job {job_id} no encontrado")
+            return None
+
+        params = job["params"]
+        crew_type = params.get("crew_type", "basic")
+        self.store.update_job(job_id, JOB_RUNNING)
+
+        try:
+            if params.get("topics"):
+                result = BatchArticleGenerator().run(params["topics"])
+                self._finish_job(job_id, result)
+                return result
+
+            with get_crew_pool().acquire(crew_type) as crew:
+                if crew_type == "basic":
+                    result = crew.run_crew(topic=params.get("topic"), format_type=params.get("format_type", "blog"))
+                else:
+                    result = crew.run_crew(
+                        topic=params.get("topic"),
+                        run_id=params["run_id"],
+                        resume=params.get("resume", False),
+                        use_cache=params.get("use_cache", True),
+                        on_task_start=lambda name: self.store.task_started(job_id, name),
+                        on_task_complete=lambda name, output: self.store.task_completed(job_id, name, output)
+                    )
+
+            self._finish_job(job_id, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"Error ejecutando job {job_id}: {str(e)}", exc_info=True)
+            self.store.update_job(job_id, JOB_FAILED, error=str(e))
+            return None
+
+    def _finish_job(self, job_id: str, result: Dict[str, Any]) -> None:
+        """Guarda el resultado final del job"""
+        if result.get("success"):
+            self.store.update_job(job_id, JOB_DONE, result=result)
+        else:
+            self.store.update_job(job_id, JOB_FAILED, result=result, error=result.get("error"))
+
+    def get_job(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        """Obtiene el estado de un job"""
+        return self.store.get_job(job_id, include_result=include_result)
+
+
+_job_runner: Optional[JobRunner] = None
+_job_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """Obtiene el runner de jobs del proceso (se crea de forma perezosa)"""
+    global _job_runner
+    if _job_runner is None:
+        with _job_runner_lock:
+            if _job_runner is None:
+                _job_runner = JobRunner()
+    return _job_runner
@@ -0,0 +1,172 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from config.settings import AcademicConfig
+
+# Estados de un job y de cada una de sus tareas
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class JobStore(ABC):
+    """Interfaz base para guardar el estado de los jobs de generación"""
+
+    @abstractmethod
+    def create_job(self, job_id: str, params: Dict[str, Any], task_names: List[str]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def update_job(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None,
+                   error: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def task_started(self, job_id: str, task_name: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def task_completed(self, job_id: str, task_name: str, output: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_job(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+
+class SQLiteJobStore(JobStore):
+    """Job store en SQLite local (stand-in de un store compartido como DynamoDB)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    error TEXT,
+                    result TEXT
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_tasks (
+                    job_id TEXT NOT NULL,
+                    task_name TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    status TEXT NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    output_size INTEGER,
+                    PRIMARY KEY (job_id, task_name)
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def create_job(self, job_id: str, params: Dict[str, Any], task_names: List[str]) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (job_id, status, params, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, JOB_QUEUED, json.dumps(params, ensure_ascii=False), time.time())
+            )
+            conn.executemany(
+                "INSERT INTO job_tasks (job_id, task_name, position, status) VALUES (?, ?, ?, ?)",
+                [(job_id, name, position, JOB_QUEUED) for position, name in enumerate(task_names)]
+            )
+
+    def update_job(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None,
+                   error: Optional[str] = None) -> None:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            if status == JOB_RUNNING:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, started_at = COALESCE(started_at, ?) WHERE job_id = ?",
+                    (status, now, job_id)
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, error = ?, result = ? WHERE job_id = ?",
+                    (status, now, error,
+                     json.dumps(result, ensure_ascii=False, default=str) if result is not None else None,
+                     job_id)
+                )
+
+    def task_started(self, job_id: str, task_name: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE job_tasks SET status = ?, started_at = ? WHERE job_id = ? AND task_name = ?",
+                (JOB_RUNNING, time.time(), job_id, task_name)
+            )
+
+    def task_completed(self, job_id: str, task_name: str, output: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE job_tasks SET status = ?, finished_at = ?, output_size = ? "
+                "WHERE job_id = ? AND task_name = ?",
+                (JOB_DONE, time.time(), len(output or ""), job_id, task_name)
+            )
+
+    def get_job(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT job_id, status, params, created_at, started_at, finished_at, error, result "
+                "FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            task_rows = conn.execute(
+                "SELECT task_name, status, started_at, finished_at, output_size "
+                "FROM job_tasks WHERE job_id = ? ORDER BY position", (job_id,)
+            ).fetchall()
+
+        job = {
+            "job_id": row[0],
+            "status": row[1],
+            "params": json.loads(row[2]),
+            "created_at": _iso(row[3]),
+            "started_at": _iso(row[4]),
+            "finished_at": _iso(row[5]),
+            "error": row[6],
+            "tasks": {
+                name: {
+                    "status": status,
+                    "started_at": _iso(started_at),
+                    "finished_at": _iso(finished_at),
+                    "output_size": output_size
+                }
+                for name, status, started_at, finished_at, output_size in task_rows
+            }
+        }
+        if include_result:
+            job["result"] = json.loads(row[7]) if row[7] else None
+        return job
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    """Convierte un timestamp epoch a ISO-8601 UTC"""
+    if timestamp is None:
+        return None
+    return datetime.utcfromtimestamp(timestamp).isoformat() + 'Z'
+
+
+def get_job_store(path: Optional[str] = None) -> JobStore:
+    """Obtiene el job store configurado"""
+    return SQLiteJobStore(path or AcademicConfig.JOBS["path"])
@@ -0,0 +1,129 @@
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Optional
+from config.llm_usage import empty_usage, track_llm_usage
+from tools.tool_metrics import set_tool_call_sink
+
+logger = logging.getLogger(__name__)
+
+
+class RunMetrics:
+    """
+    Instrumentación de un run del crew: latencia, tokens, round trips al LLM,
+    llamadas a herramientas (con su latencia), llamadas coalescidas con otra
+    idéntica en vuelo y reintentos por tarea.
+
+    Los tokens y round trips de una tarea son los de las llamadas al LLM
+    hechas desde su hilo (``track_llm_usage``), así que tareas en paralelo
+    no se atribuyen el consumo de otras.
+    """
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def track_task(self, name: str, task):
+        """Mide una tarea; las herramientas y llamadas al LLM hechas desde este hilo se le atribuyen"""
+        agent = getattr(task, 'agent', None)
+        errors_before = getattr(task, 'tools_errors', 0) or 0
+        metrics = {
+            "wall_clock_seconds": None,
+            "tool_calls": [],
+            "status": "running"
+        }
+        with self._lock:
+            self.tasks[name] = metrics
+
+        def sink(tool_name: str, seconds: float, success: bool, coalesced: bool = False,
+                 details: Optional[Dict[str, Any]] = None) -> None:
+            call = {
+                "tool": tool_name,
+                "latency_ms": round(seconds * 1000, 2),
+                "success": success,
+                "coalesced": coalesced
+            }
+            if details:
+                call["details"] = details
+            metrics["tool_calls"].append(call)
+
+        set_tool_call_sink(sink)
+        start = time.perf_counter()
+        with track_llm_usage() as usage:
+            try:
+                yield metrics
+                metrics["status"] = "done"
+            except Exception:
+                metrics["status"] = "failed"
+                raise
+            finally:
+                set_tool_call_sink(None)
+                executor = getattr(agent, 'agent_executor', None)
+
+                metrics["wall_clock_seconds"] = round(time.perf_counter() - start, 3)
+                metrics["prompt_tokens"] = usage["prompt_tokens"]
+                metrics["completion_tokens"] = usage["completion_tokens"]
+                metrics["llm_round_trips"] = usage["successful_requests"]
+                metrics["agent_iterations"] = getattr(executor, 'iterations', None)
+                metrics["tool_retries"] = (getattr(task, 'tools_errors', 0) or 0) - errors_before
+                metrics["tool_calls_count"] = len(metrics["tool_calls"])
+                metrics["coalesced_calls"] = sum(1 for call in metrics["tool_calls"] if call["coalesced"])
+
+    def token_usage(self) -> Dict[str, int]:
+        """Consumo de tokens del run (suma de sus tareas)"""
+        with self._lock:
+            tasks = list(self.tasks.values())
+        usage = empty_usage()
+        for metrics in tasks:
+            usage["prompt_tokens"] += metrics.get("prompt_tokens", 0)
+            usage["completion_tokens"] += metrics.get("completion_tokens", 0)
+            usage["successful_requests"] += metrics.get("llm_round_trips", 0)
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        return usage
+
+    def summary(self) -> Dict[str, Any]:
+        """Métricas por tarea y totales del run"""
+        with self._lock:
+            tasks = {name: dict(metrics) for name, metrics in self.tasks.items()}
+
+        totals = {"prompt_tokens": 0, "completion_tokens": 0, "llm_round_trips": 0,
+                  "tool_calls": 0, "tool_retries": 0, "tool_latency_ms": 0.0, "coalesced_calls": 0,
+                  "dedup_tokens_removed": 0, "search_result_tokens": 0, "analysis_ms_saved": 0.0}
+        for metrics in tasks.values():
+            totals["prompt_tokens"] += metrics.get("prompt_tokens", 0)
+            totals["completion_tokens"] += metrics.get("completion_tokens", 0)
+            totals["llm_round_trips"] += metrics.get("llm_round_trips", 0)
+            totals["tool_calls"] += metrics.get("tool_calls_count", 0)
+            totals["tool_retries"] += metrics.get("tool_retries", 0)
+            totals["coalesced_calls"] += metrics.get("coalesced_calls", 0)
+            totals["tool_latency_ms"] += sum(call["latency_ms"] for call in metrics["tool_calls"])
+            totals["dedup_tokens_removed"] += sum(
+                report["tokens_removed"]
+                for call in metrics["tool_calls"] for report in call.get("details", {}).get("dedup", [])
+            )
+            totals["search_result_tokens"] += sum(
+                report["tokens"]
+                for call in metrics["tool_calls"] for report in call.get("details", {}).get("render", [])
+            )
+            totals["analysis_ms_saved"] += sum(
+                report["saved_ms"]
+                for call in metrics["tool_calls"] for report in call.get("details", {}).get("paragraph_cache", [])
+            )
+
+        totals["total_tokens"] = totals["prompt_tokens"] + totals["completion_tokens"]
+        totals["tool_latency_ms"] = round(totals["tool_latency_ms"], 2)
+        totals["analysis_ms_saved"] = round(totals["analysis_ms_saved"], 2)
+        totals["wall_clock_seconds"] = round(time.perf_counter() - self._start, 3)
+
+        return {"run_id": self.run_id, "tasks": tasks, "totals": totals}
+
+    def log(self, **extra) -> Dict[str, Any]:
+        """Emite las métricas del run como una sola línea de log estructurada"""
+        summary = self.summary()
+        logger.info(json.dumps({"event": "crew_run_metrics", **extra, **summary}, ensure_ascii=False, default=str))
+        return summary
@@ -0,0 +1,109 @@
+import json
+import time
+import uuid
+import queue
+import logging
+import threading
+from typing import Dict, Any, Iterator, Optional
+from crew.crew_pool import get_crew_pool
+from crew.crew_status import CREW_SECTIONS
+
+logger = logging.getLogger(__name__)
+
+# Marca de fin de la cola de eventos del run en segundo plano
+_END = object()
+
+
+def format_sse(event: Dict[str, Any]) -> bytes:
+    """Serializa un evento como mensaje Server-Sent Events"""
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    return f"event: {event['event']}\ndata: {data}\n\n".encode("utf-8")
+
+
+def format_article(sections: Dict[str, str], topic: Optional[str], format_type: str = "academic") -> str:
+    """Combina las secciones en el artículo final con el formateador de artículos"""
+    from tools.article_formatter import ArticleFormatterTool
+
+    title = topic or "Tendencias generales en content marketing"
+    return ArticleFormatterTool()._run(sections=sections, title=title, format_type=format_type)
+
+
+def stream_article(topic: Optional[str] = None, format_type: str = "academic",
+                   run_id: Optional[str] = None, resume: bool = False,
+                   use_cache: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Ejecuta el crew académico y emite cada sección en cuanto termina su tarea.
+
+    Eventos, en orden: ``start``, un ``section`` por tarea completada (research,
+    analysis, abstract_keywords, ...), ``article`` con el artículo formateado y
+    ``done`` con la metadata del run; si el run falla se emite ``error``.
+    Las secciones recuperadas de checkpoints al reanudar se emiten antes del
+    artículo, ya que no vuelven a ejecutarse.
+
+    El crew se toma del pool dentro del hilo del run y se devuelve cuando el
+    run termina, aunque el consumidor deje de iterar antes (p. ej. porque el
+    cliente se desconectó).
+    """
+    # El run id se fija antes de arrancar para poder anunciarlo (y reanudar) desde el primer evento
+    run_id = run_id or uuid.uuid4().hex
+    events: "queue.Queue" = queue.Queue()
+    start = time.perf_counter()
+    streamed = set()
+
+    def on_task_complete(name: str, output: str) -> None:
+        events.put({
+            "event": "section",
+            "task": name,
+            "content": output,
+            "elapsed_seconds": round(time.perf_counter() - start, 3)
+        })
+
+    def run() -> None:
+        try:
+            with get_crew_pool().acquire("academic") as crew:
+                result = crew.run_crew(topic=topic, run_id=run_id, resume=resume,
+                                       on_task_complete=on_task_complete, use_cache=use_cache)
+        except Exception as e:
+            logger.error(f"Error en el run del stream: {str(e)}", exc_info=True)
+            result = {"success": False, "error": str(e)}
+        events.put(result)
+        events.put(_END)
+
+    worker = threading.Thread(target=run, name="crew-stream", daemon=True)
+    worker.start()
+
+    yield {"event": "start", "topic": topic, "run_id": run_id, "sections": CREW_SECTIONS}
+
+    result: Dict[str, Any] = {}
+    while True:
+        item = events.get()
+        if item is _END:
+            break
+        if item.get("event") == "section":
+            streamed.add(item["task"])
+            yield item
+        else:
+            result = item
+
+    if not result.get("success"):
+        yield {
+            "event": "error",
+            "run_id": result.get("run_id", run_id),
+            "error": result.get("error", "Error desconocido"),
+            "completed_sections": sorted(streamed)
+        }
+        return
+
+    outputs = result.get("outputs", {})
+    for name, output in outputs.items():
+        if name not in streamed:
+            yield {"event": "section", "task": name, "content": output, "resumed": True,
+                   "elapsed_seconds": round(time.perf_counter() - start, 3)}
+
+    yield {"event": "article", "format_type": format_type, "content": format_article(outputs, topic, format_type)}
+    yield {
+        "event": "done",
+        "run_id": result.get("run_id"),
+        "elapsed_seconds": round(time.perf_counter() - start, 3),
+        "metadata": result.get("metadata", {})
+    }
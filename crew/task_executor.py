@@ -0,0 +1,155 @@
+import time
+import logging
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+# Mismo separador que usa crewai al agregar el contexto de tareas previas
+CONTEXT_DIVIDER = "\n\n----------\n\n"
+
+
+class ParallelTaskExecutor:
+    """
+    Ejecuta las tareas del crew como un grafo de dependencias (DAG).
+
+    Las dependencias se derivan de ``task.context``: una tarea queda lista en
+    cuanto todas las tareas de su contexto han terminado, y todas las tareas
+    listas se ejecutan en paralelo hasta ``max_concurrency``.
+    """
+
+    def __init__(self, tasks: Dict[str, Any], max_concurrency: int = 3, context_compactor=None,
+                 metrics=None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency debe ser al menos 1")
+
+        self.tasks = tasks
+        self.max_concurrency = max_concurrency
+        self.context_compactor = context_compactor
+        self.metrics = metrics
+        self.context_stats: Dict[str, Dict[str, Any]] = {}
+        self.dependencies = self._build_dependencies()
+
+    def _build_dependencies(self) -> Dict[str, List[str]]:
+        """Construye el mapa tarea -> dependencias a partir de task.context"""
+        names_by_task = {id(task): name for name, task in self.tasks.items()}
+        dependencies = {}
+
+        for name, task in self.tasks.items():
+            deps = []
+            for upstream in getattr(task, 'context', None) or []:
+                upstream_name = names_by_task.get(id(upstream))
+                if upstream_name is None:
+                    raise ValueError(f"La tarea '{name}' depende de una tarea fuera del grafo")
+                deps.append(upstream_name)
+            dependencies[name] = deps
+
+        return dependencies
+
+    def execution_levels(self) -> List[List[str]]:
+        """Agrupa las tareas en niveles que pueden ejecutarse en paralelo"""
+        levels = []
+        done = set()
+        pending = list(self.tasks)
+
+        while pending:
+            level = [name for name in pending if all(dep in done for dep in self.dependencies[name])]
+            if not level:
+                raise ValueError(f"Dependencias cíclicas entre tareas: {pending}")
+            levels.append(level)
+            done.update(level)
+            pending = [name for name in pending if name not in done]
+
+        return levels
+
+    def build_context(self, name: str, outputs: Dict[str, str]) -> Optional[str]:
+        """Construye el contexto de una tarea con las salidas de sus dependencias"""
+        deps = self.dependencies[name]
+        if not deps:
+            return None
+
+        if self.context_compactor is None:
+            return CONTEXT_DIVIDER.join(outputs[dep] for dep in deps if outputs.get(dep))
+
+        context, stats = self.context_compactor.compact(
+            name, {dep: outputs.get(dep) for dep in deps}, CONTEXT_DIVIDER
+        )
+        self.context_stats[name] = stats
+        if stats["compacted"]:
+            logger.info(f"Contexto de '{name}' compactado: {stats['pre_tokens']} -> {stats['post_tokens']} tokens")
+        return context
+
+    def run(self,
+            completed_outputs: Optional[Dict[str, str]] = None,
+            on_task_start: Optional[Callable[[str], None]] = None,
+            on_task_complete: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
+        """
+        Ejecuta todas las tareas pendientes respetando sus dependencias.
+
+        ``completed_outputs`` permite partir de salidas ya disponibles: esas
+        tareas no se ejecutan y su salida se usa directamente como contexto.
+        """
+        self.execution_levels()  # Valida que el grafo no tenga ciclos
+
+        outputs: Dict[str, str] = dict(completed_outputs or {})
+        timings: Dict[str, Dict[str, Any]] = {}
+        pending = [name for name in self.tasks if name not in outputs]
+        running = {}
+        run_start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            while pending or running:
+                ready = [name for name in pending
+                         if all(dep in outputs for dep in self.dependencies[name])]
+
+                for name in ready[:self.max_concurrency - len(running)]:
+                    pending.remove(name)
+                    context = self.build_context(name, outputs)
+                    if on_task_start:
+                        on_task_start(name)
+                    logger.info(f"Iniciando tarea '{name}' ({len(running) + 1} en ejecución)")
+                    running[pool.submit(self._execute_task, name, context)] = name
+
+                if not running:
+                    raise ValueError(f"No hay tareas ejecutables, dependencias sin resolver: {pending}")
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        raw, started, ended = future.result()
+                    except Exception:
+                        for other in running:
+                            other.cancel()
+                        raise
+
+                    outputs[name] = raw
+                    timings[name] = {
+                        "start_offset_seconds": round(started - run_start, 3),
+                        "duration_seconds": round(ended - started, 3),
+                        "dependencies": self.dependencies[name]
+                    }
+                    logger.info(f"Tarea '{name}' completada en {timings[name]['duration_seconds']}s")
+                    if on_task_complete:
+                        on_task_complete(name, raw)
+
+        return {
+            "outputs": outputs,
+            "task_timings": timings,
+            "wall_clock_seconds": round(time.perf_counter() - run_start, 3),
+            "context_stats": dict(self.context_stats),
+            "skipped_tasks": [name for name in (completed_outputs or {}) if name in self.tasks]
+        }
+
+    def _execute_task(self, name: str, context: Optional[str]):
+        """Ejecuta una tarea individual y devuelve su salida en texto"""
+        task = self.tasks[name]
+        tracker = self.metrics.track_task(name, task) if self.metrics else nullcontext()
+        with tracker:
+            started = time.perf_counter()
+            task_output = task.execute_sync(agent=task.agent, context=context)
+            ended = time.perf_counter()
+
+        raw = getattr(task_output, 'raw', task_output)
+        return str(raw) if raw is not None else "", started, ended
@@ -1,8 +1,13 @@
 import json
 import os
 import logging
-from typing import Dict, Any
-from crew.content_crew import ContentMarketingCrew
+from typing import Dict, List, Any
+
+# Solo módulos ligeros a nivel de módulo: el stack de agentes (crewai, langchain,
+# herramientas) se importa bajo demanda al generar un artículo
+from crew.crew_pool import get_crew_pool
+from crew.crew_status import describe_crew_status
+from crew.job_runner import get_job_runner
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -13,8 +18,13 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Función principal de Lambda para el sistema de agentes de content marketing
     
     Parámetros esperados en el event:
-    - action: 'generate_article', 'get_status', 'health_check'
+    - action: 'generate_article', 'generate_batch', 'resume_run', 'get_status', 'health_check'
     - topic: (opcional) tema específico para el artículo
+    - topics: (requerido para 'generate_batch') lista de tópicos
+    - run_id: (opcional) id del run; requerido para 'resume_run'
+    - job_id: (opcional) id del job a consultar con 'get_status'
+    - wait: (opcional, por defecto true) false para encolar un job en lugar de generar de forma síncrona
+    - use_cache: (opcional) false para no servir respuestas del LLM desde la caché
     - config: (opcional) configuraciones adicionales
     """
     
@@ -45,6 +55,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         topic = body.get('topic', event.get('topic'))
         crew_type = body.get('crew_type', event.get('crew_type', 'basic'))  # Nuevo parámetro
         format_type = body.get('format_type', event.get('format_type', 'blog'))  # Nuevo parámetro
+        run_id = body.get('run_id', event.get('run_id'))
+        job_id = body.get('job_id', event.get('job_id'))
+        topics = body.get('topics', event.get('topics'))
+        # Síncrono por defecto: los jobs necesitan un store compartido y JOB_DISPATCH=lambda en Lambda
+        wait = body.get('wait', event.get('wait', True))
+        use_cache = body.get('use_cache', event.get('use_cache', True))
         
         logger.info(f"Ejecutando acción: {action}, crew_type: {crew_type}, format: {format_type}")
         
@@ -55,29 +71,40 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if missing_vars:
             logger.warning(f"Variables de entorno faltantes: {missing_vars}")
         
-        # Inicializar el crew según el tipo solicitado
-        if crew_type == "basic":
-            from crew.basic_content_crew import BasicContentMarketingCrew
-            crew = BasicContentMarketingCrew()
-        else:
-            from crew.content_crew import ContentMarketingCrew
-            crew = ContentMarketingCrew()
-        
-        # Manejar diferentes acciones
+        # Acciones ligeras: se sirven sin importar ni construir el crew
         if action == 'health_check':
-            response = handle_health_check(crew)
+            response = handle_health_check(crew_type)
             
         elif action == 'get_status':
-            response = handle_get_status(crew)
+            response = handle_get_status(crew_type, job_id)
+            
+        elif action in ('generate_article', 'resume_run') and not wait:
+            response = handle_enqueue_job(topic, crew_type, format_type, run_id,
+                                          resume=(action == 'resume_run'), use_cache=use_cache)
             
-        elif action == 'generate_article':
-            response = handle_generate_article(crew, topic, crew_type, format_type)
+        elif action == 'generate_batch':
+            response = handle_generate_batch(topics, wait=wait)
+            
+        elif action == 'run_job':
+            # Invocación asíncrona interna (JOB_DISPATCH=lambda)
+            result = get_job_runner().run_job(job_id)
+            response = {'success': bool(result and result.get('success')), 'job_id': job_id}
+            
+        elif action in ('generate_article', 'resume_run'):
+            # Obtener un crew del pool del contenedor (se reutiliza entre invocaciones en caliente)
+            with get_crew_pool().acquire(crew_type) as crew:
+                if action == 'generate_article':
+                    response = handle_generate_article(crew, topic, crew_type, format_type, run_id=run_id,
+                                                       use_cache=use_cache)
+                else:
+                    response = handle_resume_run(crew, topic, crew_type, format_type, run_id,
+                                                 use_cache=use_cache)
             
         else:
             response = {
                 'success': False,
                 'error': f'Acción no reconocida: {action}',
-                'available_actions': ['health_check', 'get_status', 'generate_article']
+                'available_actions': ['health_check', 'get_status', 'generate_article', 'generate_batch', 'resume_run']
             }
         
         status_code = 200 if response.get('success', False) else 400
@@ -104,10 +131,15 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             'body': json.dumps(error_response, ensure_ascii=False)
         }
 
-def handle_health_check(crew: ContentMarketingCrew) -> Dict[str, Any]:
+def _light_crew_status(crew_type: str = "academic") -> Dict[str, Any]:
+    """Estado del crew sin construirlo: 'initialized' solo si ya hay uno en el pool"""
+    warm = get_crew_pool().is_warm("basic" if crew_type == "basic" else "academic")
+    return describe_crew_status(agents_state="initialized" if warm else "not_initialized")
+
+def handle_health_check(crew_type: str = "academic") -> Dict[str, Any]:
     """Maneja el health check del sistema"""
     try:
-        status = crew.get_crew_status()
+        status = _light_crew_status(crew_type)
         
         return {
             'success': True,
@@ -118,7 +150,8 @@ def handle_health_check(crew: ContentMarketingCrew) -> Dict[str, Any]:
                 'openai_configured': bool(os.getenv('OPENAI_API_KEY')),
                 'serper_configured': bool(os.getenv('SERPER_API_KEY')),
                 'lambda_region': os.getenv('AWS_REGION', 'unknown')
-            }
+            },
+            'crew_pool': get_crew_pool().get_stats()
         }
     except Exception as e:
         return {
@@ -126,10 +159,13 @@ def handle_health_check(crew: ContentMarketingCrew) -> Dict[str, Any]:
             'error': f'Error en health check: {str(e)}'
         }
 
-def handle_get_status(crew: ContentMarketingCrew) -> Dict[str, Any]:
-    """Obtiene el estado detallado del crew"""
+def handle_get_status(crew_type: str = "academic", job_id: str = None) -> Dict[str, Any]:
+    """Obtiene el estado detallado del crew (o el progreso de un job si se indica job_id)"""
+    if job_id:
+        return handle_get_job_status(job_id)
+    
     try:
-        status = crew.get_crew_status()
+        status = _light_crew_status(crew_type)
         
         return {
             'success': True,
@@ -137,7 +173,7 @@ def handle_get_status(crew: ContentMarketingCrew) -> Dict[str, Any]:
             'configuration': {
                 'agents_count': 8,
                 'tasks_count': 8,
-                'process_type': 'sequential_specialized',
+                'process_type': status.get('workflow', {}).get('type', 'sequential_specialized'),
                 'specialization': 'academic_quality_article',
                 'tools_available': ['web_search', 'content_analyzer'],
                 'sections': [
@@ -152,7 +188,119 @@ def handle_get_status(crew: ContentMarketingCrew) -> Dict[str, Any]:
             'error': f'Error obteniendo status: {str(e)}'
         }
 
-def handle_generate_article(crew, topic: str = None, crew_type: str = "basic", format_type: str = "blog") -> Dict[str, Any]:
+def handle_get_job_status(job_id: str) -> Dict[str, Any]:
+    """Obtiene el estado en vivo de un job de generación"""
+    try:
+        job = get_job_runner().get_job(job_id)
+        if job is None:
+            return {
+                'success': False,
+                'error': f'Job no encontrado: {job_id}'
+            }
+        
+        task_states = {name: task['status'] for name, task in job['tasks'].items()}
+        
+        return {
+            'success': True,
+            'job': job,
+            'crew_status': describe_crew_status(task_states=task_states)
+        }
+    except Exception as e:
+        return {
+            'success': False,
+            'error': f'Error obteniendo status del job: {str(e)}'
+        }
+
+def handle_enqueue_job(topic: str = None, crew_type: str = "basic", format_type: str = "blog",
+                       run_id: str = None, resume: bool = False, use_cache: bool = True) -> Dict[str, Any]:
+    """Encola la generación de un artículo y devuelve el job id inmediatamente"""
+    if resume and not run_id:
+        return {
+            'success': False,
+            'error': "El parámetro 'run_id' es requerido para 'resume_run'"
+        }
+    
+    if resume and crew_type == "basic":
+        return {
+            'success': False,
+            'error': "'resume_run' solo está disponible para el crew académico",
+            'crew_type': crew_type
+        }
+    
+    job_id = get_job_runner().submit({
+        'topic': topic,
+        'crew_type': crew_type,
+        'format_type': format_type,
+        'run_id': run_id,
+        'resume': resume,
+        'use_cache': use_cache
+    })
+    
+    return {
+        'success': True,
+        'message': 'Generación encolada',
+        'timestamp': context_timestamp(),
+        'job_id': job_id,
+        'status_request': {'action': 'get_status', 'job_id': job_id}
+    }
+
+def handle_generate_batch(topics: List[str] = None, wait: bool = True) -> Dict[str, Any]:
+    """Genera artículos para varios tópicos compartiendo investigación por cluster"""
+    if not topics or not isinstance(topics, list):
+        return {
+            'success': False,
+            'error': "El parámetro 'topics' (lista de tópicos) es requerido para 'generate_batch'"
+        }
+    
+    if not wait:
+        job_id = get_job_runner().submit({'crew_type': 'academic', 'topics': topics})
+        return {
+            'success': True,
+            'message': f'Batch de {len(topics)} tópicos encolado',
+            'timestamp': context_timestamp(),
+            'job_id': job_id,
+            'status_request': {'action': 'get_status', 'job_id': job_id}
+        }
+    
+    try:
+        from crew.batch_crew import BatchArticleGenerator
+        
+        result = BatchArticleGenerator().run(topics)
+        return {
+            'success': result.get('success', False),
+            'timestamp': context_timestamp(),
+            'result': result
+        }
+    except Exception as e:
+        logger.error(f"Excepción en handle_generate_batch: {str(e)}", exc_info=True)
+        
+        return {
+            'success': False,
+            'error': f'Error ejecutando batch: {str(e)}',
+            'type': type(e).__name__
+        }
+
+def handle_resume_run(crew, topic: str = None, crew_type: str = "basic", format_type: str = "blog",
+                      run_id: str = None, use_cache: bool = True) -> Dict[str, Any]:
+    """Reanuda un run interrumpido reutilizando las salidas guardadas como checkpoint"""
+    if not run_id:
+        return {
+            'success': False,
+            'error': "El parámetro 'run_id' es requerido para 'resume_run'"
+        }
+    
+    if crew_type == "basic":
+        return {
+            'success': False,
+            'error': "'resume_run' solo está disponible para el crew académico",
+            'crew_type': crew_type
+        }
+    
+    return handle_generate_article(crew, topic, crew_type, format_type, run_id=run_id, resume=True,
+                                   use_cache=use_cache)
+
+def handle_generate_article(crew, topic: str = None, crew_type: str = "basic", format_type: str = "blog",
+                            run_id: str = None, resume: bool = False, use_cache: bool = True) -> Dict[str, Any]:
     """Genera un artículo usando el crew de agentes"""
     try:
         logger.info(f"Iniciando generación de artículo. Tópico: {topic or 'general'}, Crew: {crew_type}, Formato: {format_type}")
@@ -161,7 +309,7 @@ def handle_generate_article(crew, topic: str = None, crew_type: str = "basic", f
         if crew_type == "basic":
             result = crew.run_crew(topic=topic, format_type=format_type)
         else:
-            result = crew.run_crew(topic=topic)
+            result = crew.run_crew(topic=topic, run_id=run_id, resume=resume, use_cache=use_cache)
         
         if result['success']:
             logger.info(f"Artículo generado exitosamente con crew {crew_type}")
@@ -175,13 +323,14 @@ def handle_generate_article(crew, topic: str = None, crew_type: str = "basic", f
                 'topic': topic or 'Tendencias generales en content marketing',
                 'crew_type': crew_type,
                 'format_type': format_type,
+                'run_id': result.get('run_id'),
                 'result': result,
                 'metadata': {
                     'agents_used': result.get('metadata', {}).get('agents_count', 3),
                     'workflow_type': crew_type,
                     'article_type': article_type,
                     'estimated_length': result.get('metadata', {}).get('output_length', 'Variable'),
-                    'execution_time': result.get('metadata', {}).get('estimated_time', 'Variable')
+                    'execution_time': result.get('metadata', {}).get('wall_clock_seconds', 'Variable')
                 }
             }
         else:
@@ -192,6 +341,7 @@ def handle_generate_article(crew, topic: str = None, crew_type: str = "basic", f
                 'error': 'Error generando artículo',
                 'details': result.get('error'),
                 'crew_type': crew_type,
+                'run_id': result.get('run_id'),
                 'debug_info': result
             }
             
@@ -215,7 +365,8 @@ if __name__ == "__main__":
     # Test event
     test_event = {
         'action': 'generate_article',
-        'topic': 'AI en content marketing'
+        'topic': 'AI en content marketing',
+        'wait': True
     }
     
     result = lambda_handler(test_event, None)
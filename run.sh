@@ -0,0 +1,3 @@
+#!/bin/bash
+# Arranque de la función de streaming detrás de Lambda Web Adapter
+exec python3 stream_server.py --port "${PORT:-8080}"
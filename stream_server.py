@@ -0,0 +1,130 @@
+import os
+import json
+import logging
+import argparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from typing import Dict, Any
+
+from lambda_function import lambda_handler, handle_health_check
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TRUE_VALUES = ('1', 'true', 'yes')
+
+
+class StreamRequestHandler(BaseHTTPRequestHandler):
+    """
+    Servidor HTTP con streaming de secciones (Server-Sent Events).
+
+    - ``GET/POST /stream``: genera un artículo académico y emite cada sección
+      en cuanto termina su tarea, y al final el artículo formateado.
+    - ``GET /health``: health check (también lo usa Lambda Web Adapter).
+    - Cualquier otro ``POST``: se delega en ``lambda_handler`` con el body JSON,
+      igual que a través de API Gateway.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self._send_cors_headers()
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/health':
+            response = handle_health_check("academic")
+            self._send_json(200 if response.get('success') else 500, response)
+        elif url.path == '/stream':
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            self._stream(params)
+        else:
+            self._send_json(404, {'success': False, 'error': f'Ruta no encontrada: {url.path}'})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw_body = self.rfile.read(length).decode('utf-8') if length else '{}'
+
+        if urlparse(self.path).path == '/stream':
+            try:
+                params = json.loads(raw_body)
+            except json.JSONDecodeError:
+                self._send_json(400, {'success': False, 'error': 'El body debe ser JSON'})
+                return
+            self._stream(params)
+            return
+
+        result = lambda_handler({'httpMethod': 'POST', 'body': raw_body}, None)
+        self.send_response(result['statusCode'])
+        for name, value in result['headers'].items():
+            self.send_header(name, value)
+        body = result['body'].encode('utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, params: Dict[str, Any]) -> None:
+        """Emite los eventos del run como text/event-stream a medida que se producen"""
+        from crew.section_stream import stream_article, format_sse
+
+        resume = str(params.get('resume', '')).lower() in TRUE_VALUES
+        use_cache = str(params.get('use_cache', 'true')).lower() in TRUE_VALUES
+        if resume and not params.get('run_id'):
+            self._send_json(400, {'success': False, 'error': "El parámetro 'run_id' es requerido para reanudar"})
+            return
+
+        self.send_response(200)
+        self._send_cors_headers()
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        try:
+            for event in stream_article(topic=params.get('topic'),
+                                        format_type=params.get('format_type', 'academic'),
+                                        run_id=params.get('run_id'), resume=resume,
+                                        use_cache=use_cache):
+                self.wfile.write(format_sse(event))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # El run sigue (y guarda checkpoints) con su crew: el cliente puede reanudar con su run_id
+            logger.warning("Cliente desconectado durante el stream")
+
+    def _send_cors_headers(self) -> None:
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Methods', 'OPTIONS,POST,GET')
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False, indent=2).encode('utf-8')
+        self.send_response(status)
+        self._send_cors_headers()
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de desarrollo con streaming de secciones (SSE)")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8080")))
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), StreamRequestHandler)
+    logger.info(f"Servidor de streaming escuchando en http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+import unittest
+from tools.bm25_index import BM25Index
+
+
+class BM25UpdateTest(unittest.TestCase):
+    """Las postings de documentos reemplazados y aún no fusionados no cuentan para el df"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.corpus = os.path.join(self.directory, "corpus")
+        os.makedirs(self.corpus)
+        self.index = BM25Index(os.path.join(self.directory, "index"))
+
+    def tearDown(self):
+        self.index.close()
+        shutil.rmtree(self.directory)
+
+    def _write_corpus(self, suffix: str) -> None:
+        for i in range(6):
+            path = os.path.join(self.corpus, f"doc{i}.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"# Doc{i}\n" + "video " * (i + 1) + "marketing contenido " * 3 + suffix)
+            # Fuerza una mtime distinta para que update detecte el cambio
+            os.utime(path, (1_000_000 + len(suffix), 1_000_000 + len(suffix)))
+
+    def _ranking(self):
+        return [(round(score, 6), doc["title"]) for score, doc in self.index.search("video")]
+
+    def test_update_keeps_scores_and_ranking(self):
+        self._write_corpus("")
+        self.index.update(self.corpus)
+        fresh = self._ranking()
+
+        self._write_corpus("revisado")
+        self.assertEqual(self.index.update(self.corpus)["updated"], 6)
+        self.assertGreater(self.index.get_stats()["deleted_pending_merge"], 0)
+
+        updated = self._ranking()
+        self.assertEqual([title for _, title in updated], [title for _, title in fresh])
+        self.assertEqual(updated[0][1], "Doc5")
+        self.assertTrue(all(score > 0 for score, _ in updated))
+
+
+if __name__ == "__main__":
+    unittest.main()
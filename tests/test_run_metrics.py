@@ -0,0 +1,50 @@
+import threading
+import unittest
+from config.llm_usage import record_llm_usage
+from crew.run_metrics import RunMetrics
+
+
+class _Task:
+    agent = None
+    tools_errors = 0
+
+
+class TaskTokenAttributionTest(unittest.TestCase):
+    """El consumo del LLM se atribuye a la tarea cuyo hilo hizo la llamada"""
+
+    def test_concurrent_tasks_do_not_mix_usage(self):
+        metrics = RunMetrics("run-1")
+        barrier = threading.Barrier(2)
+        calls = {"research": (100, 10), "analysis": (7, 3)}
+
+        def run_task(name: str) -> None:
+            prompt_tokens, completion_tokens = calls[name]
+            with metrics.track_task(name, _Task()):
+                for _ in range(5):
+                    # Las dos tareas alternan sus llamadas al LLM
+                    barrier.wait(timeout=5)
+                    record_llm_usage(prompt_tokens, completion_tokens)
+
+        threads = [threading.Thread(target=run_task, args=(name,)) for name in calls]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        tasks = metrics.summary()["tasks"]
+        self.assertEqual((tasks["research"]["prompt_tokens"], tasks["research"]["completion_tokens"]), (500, 50))
+        self.assertEqual((tasks["analysis"]["prompt_tokens"], tasks["analysis"]["completion_tokens"]), (35, 15))
+        self.assertEqual(tasks["research"]["llm_round_trips"], 5)
+        self.assertEqual(metrics.token_usage(), {"prompt_tokens": 535, "completion_tokens": 65,
+                                                 "total_tokens": 600, "successful_requests": 10})
+
+    def test_usage_outside_a_task_is_not_recorded(self):
+        metrics = RunMetrics("run-2")
+        with metrics.track_task("research", _Task()):
+            pass
+        record_llm_usage(50, 5)
+        self.assertEqual(metrics.token_usage()["total_tokens"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import time
+import threading
+import unittest
+import crew.crew_pool as crew_pool
+from crew.crew_pool import CrewPool
+from crew.section_stream import stream_article
+
+
+class _BlockingCrew:
+    """Crew falso cuyo run emite la primera sección y espera hasta que el test lo libera"""
+
+    def __init__(self):
+        self.finish = threading.Event()
+        self.finished = threading.Event()
+
+    def run_crew(self, topic=None, run_id=None, resume=False, on_task_complete=None, use_cache=True):
+        on_task_complete("research", "investigación")
+        self.finish.wait(timeout=10)
+        self.finished.set()
+        return {"success": True, "run_id": run_id, "outputs": {"research": "investigación"}}
+
+
+class StreamCrewCheckoutTest(unittest.TestCase):
+    """El crew de un stream vuelve al pool solo cuando su run termina"""
+
+    def setUp(self):
+        self.crew = _BlockingCrew()
+        self.pool = CrewPool(factory=lambda crew_type: self.crew)
+        self._previous_pool = crew_pool._crew_pool
+        crew_pool._crew_pool = self.pool
+
+    def tearDown(self):
+        self.crew.finish.set()
+        crew_pool._crew_pool = self._previous_pool
+
+    def test_crew_stays_checked_out_after_client_disconnects(self):
+        events = stream_article(topic="tema", run_id="run-1")
+        self.assertEqual(next(events)["event"], "start")
+        self.assertEqual(next(events)["event"], "section")
+        # El cliente se desconecta: el servidor deja de iterar el generador
+        events.close()
+
+        self.assertFalse(self.pool.is_warm("academic"))
+
+        self.crew.finish.set()
+        self.assertTrue(self.crew.finished.wait(timeout=5))
+        for _ in range(100):
+            if self.pool.is_warm("academic"):
+                break
+            time.sleep(0.05)
+        self.assertTrue(self.pool.is_warm("academic"))
+
+
+if __name__ == "__main__":
+    unittest.main()
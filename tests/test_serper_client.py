@@ -0,0 +1,82 @@
+import asyncio
+import unittest
+from aiohttp import web
+from config.settings import AcademicConfig
+from config.rate_limiter import AdaptiveRateLimiter
+import config.rate_limiter as rate_limiter
+from tools.serper_client import SerperClient
+
+
+class SerperLimiterAccountingTest(unittest.TestCase):
+    """Cada petición a Serper libera exactamente un hueco del limitador, falle como falle"""
+
+    def setUp(self):
+        self.limiter = AdaptiveRateLimiter("serper", rate_per_second=1000, burst=1000, max_concurrency=8)
+        self._previous_limiters = dict(rate_limiter._limiters)
+        rate_limiter._limiters["serper"] = self.limiter
+        self._previous_settings = dict(AcademicConfig.RATE_LIMITS)
+        AcademicConfig.RATE_LIMITS.update(max_retries=1, backoff_base_seconds=0.0)
+
+        self.client = SerperClient("", timeout_seconds=5)
+        self.runner = self.client.run(self._start_server())
+        port = self.runner.addresses[0][1]
+        self.client.endpoint = f"http://127.0.0.1:{port}/search"
+
+    def tearDown(self):
+        self.client.run(self.runner.cleanup())
+        self.client.close()
+        rate_limiter._limiters.clear()
+        rate_limiter._limiters.update(self._previous_limiters)
+        AcademicConfig.RATE_LIMITS.clear()
+        AcademicConfig.RATE_LIMITS.update(self._previous_settings)
+
+    async def _start_server(self) -> web.AppRunner:
+        async def not_json(request):
+            return web.Response(text="<html>no es JSON</html>", content_type="text/html")
+
+        async def slow(request):
+            await asyncio.sleep(0.5)
+            return web.json_response({})
+
+        async def ok(request):
+            return web.json_response({"organic": []})
+
+        app = web.Application()
+        app.router.add_post("/search", not_json)
+        app.router.add_post("/slow", slow)
+        app.router.add_post("/ok", ok)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        return runner
+
+    def test_non_json_body_releases_slot_and_is_reported(self):
+        # Más búsquedas que huecos de concurrencia: antes la novena se quedaba esperando para siempre
+        payloads = [{"q": f"consulta {i}"} for i in range(12)]
+        future = asyncio.run_coroutine_threadsafe(self.client._post_many(payloads, "key"), self.client._ensure_loop())
+        results = [result for result, _ in future.result(timeout=10)]
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        stats = self.limiter.get_stats()
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertEqual(stats["requests"], 24)  # cada búsqueda se reintenta una vez
+
+    def test_cancelled_request_releases_slot(self):
+        self.client.endpoint = self.client.endpoint.replace("/search", "/slow")
+
+        async def cancelled_post():
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(self.client._post({"q": "lenta"}, "key"), 0.1)
+            # El servidor termina su respuesta antes de apagarlo en tearDown
+            await asyncio.sleep(0.6)
+
+        self.client.run(cancelled_post())
+        self.assertEqual(self.limiter.get_stats()["in_flight"], 0)
+
+    def test_success_releases_slot(self):
+        self.client.endpoint = self.client.endpoint.replace("/search", "/ok")
+        self.assertEqual(self.client.search({"q": "ok"}, "key"), {"organic": []})
+        self.assertEqual(self.limiter.get_stats()["in_flight"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
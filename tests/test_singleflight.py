@@ -0,0 +1,46 @@
+import threading
+import unittest
+from tools.singleflight import coalesce_tool_call
+
+
+def _make_tool(module: str):
+    """Herramienta con el mismo nombre de clase en cada módulo; cuenta sus ejecuciones reales"""
+    class ContentAnalyzerTool:
+        def __init__(self, barrier: threading.Barrier):
+            self.barrier = barrier
+            self.runs = 0
+
+        @coalesce_tool_call()
+        def _run(self, content: str) -> str:
+            self.runs += 1
+            # Ambas llamadas quedan en vuelo a la vez antes de terminar
+            self.barrier.wait(timeout=5)
+            return f"{module}:{content}"
+
+    ContentAnalyzerTool.__module__ = module
+    return ContentAnalyzerTool
+
+
+class CoalesceKeyTest(unittest.TestCase):
+    """Herramientas distintas con el mismo nombre de clase no comparten ejecución"""
+
+    def test_same_class_name_in_different_modules_is_not_coalesced(self):
+        barrier = threading.Barrier(2)
+        first = _make_tool("tools.content_analyzer")(barrier)
+        second = _make_tool("tools.web_search_tool")(barrier)
+        results = {}
+
+        threads = [threading.Thread(target=lambda tool=tool: results.__setitem__(tool, tool._run("texto")))
+                   for tool in (first, second)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        self.assertEqual((first.runs, second.runs), (1, 1))
+        self.assertEqual(results[first], "tools.content_analyzer:texto")
+        self.assertEqual(results[second], "tools.web_search_tool:texto")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import random
+import unittest
+from tools.document_model import ParsedDocument
+from tools.streaming_analyzer import StreamingAnalyzer, stream_document
+
+# Métricas que ContentAnalyzerTool lee del documento
+METRICS = ("character_count", "space_count", "paragraph_count", "intro_word_count", "word_count",
+           "sentence_count", "syllable_count", "clean_word_counts", "headers", "bullet_points",
+           "numbered_items", "link_count", "email_count", "bold_count", "italic_count",
+           "mentions_conclusion", "seo_term_counts", "gap_terms_found")
+
+PIECES = ["\n", "\n\n", " ", "#", "## ", "-", "- ", "*", "1.", "2. ", "•", "texto", "marketing", "seo",
+          "conclusión", "ejemplo", "http://e.com/x", "a@b.co", ".", "!", "**b**", "palabra larga aquí"]
+
+
+def _chunks(text: str, rng: random.Random, max_length: int):
+    position = 0
+    while position < len(text):
+        length = rng.randint(1, max_length)
+        yield text[position:position + length]
+        position += length
+
+
+class StreamingParityTest(unittest.TestCase):
+    """Con buffers pequeños las métricas siguen siendo las del análisis del texto completo"""
+
+    def assert_same_metrics(self, text: str, streamed) -> None:
+        expected = ParsedDocument(text)
+        for name in METRICS:
+            self.assertEqual(getattr(streamed, name), getattr(expected, name), (name, text))
+
+    def test_small_buffers_match_full_text(self):
+        rng = random.Random(7)
+        for _ in range(200):
+            text = "".join(rng.choice(PIECES) for _ in range(rng.randint(50, 300)))
+            for max_buffer_chars in (60, 120):
+                streamed = stream_document(_chunks(text, rng, 40), max_buffer_chars)
+                self.assert_same_metrics(text, streamed)
+
+    def test_long_block_ending_in_marker_is_exact_and_bounded(self):
+        text = ("Un párrafo largo con muchas palabras. " * 20 + "\n#\n\n# Título\n\n- \n\n- item\n\n1.\n\nfin") * 5
+        analyzer = StreamingAnalyzer(100)
+        for chunk in _chunks(text, random.Random(3), 30):
+            analyzer.feed(chunk)
+            self.assertLessEqual(len(analyzer._carry), 100 + 2)
+        self.assert_same_metrics(text, analyzer.close())
+
+
+if __name__ == "__main__":
+    unittest.main()
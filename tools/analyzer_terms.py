@@ -0,0 +1,104 @@
+import json
+import threading
+from typing import Dict, List, Any, Optional
+from config.settings import AcademicConfig
+from tools.keyword_matcher import KeywordMatcher
+
+DEFAULT_TERMS: Dict[str, Any] = {
+    # Palabras de marketing que se buscan entre las keywords del contenido
+    "marketing_keywords": [
+        'content', 'marketing', 'digital', 'social', 'media', 'seo', 'strategy', 'brand', 'engagement',
+        'analytics', 'roi', 'conversion', 'automation', 'personalization', 'ai', 'artificial', 'intelligence',
+        'video', 'blog', 'email', 'influencer', 'campaign', 'audience', 'target', 'customer', 'user',
+        'experience', 'data', 'insights', 'trends', 'innovation', 'growth', 'optimization', 'performance',
+        'metrics', 'kpi'
+    ],
+    # Términos cuya densidad mide el análisis SEO
+    "seo_terms": ['marketing', 'content', 'digital', 'strategy', 'seo'],
+    # Un gap se señala cuando no aparece ninguno de sus términos ("links": sin enlaces externos)
+    "gap_rules": [
+        {"gap": "Falta ejemplos o casos de estudio", "terms": ["ejemplo", "case study"]},
+        {"gap": "Falta datos estadísticos o métricas", "terms": ["estadística", "%", "datos"]},
+        {"gap": "Falta enlaces externos o referencias", "links": True},
+        {"gap": "Falta perspectiva futura o tendencias", "terms": ["futuro", "tendencia"]},
+        {"gap": "Falta recomendaciones accionables", "terms": ["recomendación", "acción"]}
+    ],
+    # Tendencias que reconoce el analizador rápido de WebSearchTool
+    "trend_keywords": [
+        'AI', 'artificial intelligence', 'automation', 'personalization',
+        'video marketing', 'social media', 'SEO', 'content strategy',
+        'engagement', 'conversion', 'ROI', 'analytics', 'influencer',
+        'user-generated content', 'interactive content', 'storytelling'
+    ]
+}
+
+
+# Stop words básicas (español e inglés) que no cuentan como keywords
+STOP_WORDS = frozenset({
+    'el', 'la', 'de', 'que', 'y', 'a', 'en', 'un', 'es', 'se', 'no', 'te', 'lo', 'le', 'da', 'su', 'por', 'son', 'con', 'para', 'al', 'del', 'los', 'las', 'una', 'como', 'pero', 'sus', 'han', 'muy', 'está', 'son', 'todo', 'esta', 'más', 'tiene', 'si', 'ya', 'puede', 'bien', 'hacer', 'sobre', 'ser', 'era', 'vez', 'solo', 'desde', 'cada', 'hasta', 'también', 'otros', 'donde', 'cuando', 'mismo', 'tanto', 'algo', 'qué', 'porque', 'así', 'cómo', 'tanto',
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'should', 'could', 'can', 'may', 'might', 'must', 'this', 'that', 'these', 'those', 'it', 'its', 'they', 'them', 'their', 'we', 'us', 'our', 'you', 'your', 'i', 'me', 'my', 'he', 'him', 'his', 'she', 'her', 'hers'
+})
+
+# Longitud mínima de una palabra para contar como keyword
+MIN_KEYWORD_LENGTH = 3
+
+
+class AnalyzerTerms:
+    """
+    Listas de términos del analizador con sus matchers ya construidos.
+
+    Se crean una vez (al importar o al reconfigurar) y las llamadas del
+    analizador solo recorren el texto.
+    """
+
+    def __init__(self, marketing_keywords: List[str], seo_terms: List[str], gap_rules: List[Dict[str, Any]],
+                 trend_keywords: List[str]):
+        self.marketing_keywords = [term.lower() for term in marketing_keywords]
+        self.seo_terms = [term.lower() for term in seo_terms]
+        self.gap_rules = [{**rule, "terms": [term.lower() for term in rule.get("terms", [])]} for rule in gap_rules]
+        self.trend_keywords = list(trend_keywords)
+
+        self.seo_matcher = KeywordMatcher(self.seo_terms)
+        self.gap_matcher = KeywordMatcher(term for rule in self.gap_rules for term in rule["terms"])
+        self.trend_matcher = KeywordMatcher(self.trend_keywords)
+
+    @classmethod
+    def from_dict(cls, overrides: Optional[Dict[str, Any]] = None) -> "AnalyzerTerms":
+        """Términos por defecto sustituyendo las listas presentes en ``overrides``"""
+        terms = {**DEFAULT_TERMS, **(overrides or {})}
+        return cls(terms["marketing_keywords"], terms["seo_terms"], terms["gap_rules"], terms["trend_keywords"])
+
+
+_analyzer_terms: Optional[AnalyzerTerms] = None
+_analyzer_terms_lock = threading.Lock()
+
+
+def _load_configured_terms() -> AnalyzerTerms:
+    path = AcademicConfig.CONTENT_ANALYSIS["terms_path"]
+    if not path:
+        return AnalyzerTerms.from_dict()
+    with open(path, encoding="utf-8") as f:
+        return AnalyzerTerms.from_dict(json.load(f))
+
+
+def get_analyzer_terms() -> AnalyzerTerms:
+    """Términos del analizador del proceso (por defecto o del JSON de ANALYZER_TERMS_PATH)"""
+    global _analyzer_terms
+    if _analyzer_terms is None:
+        with _analyzer_terms_lock:
+            if _analyzer_terms is None:
+                _analyzer_terms = _load_configured_terms()
+    return _analyzer_terms
+
+
+def set_analyzer_terms(**overrides) -> AnalyzerTerms:
+    """Sustituye listas de términos (p. ej. ``seo_terms=[...]``) y reconstruye los matchers una vez"""
+    global _analyzer_terms
+    terms = AnalyzerTerms.from_dict(overrides)
+    with _analyzer_terms_lock:
+        _analyzer_terms = terms
+    return terms
+
+
+# Se construyen al importar el módulo para que ninguna llamada pague la construcción
+get_analyzer_terms()
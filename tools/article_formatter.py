@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional
 from crewai_tools import BaseTool
 from pydantic import BaseModel, Field
+from tools.tool_metrics import track_tool_call
 
 class ArticleFormatterInput(BaseModel):
     """Input para el formateador de artículos"""
@@ -26,6 +27,7 @@ class ArticleFormatterTool(BaseTool):
     def __init__(self):
         super().__init__()
         
+    @track_tool_call
     def _run(self, sections: Dict[str, str], title: str, author: str = "CrewAI Research Team", 
              format_type: str = "academic", include_toc: bool = True, include_metadata: bool = True) -> str:
         """Formatea el artículo completo"""
@@ -444,6 +446,7 @@ class DocumentExporter(BaseTool):
     Soporta Markdown, HTML, y otros formatos de documentos.
     """
     
+    @track_tool_call
     def _run(self, content: str, format_type: str = "markdown", filename: str = "article") -> str:
         """Exporta el documento al formato especificado"""
         try:
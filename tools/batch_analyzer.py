@@ -0,0 +1,229 @@
+from collections import Counter
+from typing import Dict, List, Any, Optional, Sequence
+import numpy as np
+from tools.analyzer_terms import get_analyzer_terms, STOP_WORDS, MIN_KEYWORD_LENGTH
+from tools.document_model import ParsedDocument, count_syllables
+
+# Umbrales Flesch (inclusivos) y nivel de lectura de cada tramo, de menor a mayor
+READING_LEVEL_THRESHOLDS = np.array([30, 50, 60, 70, 80, 90])
+READING_LEVELS = np.array(["Muy difícil", "Difícil", "Bastante difícil", "Estándar", "Bastante fácil", "Fácil",
+                           "Muy fácil"], dtype=object)
+
+
+class DocumentTermMatrix:
+    """
+    Matriz dispersa documento-término en formato CSR construida con arrays de NumPy.
+
+    ``indptr``, ``indices`` y ``data`` siguen la misma convención que
+    ``scipy.sparse.csr_matrix((data, indices, indptr))``: los términos del
+    documento ``i`` son ``indices[indptr[i]:indptr[i + 1]]`` (ordenados) con
+    sus frecuencias en ``data``.
+    """
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, vocabulary: List[str]):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.vocabulary = vocabulary
+        self.term_ids = {term: i for i, term in enumerate(vocabulary)}
+        self.shape = (len(indptr) - 1, len(vocabulary))
+        # Fila de cada elemento no nulo, para reducir por documento con bincount
+        self.rows = np.repeat(np.arange(self.shape[0]), np.diff(indptr))
+
+    @classmethod
+    def from_counts(cls, term_ids: np.ndarray, counts: np.ndarray, row_lengths: np.ndarray,
+                    vocabulary: List[str]) -> "DocumentTermMatrix":
+        """Construye la matriz a partir de los pares (término, frecuencia) de cada documento, concatenados"""
+        indptr = np.concatenate(([0], np.cumsum(row_lengths)))
+        rows = np.repeat(np.arange(len(row_lengths), dtype=np.int64), row_lengths)
+        order = np.argsort(rows * max(len(vocabulary), 1) + term_ids, kind="stable")
+        return cls(indptr, term_ids[order], counts[order], vocabulary)
+
+    def row_sums(self, term_weights: Optional[np.ndarray] = None) -> np.ndarray:
+        """Total de cada documento, opcionalmente ponderando cada término (p. ej. con una máscara 0/1)"""
+        weights = self.data if term_weights is None else self.data * term_weights[self.indices]
+        return np.bincount(self.rows, weights=weights, minlength=self.shape[0])
+
+    def row_nnz(self) -> np.ndarray:
+        """Términos distintos de cada documento"""
+        return np.diff(self.indptr)
+
+    def term_totals(self) -> np.ndarray:
+        """Frecuencia de cada término en todo el corpus"""
+        return np.bincount(self.indices, weights=self.data, minlength=self.shape[1]).astype(np.int64)
+
+    def document_frequency(self) -> np.ndarray:
+        """Número de documentos en los que aparece cada término"""
+        return np.bincount(self.indices, minlength=self.shape[1])
+
+    def column(self, term: str) -> np.ndarray:
+        """Frecuencia de ``term`` en cada documento (ceros si no está en el vocabulario)"""
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            return np.zeros(self.shape[0], dtype=np.int64)
+        mask = self.indices == term_id
+        return np.bincount(self.rows[mask], weights=self.data[mask], minlength=self.shape[0]).astype(np.int64)
+
+
+class BatchAnalysis:
+    """Resultado de ``analyze_batch``: columnas por documento, matriz documento-término y agregados"""
+
+    def __init__(self, columns: Dict[str, np.ndarray], term_matrix: DocumentTermMatrix, keyword_mask: np.ndarray,
+                 marketing_counts: Dict[str, np.ndarray]):
+        self.columns = columns
+        self.term_matrix = term_matrix
+        self.keyword_mask = keyword_mask
+        self.marketing_counts = marketing_counts
+
+    def __len__(self) -> int:
+        return self.term_matrix.shape[0]
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Tabla por documento: una fila (dict) con todas las métricas de cada uno"""
+        names = list(self.columns)
+        values = [self.columns[name].tolist() for name in names]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+    def top_terms(self, limit: int = 20) -> Dict[str, int]:
+        """Keywords más frecuentes del corpus (sin stop words)"""
+        totals = self.term_matrix.term_totals() * self.keyword_mask
+        order = np.argsort(-totals, kind="stable")[:limit]
+        return {self.term_matrix.vocabulary[i]: int(totals[i]) for i in order if totals[i] > 0}
+
+    def aggregates(self, top_terms: int = 20) -> Dict[str, Any]:
+        """Métricas del corpus completo"""
+        columns = self.columns
+        readable = ~np.isnan(columns["flesch_score"])
+        document_frequency = self.term_matrix.document_frequency()
+        top = self.top_terms(top_terms)
+
+        def mean(values: np.ndarray) -> float:
+            return round(float(values.mean()), 2) if values.size else 0.0
+
+        return {
+            "documents": len(self),
+            "total_words": int(columns["word_count"].sum()),
+            "vocabulary_size": self.term_matrix.shape[1],
+            "avg_word_count": mean(columns["word_count"]),
+            "avg_flesch_score": mean(columns["flesch_score"][readable]),
+            "avg_keyword_density": mean(columns["keyword_density"]),
+            "avg_seo_keyword_density": mean(columns["seo_keyword_density"]),
+            "avg_seo_score": mean(columns["seo_score"]),
+            "documents_with_good_structure": int(columns["has_good_structure"].sum()),
+            "reading_levels": {str(level): int(count) for level, count in
+                               zip(*np.unique(columns["reading_level"][readable], return_counts=True))},
+            "top_keywords": top,
+            "top_keywords_document_frequency": {term: int(document_frequency[self.term_matrix.term_ids[term]])
+                                                for term in top},
+            "marketing_keywords_found": {term: int(counts.sum()) for term, counts in self.marketing_counts.items()
+                                         if counts.any()}
+        }
+
+
+def _round(values: np.ndarray, digits: int) -> np.ndarray:
+    """Redondeo de Python (``np.round`` difiere en casos como 1.95) para coincidir con ContentAnalyzerTool"""
+    return np.fromiter((round(value, digits) for value in values.tolist()), dtype=np.float64, count=len(values))
+
+
+def _seo_scores(word_count: np.ndarray, headers: np.ndarray, has_intro: np.ndarray, has_conclusion: np.ndarray,
+                keyword_density: np.ndarray) -> np.ndarray:
+    """Versión vectorizada de ContentAnalyzerTool._calculate_seo_score"""
+    score = np.where((word_count >= 1500) & (word_count <= 3000), 25, np.where(word_count >= 1000, 15, 0))
+    score += np.where(headers >= 3, 20, np.where(headers >= 1, 10, 0))
+    score += 15 * has_intro + 15 * has_conclusion
+    score += np.where((keyword_density >= 1) & (keyword_density <= 3), 25, np.where(keyword_density > 0, 10, 0))
+    return np.minimum(score, 100)
+
+
+def analyze_batch(documents: Sequence[str]) -> BatchAnalysis:
+    """
+    Analiza muchos documentos a la vez con las métricas de ContentAnalyzerTool.
+
+    Cada documento solo se parte en palabras, se cuentan sus palabras con
+    ``Counter`` y se recorre con las regex de estructura (operaciones en C);
+    el vocabulario solo se consulta una vez por palabra distinta de cada
+    documento. Frecuencias, sílabas, legibilidad, densidades y scores se
+    calculan para todo el corpus con arrays de NumPy, y las sílabas se
+    cuentan una vez por palabra distinta del corpus.
+    """
+    terms = get_analyzer_terms()
+    count = len(documents)
+    clean_vocabulary: Dict[str, int] = {}
+    raw_vocabulary: Dict[str, int] = {}
+    clean_ids: List[int] = []
+    clean_freqs: List[int] = []
+    raw_ids: List[int] = []
+    raw_freqs: List[int] = []
+    features = np.zeros((count, 14), dtype=np.int64)
+    seo_mentions = np.zeros(count, dtype=np.int64)
+    has_conclusion = np.zeros(count, dtype=bool)
+
+    for i, content in enumerate(documents):
+        doc = ParsedDocument(content)
+        clean_counts, raw_counts = doc.clean_word_counts, Counter(doc.words)
+        clean_ids.extend([clean_vocabulary.setdefault(word, len(clean_vocabulary)) for word in clean_counts])
+        clean_freqs.extend(clean_counts.values())
+        raw_ids.extend([raw_vocabulary.setdefault(word, len(raw_vocabulary)) for word in raw_counts])
+        raw_freqs.extend(raw_counts.values())
+        features[i] = (doc.word_count, len(doc.clean_words), len(clean_counts), len(raw_counts), doc.sentence_count,
+                       doc.paragraph_count, doc.character_count, doc.space_count, len(doc.headers),
+                       doc.bullet_points, doc.numbered_items, doc.link_count, doc.bold_count, doc.intro_word_count)
+        seo_mentions[i] = sum(doc.seo_term_counts.values())
+        has_conclusion[i] = doc.mentions_conclusion
+
+    (word_count, clean_count, clean_distinct, raw_distinct, sentence_count, paragraph_count, characters, spaces,
+     headers, bullet_points, numbered_items, links, bold, intro_words) = features.T
+
+    vocabulary = list(clean_vocabulary)
+    matrix = DocumentTermMatrix.from_counts(np.array(clean_ids, dtype=np.int64), np.array(clean_freqs, dtype=np.int64),
+                                            clean_distinct, vocabulary)
+    keyword_mask = np.array([word not in STOP_WORDS and len(word) >= MIN_KEYWORD_LENGTH for word in vocabulary],
+                            dtype=np.int64)
+
+    # Sílabas: una vez por palabra distinta, sumadas por documento con bincount
+    syllables_per_word = np.fromiter((count_syllables(word) for word in raw_vocabulary), dtype=np.int64,
+                                     count=len(raw_vocabulary))
+    raw_rows = np.repeat(np.arange(count), raw_distinct)
+    syllables = np.bincount(raw_rows, weights=syllables_per_word[np.array(raw_ids, dtype=np.int64)] * raw_freqs,
+                            minlength=count)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_sentence_length = word_count / sentence_count
+        avg_syllables_per_word = np.where(word_count > 0, syllables / word_count, np.nan)
+        flesch = 206.835 - 1.015 * avg_sentence_length - 84.6 * avg_syllables_per_word
+        keyword_density = np.where(clean_count > 0, matrix.row_sums(keyword_mask) / clean_count * 100, 0.0)
+        seo_keyword_density = np.where(word_count > 0, seo_mentions / word_count * 100, 0.0)
+
+    reading_level = READING_LEVELS[np.digitize(np.nan_to_num(flesch, nan=-np.inf), READING_LEVEL_THRESHOLDS)]
+    reading_level[np.isnan(flesch)] = None
+    has_intro = intro_words > 50
+
+    marketing_counts = {term: matrix.column(term) for term in terms.marketing_keywords
+                        if term not in STOP_WORDS and len(term) >= MIN_KEYWORD_LENGTH}
+
+    columns = {
+        "word_count": word_count,
+        "sentence_count": sentence_count,
+        "paragraph_count": paragraph_count,
+        "average_words_per_sentence": _round(avg_sentence_length, 2),
+        "character_count": characters,
+        "character_count_no_spaces": characters - spaces,
+        "total_unique_words": matrix.row_nnz(),
+        "keyword_density": _round(keyword_density, 2),
+        "marketing_keyword_mentions": sum(marketing_counts.values(), np.zeros(count, dtype=np.int64)),
+        "headers_count": headers,
+        "bullet_points": bullet_points,
+        "numbered_lists": numbered_items,
+        "links_count": links,
+        "bold_formatting": bold,
+        "has_good_structure": (headers >= 3) & ((bullet_points > 0) | (numbered_items > 0)),
+        "flesch_score": _round(flesch, 2),
+        "reading_level": reading_level,
+        "avg_syllables_per_word": _round(avg_syllables_per_word, 2),
+        "estimated_reading_time_minutes": _round(word_count / 200, 1),
+        "seo_keyword_density": _round(seo_keyword_density, 2),
+        "has_intro": has_intro,
+        "has_conclusion": has_conclusion,
+        "seo_score": _seo_scores(word_count, headers, has_intro, has_conclusion, seo_keyword_density)
+    }
+    return BatchAnalysis(columns, matrix, keyword_mask, marketing_counts)
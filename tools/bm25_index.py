@@ -0,0 +1,321 @@
+import os
+import re
+import json
+import math
+import mmap
+import heapq
+import struct
+import argparse
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+
+TOKEN_RE = re.compile(r'\w+')
+STOPWORDS = frozenset("""
+    the a an and or of to in on for with is are was were be been by as at from that this it its into than
+    de la el los las y o en un una unos unas para por con del al que se es son lo su sus como más
+""".split())
+DOCUMENT_EXTENSIONS = (".txt", ".md", ".html", ".htm")
+
+# Registro del léxico: offset y longitud del término en .terms, offset de sus postings y df
+LEXICON_RECORD = struct.Struct("<QIQI")
+# Posting: id de documento y frecuencia del término en él
+POSTING = struct.Struct("<II")
+
+INDEX_VERSION = 1
+MAX_SEGMENTS = 8  # Con más segmentos (o demasiados documentos borrados) se fusionan en uno
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in TOKEN_RE.findall(text.lower()) if len(token) > 1 and token not in STOPWORDS]
+
+
+def read_document(path: str) -> str:
+    """Texto de un documento del corpus (de los HTML se extrae el texto principal)"""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    if path.endswith((".html", ".htm")):
+        from tools.page_fetcher import MainTextExtractor
+
+        extractor = MainTextExtractor(max_chars=len(text))
+        extractor.feed(text)
+        text = extractor.text()
+    return text
+
+
+class _Segment:
+    """
+    Segmento inmutable del índice: léxico ordenado por bytes y postings en
+    ficheros binarios que se abren con mmap, así que cargarlo no lee nada
+    del disco hasta que una consulta toca sus páginas.
+    """
+
+    def __init__(self, directory: str, name: str):
+        self.name = name
+        self._files = []
+        self.lexicon = self._map(os.path.join(directory, f"{name}.lex"))
+        self.terms = self._map(os.path.join(directory, f"{name}.terms"))
+        self.postings = self._map(os.path.join(directory, f"{name}.post"))
+        self.size = len(self.lexicon) // LEXICON_RECORD.size
+
+    def _map(self, path: str):
+        f = open(path, "rb")
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _entry(self, index: int) -> Tuple[bytes, int, int]:
+        term_offset, term_length, postings_offset, df = LEXICON_RECORD.unpack_from(
+            self.lexicon, index * LEXICON_RECORD.size)
+        return self.terms[term_offset:term_offset + term_length], postings_offset, df
+
+    def lookup(self, term: bytes) -> Optional[Tuple[int, int]]:
+        """Búsqueda binaria del término; devuelve (offset de sus postings, df)"""
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            current, postings_offset, df = self._entry(middle)
+            if current == term:
+                return postings_offset, df
+            if current < term:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def iter_postings(self, offset: int, df: int) -> Iterator[Tuple[int, int]]:
+        return POSTING.iter_unpack(self.postings[offset:offset + df * POSTING.size])
+
+    def iter_terms(self) -> Iterator[Tuple[bytes, int, int]]:
+        for index in range(self.size):
+            yield self._entry(index)
+
+    def close(self) -> None:
+        for mapped in (self.lexicon, self.terms, self.postings):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        for f in self._files:
+            f.close()
+
+    @staticmethod
+    def write(directory: str, name: str, postings: Dict[bytes, List[Tuple[int, int]]]) -> None:
+        """Escribe un segmento; las postings de cada término deben ir ordenadas por id de documento"""
+        with open(os.path.join(directory, f"{name}.lex"), "wb") as lexicon, \
+                open(os.path.join(directory, f"{name}.terms"), "wb") as terms, \
+                open(os.path.join(directory, f"{name}.post"), "wb") as postings_file:
+            term_offset = postings_offset = 0
+            for term in sorted(postings):
+                entries = postings[term]
+                lexicon.write(LEXICON_RECORD.pack(term_offset, len(term), postings_offset, len(entries)))
+                terms.write(term)
+                postings_file.write(b"".join(POSTING.pack(doc_id, tf) for doc_id, tf in entries))
+                term_offset += len(term)
+                postings_offset += len(entries) * POSTING.size
+
+
+class BM25Index:
+    """
+    Índice invertido BM25 persistente para búsquedas sin red sobre un corpus local.
+
+    El índice vive en un directorio: un manifiesto JSON (documentos, longitudes
+    y segmentos) y segmentos binarios de solo lectura mapeados en memoria.
+    ``update`` es incremental: solo lee los documentos nuevos o modificados y
+    los escribe en un segmento nuevo; los modificados o borrados quedan marcados
+    como eliminados hasta que los segmentos se fusionan.
+    """
+
+    def __init__(self, path: str, k1: float = 1.2, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._docs: Dict[str, Dict[str, Any]] = {}     # Documentos vivos por ruta
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._deleted: set = set()
+        self._segments: List[_Segment] = []
+        self._next_doc_id = 0
+        self._next_segment = 0
+        self._total_length = 0
+        self._norms: Optional[Dict[int, float]] = None  # Normalización por longitud, se recalcula al cambiar el corpus
+        self._load()
+
+    @property
+    def _manifest_path(self) -> str:
+        return os.path.join(self.path, "manifest.json")
+
+    def _load(self) -> None:
+        if not os.path.exists(self._manifest_path):
+            return
+        with open(self._manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != INDEX_VERSION:
+            raise ValueError(f"Versión de índice no soportada en {self.path}: {manifest.get('version')}")
+
+        self._next_doc_id = manifest["next_doc_id"]
+        self._next_segment = manifest["next_segment"]
+        self._deleted = set(manifest["deleted"])
+        for doc in manifest["docs"]:
+            self._add_doc(doc)
+        self._segments = [_Segment(self.path, name) for name in manifest["segments"]]
+
+    def _add_doc(self, doc: Dict[str, Any]) -> None:
+        self._norms = None
+        self._docs[doc["path"]] = doc
+        self._by_id[doc["id"]] = doc
+        self._total_length += doc["length"]
+
+    def _remove_doc(self, path: str) -> None:
+        self._norms = None
+        doc = self._docs.pop(path)
+        del self._by_id[doc["id"]]
+        self._total_length -= doc["length"]
+        self._deleted.add(doc["id"])
+
+    def _save_manifest(self) -> None:
+        """Escribe el manifiesto de forma atómica: los segmentos nuevos ya están en disco"""
+        tmp_path = f"{self._manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "next_doc_id": self._next_doc_id,
+                "next_segment": self._next_segment,
+                "segments": [segment.name for segment in self._segments],
+                "deleted": sorted(self._deleted),
+                "docs": list(self._docs.values())
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self._manifest_path)
+
+    def _new_segment_name(self) -> str:
+        name = f"seg-{self._next_segment:06d}"
+        self._next_segment += 1
+        return name
+
+    def update(self, corpus_path: str) -> Dict[str, int]:
+        """Sincroniza el índice con el corpus; devuelve cuántos documentos se añadieron, actualizaron o quitaron"""
+        changes = {"added": 0, "updated": 0, "removed": 0}
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            seen = set()
+            pending = []
+            for root, _, files in os.walk(corpus_path):
+                for filename in sorted(files):
+                    if not filename.endswith(DOCUMENT_EXTENSIONS):
+                        continue
+                    path = os.path.abspath(os.path.join(root, filename))
+                    stat = os.stat(path)
+                    seen.add(path)
+                    doc = self._docs.get(path)
+                    if doc and doc["mtime"] == stat.st_mtime and doc["size"] == stat.st_size:
+                        continue
+                    if doc:
+                        self._remove_doc(path)
+                        changes["updated"] += 1
+                    else:
+                        changes["added"] += 1
+                    pending.append((path, stat))
+
+            for path in [path for path in self._docs if path not in seen]:
+                self._remove_doc(path)
+                changes["removed"] += 1
+
+            if pending:
+                postings: Dict[bytes, List[Tuple[int, int]]] = defaultdict(list)
+                for path, stat in pending:
+                    text = read_document(path)
+                    tokens = tokenize(text)
+                    doc_id = self._next_doc_id
+                    self._next_doc_id += 1
+                    for term, tf in Counter(tokens).items():
+                        postings[term.encode("utf-8")].append((doc_id, tf))
+                    first_line = text.strip().split("\n", 1)[0].lstrip("# ").strip()
+                    self._add_doc({"id": doc_id, "path": path, "title": first_line[:200] or os.path.basename(path),
+                                   "length": len(tokens), "mtime": stat.st_mtime, "size": stat.st_size})
+
+                name = self._new_segment_name()
+                _Segment.write(self.path, name, postings)
+                self._segments.append(_Segment(self.path, name))
+
+            if len(self._segments) > MAX_SEGMENTS or len(self._deleted) > max(len(self._docs), 1):
+                self._merge()
+            if pending or changes["removed"]:
+                self._save_manifest()
+        return changes
+
+    def _merge(self) -> None:
+        """Fusiona todos los segmentos en uno y descarta las postings de documentos eliminados"""
+        merged: Dict[bytes, List[Tuple[int, int]]] = defaultdict(list)
+        # Los ids crecen de un segmento al siguiente, así que las postings siguen ordenadas
+        for segment in self._segments:
+            for term, offset, df in segment.iter_terms():
+                merged[bytes(term)].extend(posting for posting in segment.iter_postings(offset, df)
+                                           if posting[0] not in self._deleted)
+
+        name = self._new_segment_name()
+        _Segment.write(self.path, name, {term: entries for term, entries in merged.items() if entries})
+        old_segments, self._segments = self._segments, [_Segment(self.path, name)]
+        self._deleted.clear()
+        self._save_manifest()
+
+        for segment in old_segments:
+            segment.close()
+            for extension in ("lex", "terms", "post"):
+                os.remove(os.path.join(self.path, f"{segment.name}.{extension}"))
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[float, Dict[str, Any]]]:
+        """Los ``top_k`` documentos con mayor puntuación BM25 para la consulta, como (puntuación, documento)"""
+        terms = set(tokenize(query))
+        with self._lock:
+            total_docs = len(self._docs)
+            if not total_docs or not terms:
+                return []
+            if self._norms is None:
+                average_length = self._total_length / total_docs or 1.0
+                self._norms = {doc_id: self.k1 * (1 - self.b + self.b * doc["length"] / average_length)
+                               for doc_id, doc in self._by_id.items()}
+            norms = self._norms
+            scores: Dict[int, float] = defaultdict(float)
+
+            for term in terms:
+                encoded = term.encode("utf-8")
+                # Solo cuentan las postings de documentos vivos: las de documentos eliminados o
+                # reemplazados siguen en los segmentos hasta la fusión (sin norma)
+                live = [(doc_id, tf)
+                        for segment in self._segments if (hit := segment.lookup(encoded))
+                        for doc_id, tf in segment.iter_postings(*hit) if doc_id in norms]
+                if not live:
+                    continue
+                idf = math.log(1 + (total_docs - len(live) + 0.5) / (len(live) + 0.5))
+                for doc_id, tf in live:
+                    scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norms[doc_id])
+
+            best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+            return [(score, self._by_id[doc_id]) for doc_id, score in best]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"documents": len(self._docs), "segments": len(self._segments),
+                    "deleted_pending_merge": len(self._deleted),
+                    "terms": sum(segment.size for segment in self._segments)}
+
+    def close(self) -> None:
+        with self._lock:
+            for segment in self._segments:
+                segment.close()
+            self._segments = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construye o actualiza el índice BM25 del corpus local")
+    parser.add_argument("--corpus", required=True)
+    parser.add_argument("--index", required=True)
+    args = parser.parse_args()
+
+    index = BM25Index(args.index)
+    changes = index.update(args.corpus)
+    print(json.dumps({"changes": changes, **index.get_stats()}, indent=2))
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,20 @@
+import os
 import re
 import json
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterable, Union
 from crewai_tools import BaseTool
 from pydantic import BaseModel, Field
+from tools.tool_metrics import track_tool_call
+from tools.singleflight import coalesce_tool_call
+from tools.document_model import ParsedDocument
+from tools.paragraph_cache import build_document
+from tools.streaming_analyzer import stream_document
+from tools.analyzer_terms import get_analyzer_terms, STOP_WORDS, MIN_KEYWORD_LENGTH
 from collections import Counter
-import nltk
 
-# Descargar recursos de NLTK si no están disponibles
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    pass  # En Lambda no podemos descargar, usaremos regex
+# El análisis usa solo regex: no se importa NLTK (no se puede descargar en Lambda
+# y su import penaliza el cold start)
+
 
 class ContentAnalysisInput(BaseModel):
     """Input para la herramienta de análisis de contenido"""
@@ -30,42 +34,65 @@ class ContentAnalyzerTool(BaseTool):
     """
     args_schema: type[BaseModel] = ContentAnalysisInput
     
+    @track_tool_call
+    @coalesce_tool_call()
     def _run(self, content: str, analysis_type: str = "comprehensive") -> str:
         """Ejecuta el análisis de contenido"""
         try:
-            if analysis_type == "keywords":
-                return self._analyze_keywords(content)
-            elif analysis_type == "readability":
-                return self._analyze_readability(content)
-            elif analysis_type == "structure":
-                return self._analyze_structure(content)
-            elif analysis_type == "seo":
-                return self._analyze_seo(content)
-            else:
-                return self._comprehensive_analysis(content)
-                
+            return self._analyze_document(build_document(content), analysis_type)
+        except Exception as e:
+            return f"Error en análisis de contenido: {str(e)}"
+    
+    def analyze_stream(self, source: Union[str, os.PathLike, Iterable[str]], analysis_type: str = "comprehensive") -> str:
+        """
+        Analiza una ruta de archivo o un iterable de fragmentos de texto sin cargarlo entero en memoria.
+
+        Devuelve lo mismo que ``_run`` sobre el texto completo (ver tools.streaming_analyzer).
+        """
+        try:
+            return self._analyze_document(stream_document(source), analysis_type)
         except Exception as e:
             return f"Error en análisis de contenido: {str(e)}"
     
-    def _comprehensive_analysis(self, content: str) -> str:
-        """Análisis completo del contenido"""
+    def _analyze_document(self, doc: ParsedDocument, analysis_type: str) -> str:
+        """Genera el análisis pedido a partir del documento analizado"""
+        if analysis_type == "keywords":
+            return self._analyze_keywords(doc)
+        elif analysis_type == "readability":
+            return self._analyze_readability(doc)
+        elif analysis_type == "structure":
+            return self._analyze_structure(doc)
+        elif analysis_type == "seo":
+            return self._analyze_seo(doc)
+        else:
+            return self._comprehensive_analysis(doc)
+    
+    def analyze_batch(self, documents: List[str]):
+        """Analiza muchos documentos a la vez (tabla por documento y agregados del corpus, ver tools.batch_analyzer)"""
+        # NumPy solo se importa si se usa el análisis por lotes (no penaliza el cold start de la herramienta)
+        from tools.batch_analyzer import analyze_batch
+        return analyze_batch(documents)
+
+    def _comprehensive_analysis(self, doc: ParsedDocument) -> str:
+        """Análisis completo del contenido (todas las métricas leen del mismo documento analizado)"""
+        gaps = self._identify_content_gaps(doc)
         results = {
-            "content_metrics": self._get_content_metrics(content),
-            "keyword_analysis": self._extract_keywords(content),
-            "structure_analysis": self._analyze_content_structure(content),
-            "readability": self._calculate_readability(content),
-            "seo_metrics": self._analyze_seo_factors(content),
-            "content_gaps": self._identify_content_gaps(content),
-            "recommendations": self._generate_recommendations(content)
+            "content_metrics": self._get_content_metrics(doc),
+            "keyword_analysis": self._extract_keywords(doc),
+            "structure_analysis": self._analyze_content_structure(doc),
+            "readability": self._calculate_readability(doc),
+            "seo_metrics": self._analyze_seo_factors(doc),
+            "content_gaps": gaps,
+            "recommendations": self._generate_recommendations(doc, gaps)
         }
         
         return self._format_analysis_results(results)
     
-    def _get_content_metrics(self, content: str) -> Dict[str, Any]:
+    def _get_content_metrics(self, doc: ParsedDocument) -> Dict[str, Any]:
         """Obtiene métricas básicas del contenido"""
-        words = len(content.split())
-        sentences = len(re.split(r'[.!?]+', content))
-        paragraphs = len([p for p in content.split('\n\n') if p.strip()])
+        words = doc.word_count
+        sentences = doc.sentence_count
+        paragraphs = doc.paragraph_count
         
         return {
             "word_count": words,
@@ -73,59 +100,39 @@ class ContentAnalyzerTool(BaseTool):
             "paragraph_count": paragraphs,
             "average_words_per_sentence": round(words / max(sentences, 1), 2),
             "average_sentences_per_paragraph": round(sentences / max(paragraphs, 1), 2),
-            "character_count": len(content),
-            "character_count_no_spaces": len(content.replace(" ", ""))
+            "character_count": doc.character_count,
+            "character_count_no_spaces": doc.character_count - doc.space_count
         }
     
-    def _extract_keywords(self, content: str) -> Dict[str, Any]:
+    def _extract_keywords(self, doc: ParsedDocument) -> Dict[str, Any]:
         """Extrae y analiza keywords del contenido"""
-        # Limpiar contenido
-        clean_content = re.sub(r'[^\w\s]', '', content.lower())
-        words = clean_content.split()
-        
-        # Filtrar stop words básicas
-        stop_words = {
-            'el', 'la', 'de', 'que', 'y', 'a', 'en', 'un', 'es', 'se', 'no', 'te', 'lo', 'le', 'da', 'su', 'por', 'son', 'con', 'para', 'al', 'del', 'los', 'las', 'una', 'como', 'pero', 'sus', 'han', 'muy', 'está', 'son', 'todo', 'esta', 'más', 'tiene', 'si', 'ya', 'puede', 'bien', 'hacer', 'sobre', 'ser', 'era', 'vez', 'solo', 'desde', 'cada', 'hasta', 'también', 'otros', 'donde', 'cuando', 'mismo', 'tanto', 'algo', 'qué', 'porque', 'así', 'cómo', 'tanto',
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'should', 'could', 'can', 'may', 'might', 'must', 'this', 'that', 'these', 'those', 'it', 'its', 'they', 'them', 'their', 'we', 'us', 'our', 'you', 'your', 'i', 'me', 'my', 'he', 'him', 'his', 'she', 'her', 'hers'
-        }
-        
-        # Filtrar palabras relevantes
-        filtered_words = [word for word in words if word not in stop_words and len(word) > 2]
+        word_counts = doc.clean_word_counts
+        total_words = sum(word_counts.values())
         
-        # Contar frecuencias
-        word_freq = Counter(filtered_words)
-        
-        # Keywords relacionados con marketing
-        marketing_keywords = [
-            'content', 'marketing', 'digital', 'social', 'media', 'seo', 'strategy', 'brand', 'engagement', 'analytics', 'roi', 'conversion', 'automation', 'personalization', 'ai', 'artificial', 'intelligence', 'video', 'blog', 'email', 'influencer', 'campaign', 'audience', 'target', 'customer', 'user', 'experience', 'data', 'insights', 'trends', 'innovation', 'growth', 'optimization', 'performance', 'metrics', 'kpi'
-        ]
+        # Filtrar palabras relevantes y contar frecuencias
+        word_freq = Counter({word: count for word, count in word_counts.items()
+                             if word not in STOP_WORDS and len(word) >= MIN_KEYWORD_LENGTH})
         
         # Identificar keywords de marketing en el contenido
-        found_marketing_keywords = {kw: word_freq.get(kw, 0) for kw in marketing_keywords if kw in word_freq}
+        found_marketing_keywords = {kw: word_freq.get(kw, 0) for kw in get_analyzer_terms().marketing_keywords
+                                    if kw in word_freq}
         
         return {
-            "total_unique_words": len(set(words)),
+            "total_unique_words": len(word_counts),
             "top_keywords": dict(word_freq.most_common(20)),
             "marketing_keywords_found": found_marketing_keywords,
-            "keyword_density": round(len(filtered_words) / len(words) * 100, 2) if words else 0
+            "keyword_density": round(sum(word_freq.values()) / total_words * 100, 2) if total_words else 0
         }
     
-    def _analyze_content_structure(self, content: str) -> Dict[str, Any]:
+    def _analyze_content_structure(self, doc: ParsedDocument) -> Dict[str, Any]:
         """Analiza la estructura del contenido"""
-        # Detectar headers
-        headers = re.findall(r'^#+\s+(.+)$', content, re.MULTILINE)
-        
-        # Detectar listas
-        bullet_points = len(re.findall(r'^\s*[-*•]\s+', content, re.MULTILINE))
-        numbered_lists = len(re.findall(r'^\s*\d+\.\s+', content, re.MULTILINE))
-        
-        # Detectar enlaces y referencias
-        links = len(re.findall(r'https?://\S+', content))
-        email_addresses = len(re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', content))
-        
-        # Detectar formatting
-        bold_text = len(re.findall(r'\*\*(.+?)\*\*', content))
-        italic_text = len(re.findall(r'\*(.+?)\*', content))
+        headers = doc.headers
+        bullet_points = doc.bullet_points
+        numbered_lists = doc.numbered_items
+        links = doc.link_count
+        email_addresses = doc.email_count
+        bold_text = doc.bold_count
+        italic_text = doc.italic_count
         
         return {
             "headers_count": len(headers),
@@ -139,20 +146,18 @@ class ContentAnalyzerTool(BaseTool):
             "has_good_structure": len(headers) >= 3 and (bullet_points > 0 or numbered_lists > 0)
         }
     
-    def _calculate_readability(self, content: str) -> Dict[str, Any]:
+    def _calculate_readability(self, doc: ParsedDocument) -> Dict[str, Any]:
         """Calcula métricas de legibilidad"""
-        sentences = re.split(r'[.!?]+', content)
-        words = content.split()
+        words = doc.word_count
         
-        if not sentences or not words:
+        if not doc.sentence_count or not words:
             return {"error": "Contenido insuficiente para análisis"}
         
         # Flesch Reading Ease (aproximado)
-        avg_sentence_length = len(words) / len(sentences)
+        avg_sentence_length = words / doc.sentence_count
         
         # Contar sílabas aproximadamente
-        syllables = sum([self._count_syllables(word) for word in words])
-        avg_syllables_per_word = syllables / len(words) if words else 0
+        avg_syllables_per_word = doc.syllable_count / words
         
         # Flesch Reading Ease Score (aproximado)
         flesch_score = 206.835 - (1.015 * avg_sentence_length) - (84.6 * avg_syllables_per_word)
@@ -178,46 +183,20 @@ class ContentAnalyzerTool(BaseTool):
             "reading_level": reading_level,
             "avg_sentence_length": round(avg_sentence_length, 2),
             "avg_syllables_per_word": round(avg_syllables_per_word, 2),
-            "estimated_reading_time_minutes": round(len(words) / 200, 1)  # 200 WPM promedio
+            "estimated_reading_time_minutes": round(words / 200, 1)  # 200 WPM promedio
         }
     
-    def _count_syllables(self, word: str) -> int:
-        """Cuenta sílabas aproximadamente"""
-        word = word.lower()
-        vowels = "aeiouy"
-        syllable_count = 0
-        previous_was_vowel = False
-        
-        for char in word:
-            if char in vowels:
-                if not previous_was_vowel:
-                    syllable_count += 1
-                previous_was_vowel = True
-            else:
-                previous_was_vowel = False
-        
-        # Ajustes
-        if word.endswith("e"):
-            syllable_count -= 1
-        if syllable_count == 0:
-            syllable_count = 1
-            
-        return syllable_count
-    
-    def _analyze_seo_factors(self, content: str) -> Dict[str, Any]:
+    def _analyze_seo_factors(self, doc: ParsedDocument) -> Dict[str, Any]:
         """Analiza factores SEO del contenido"""
-        word_count = len(content.split())
-        
-        # Detectar keywords en títulos
-        headers = re.findall(r'^#+\s+(.+)$', content, re.MULTILINE)
+        word_count = doc.word_count
+        headers = doc.headers
         
         # Meta información
-        has_intro = len(content.split('\n\n')[0].split()) > 50 if content else False
-        has_conclusion = "conclusión" in content.lower() or "resumen" in content.lower()
+        has_intro = doc.intro_word_count > 50
+        has_conclusion = doc.mentions_conclusion
         
         # Densidad de keywords (aproximada)
-        marketing_terms = ['marketing', 'content', 'digital', 'strategy', 'seo']
-        keyword_mentions = sum([content.lower().count(term) for term in marketing_terms])
+        keyword_mentions = sum(doc.seo_term_counts.values())
         keyword_density = (keyword_mentions / word_count * 100) if word_count > 0 else 0
         
         return {
@@ -260,34 +239,28 @@ class ContentAnalyzerTool(BaseTool):
         
         return min(score, 100)
     
-    def _identify_content_gaps(self, content: str) -> List[str]:
+    def _identify_content_gaps(self, doc: ParsedDocument) -> List[str]:
         """Identifica gaps en el contenido"""
         gaps = []
+        found = doc.gap_terms_found
         
         # Verificar elementos comunes
-        if "ejemplo" not in content.lower() and "case study" not in content.lower():
-            gaps.append("Falta ejemplos o casos de estudio")
-        
-        if "estadística" not in content.lower() and "%" not in content and "datos" not in content.lower():
-            gaps.append("Falta datos estadísticos o métricas")
-        
-        if len(re.findall(r'https?://\S+', content)) == 0:
-            gaps.append("Falta enlaces externos o referencias")
-        
-        if "futuro" not in content.lower() and "tendencia" not in content.lower():
-            gaps.append("Falta perspectiva futura o tendencias")
-        
-        if "recomendación" not in content.lower() and "acción" not in content.lower():
-            gaps.append("Falta recomendaciones accionables")
+        for rule in get_analyzer_terms().gap_rules:
+            if rule.get("links"):
+                missing = not doc.link_count
+            else:
+                missing = not any(term in found for term in rule["terms"])
+            if missing:
+                gaps.append(rule["gap"])
         
         return gaps
     
-    def _generate_recommendations(self, content: str) -> List[str]:
-        """Genera recomendaciones para mejorar el contenido"""
+    def _generate_recommendations(self, doc: ParsedDocument, gaps: Optional[List[str]] = None) -> List[str]:
+        """Genera recomendaciones para mejorar el contenido (reutiliza los gaps si ya se calcularon)"""
         recommendations = []
         
-        word_count = len(content.split())
-        headers = len(re.findall(r'^#+\s+(.+)$', content, re.MULTILINE))
+        word_count = doc.word_count
+        headers = len(doc.headers)
         
         if word_count < 1000:
             recommendations.append("Expandir el contenido: mínimo 1000 palabras para SEO")
@@ -295,13 +268,14 @@ class ContentAnalyzerTool(BaseTool):
         if headers < 3:
             recommendations.append("Agregar más subtítulos para mejorar estructura")
         
-        if len(re.findall(r'\*\*(.+?)\*\*', content)) == 0:
+        if doc.bold_count == 0:
             recommendations.append("Usar texto en negrita para destacar puntos clave")
         
-        if len(re.findall(r'^\s*[-*•]\s+', content, re.MULTILINE)) == 0:
+        if doc.bullet_points == 0:
             recommendations.append("Agregar listas con viñetas para mejor lectura")
         
-        gaps = self._identify_content_gaps(content)
+        if gaps is None:
+            gaps = self._identify_content_gaps(doc)
         if gaps:
             recommendations.extend([f"Mejorar: {gap}" for gap in gaps[:3]])
         
@@ -367,22 +341,22 @@ class ContentAnalyzerTool(BaseTool):
         
         return "\n".join(output)
     
-    def _analyze_keywords(self, content: str) -> str:
+    def _analyze_keywords(self, doc: ParsedDocument) -> str:
         """Análisis específico de keywords"""
-        keywords = self._extract_keywords(content)
+        keywords = self._extract_keywords(doc)
         return json.dumps(keywords, indent=2)
     
-    def _analyze_readability(self, content: str) -> str:
+    def _analyze_readability(self, doc: ParsedDocument) -> str:
         """Análisis específico de legibilidad"""
-        readability = self._calculate_readability(content)
+        readability = self._calculate_readability(doc)
         return json.dumps(readability, indent=2)
     
-    def _analyze_structure(self, content: str) -> str:
+    def _analyze_structure(self, doc: ParsedDocument) -> str:
         """Análisis específico de estructura"""
-        structure = self._analyze_content_structure(content)
+        structure = self._analyze_content_structure(doc)
         return json.dumps(structure, indent=2)
     
-    def _analyze_seo(self, content: str) -> str:
+    def _analyze_seo(self, doc: ParsedDocument) -> str:
         """Análisis específico de SEO"""
-        seo = self._analyze_seo_factors(content)
+        seo = self._analyze_seo_factors(doc)
         return json.dumps(seo, indent=2)
\ No newline at end of file
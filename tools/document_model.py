@@ -0,0 +1,160 @@
+import re
+from collections import Counter
+from functools import cached_property, lru_cache
+from typing import Dict, List, Set
+from tools.analyzer_terms import get_analyzer_terms
+
+HEADER_RE = re.compile(r'^#+\s+(.+)$', re.MULTILINE)
+BULLET_RE = re.compile(r'^\s*[-*•]\s+', re.MULTILINE)
+NUMBERED_RE = re.compile(r'^\s*\d+\.\s+', re.MULTILINE)
+LINK_RE = re.compile(r'https?://\S+')
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+ITALIC_RE = re.compile(r'\*(.+?)\*')
+SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+VOWELS = frozenset("aeiouy")
+
+
+@lru_cache(maxsize=65536)
+def count_syllables(word: str) -> int:
+    """Cuenta sílabas aproximadamente (grupos de vocales, sin la 'e' final)"""
+    word = word.lower()
+    syllable_count = 0
+    previous_was_vowel = False
+
+    for char in word:
+        if char in VOWELS:
+            if not previous_was_vowel:
+                syllable_count += 1
+            previous_was_vowel = True
+        else:
+            previous_was_vowel = False
+
+    # Ajustes
+    if word.endswith("e"):
+        syllable_count -= 1
+    if syllable_count == 0:
+        syllable_count = 1
+
+    return syllable_count
+
+
+class ParsedDocument:
+    """
+    Vista analizada de un texto que comparten todas las métricas del analizador.
+
+    Cada elemento (palabras, oraciones, párrafos, headers, listas, enlaces,
+    versión en minúsculas...) se calcula una sola vez, la primera vez que
+    alguna métrica lo pide, en lugar de volver a partir y recorrer el texto
+    en cada una.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+
+    @cached_property
+    def character_count(self) -> int:
+        return len(self.content)
+
+    @cached_property
+    def space_count(self) -> int:
+        return self.content.count(" ")
+
+    @cached_property
+    def lower(self) -> str:
+        return self.content.lower()
+
+    @cached_property
+    def words(self) -> List[str]:
+        return self.content.split()
+
+    @cached_property
+    def word_count(self) -> int:
+        return len(self.words)
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        return SENTENCE_SPLIT_RE.split(self.content)
+
+    @cached_property
+    def sentence_count(self) -> int:
+        return len(self.sentences)
+
+    @cached_property
+    def blocks(self) -> List[str]:
+        """Bloques separados por línea en blanco, incluidos los vacíos"""
+        return self.content.split('\n\n')
+
+    @cached_property
+    def paragraphs(self) -> List[str]:
+        return [block for block in self.blocks if block.strip()]
+
+    @cached_property
+    def paragraph_count(self) -> int:
+        return len(self.paragraphs)
+
+    @cached_property
+    def intro_word_count(self) -> int:
+        """Palabras del primer bloque (la introducción)"""
+        return len(self.blocks[0].split()) if self.content else 0
+
+    @cached_property
+    def clean_words(self) -> List[str]:
+        """Palabras en minúsculas sin signos de puntuación"""
+        return PUNCTUATION_RE.sub('', self.lower).split()
+
+    @cached_property
+    def clean_word_counts(self) -> Counter:
+        """Frecuencia de cada palabra limpia, en orden de primera aparición"""
+        return Counter(self.clean_words)
+
+    @cached_property
+    def headers(self) -> List[str]:
+        return HEADER_RE.findall(self.content)
+
+    @cached_property
+    def bullet_points(self) -> int:
+        return len(BULLET_RE.findall(self.content))
+
+    @cached_property
+    def numbered_items(self) -> int:
+        return len(NUMBERED_RE.findall(self.content))
+
+    @cached_property
+    def links(self) -> List[str]:
+        return LINK_RE.findall(self.content)
+
+    @cached_property
+    def link_count(self) -> int:
+        return len(self.links)
+
+    @cached_property
+    def email_count(self) -> int:
+        return len(EMAIL_RE.findall(self.content))
+
+    @cached_property
+    def bold_count(self) -> int:
+        return len(BOLD_RE.findall(self.content))
+
+    @cached_property
+    def italic_count(self) -> int:
+        return len(ITALIC_RE.findall(self.content))
+
+    @cached_property
+    def mentions_conclusion(self) -> bool:
+        return "conclusión" in self.lower or "resumen" in self.lower
+
+    @cached_property
+    def seo_term_counts(self) -> Dict[str, int]:
+        return get_analyzer_terms().seo_matcher.count(self.lower)
+
+    @cached_property
+    def gap_terms_found(self) -> Set[str]:
+        return get_analyzer_terms().gap_matcher.found(self.lower)
+
+    @cached_property
+    def syllable_count(self) -> int:
+        # Cada palabra distinta se cuenta una vez
+        return sum(count_syllables(word) * count for word, count in Counter(self.words).items())
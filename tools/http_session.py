@@ -0,0 +1,55 @@
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+
+
+class BackgroundHTTPClient:
+    """
+    Base para clientes HTTP asíncronos usados desde herramientas síncronas.
+
+    La sesión aiohttp (y su pool de conexiones keep-alive) vive en un event
+    loop propio en un hilo de fondo, de modo que las herramientas de crewai,
+    ejecutándose en cualquier hilo, reutilizan las conexiones entre llamadas.
+    Las subclases configuran la sesión en ``_create_session``.
+    """
+
+    thread_name = "http-client"
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Arranca (una sola vez) el event loop de fondo que aloja la sesión"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name=self.thread_name, daemon=True)
+                thread.start()
+                self._loop = loop
+        return self._loop
+
+    def _create_session(self):
+        raise NotImplementedError
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        return self._session
+
+    def run(self, coroutine: Coroutine) -> Any:
+        """Ejecuta una corrutina en el loop de fondo y espera su resultado"""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+
+    def close(self) -> None:
+        """Cierra la sesión y detiene el event loop de fondo"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), loop).result()
+            self._session = None
+        loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,215 @@
+import re
+import atexit
+import codecs
+import asyncio
+import hashlib
+import logging
+import threading
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from config.disk_cache import DiskCache
+from config.settings import AcademicConfig
+from tools.http_session import BackgroundHTTPClient
+
+logger = logging.getLogger(__name__)
+
+# Elementos cuyo texto no forma parte del contenido principal
+SKIP_TAGS = {'script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'svg', 'iframe',
+             'button', 'select', 'template'}
+# Elementos de bloque que delimitan los fragmentos de texto
+BLOCK_TAGS = {'p', 'h1', 'h2', 'h3', 'h4', 'li', 'blockquote', 'pre', 'td', 'article', 'section', 'div', 'br'}
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4'}
+
+MIN_BLOCK_CHARS = 40  # Bloques más cortos (menús, pies de foto, botones) se descartan
+
+
+class MainTextExtractor(HTMLParser):
+    """
+    Extractor incremental del texto principal de una página HTML.
+
+    Recibe el documento por fragmentos (``feed``) a medida que se descarga,
+    descarta scripts, navegación, cabeceras y pies, y conserva encabezados y
+    bloques de texto con entidad. Cuando se alcanza ``max_chars`` marca
+    ``done`` para que la descarga se corte sin leer el resto.
+    """
+
+    def __init__(self, max_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.blocks: List[str] = []
+        self.length = 0
+        self.done = False
+        self._skip_depth = 0
+        self._current: List[str] = []
+        self._current_length = 0
+        self._heading = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self._flush()
+            self._heading = tag in HEADING_TAGS
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag in BLOCK_TAGS:
+            self._flush()
+            self._heading = False
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if not self._skip_depth and not self.done:
+            self._current.append(data)
+            self._current_length += len(data)
+            # Un bloque enorme no debe acumularse entero antes de poder cortar la descarga
+            if self._current_length > self.max_chars:
+                self._flush()
+
+    def _flush(self) -> None:
+        text = re.sub(r'\s+', ' ', "".join(self._current)).strip()
+        self._current = []
+        self._current_length = 0
+        if not text or self.done:
+            return
+        if not self._heading and len(text) < MIN_BLOCK_CHARS:
+            return
+
+        block = f"## {text}" if self._heading else text
+        self.blocks.append(block)
+        self.length += len(block) + 1
+        if self.length >= self.max_chars:
+            self.done = True
+
+    def text(self) -> str:
+        self._flush()
+        return "\n".join(self.blocks)[:self.max_chars]
+
+
+class PageFetcher(BackgroundHTTPClient):
+    """
+    Descarga concurrente de páginas de resultados y extracción de su texto principal.
+
+    Límites: conexiones simultáneas por host, tamaño máximo de respuesta
+    (la descarga se corta al superarlo o al tener suficiente texto) y
+    timeout por página. El texto extraído se guarda en caché por URL.
+    """
+
+    thread_name = "page-fetcher"
+
+    def __init__(self, timeout_seconds: float = 10, max_bytes: int = 2 * 1024 * 1024,
+                 max_chars: int = 3000, per_host_limit: int = 2, max_concurrency: int = 8,
+                 cache: Optional[DiskCache] = None):
+        super().__init__()
+        self.timeout_seconds = timeout_seconds
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self.per_host_limit = per_host_limit
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+
+    def _create_session(self):
+        import aiohttp
+
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.per_host_limit,
+                                           ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+            headers={"User-Agent": "Mozilla/5.0 (compatible; CrewAIContentResearch/1.0)"}
+        )
+
+    async def _fetch(self, url: str) -> Optional[str]:
+        """Descarga una página en streaming y extrae su texto; None si falla o no es HTML"""
+        session = await self._get_session()
+        try:
+            async with session.get(url, allow_redirects=True) as response:
+                content_type = response.headers.get("Content-Type", "")
+                if response.status != 200 or "html" not in content_type.lower():
+                    return None
+
+                decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(errors="replace")
+                extractor = MainTextExtractor(self.max_chars)
+                received = 0
+
+                async for chunk in response.content.iter_chunked(16 * 1024):
+                    received += len(chunk)
+                    extractor.feed(decoder.decode(chunk))
+                    if extractor.done or received >= self.max_bytes:
+                        break
+
+                text = extractor.text()
+                return text or None
+        except Exception as e:
+            logger.debug(f"No se pudo descargar {url}: {type(e).__name__} {str(e)}")
+            return None
+
+    async def _fetch_many(self, urls: List[str]) -> List[Optional[str]]:
+        return await asyncio.gather(*(self._fetch(url) for url in urls))
+
+    def fetch_many(self, urls: List[str]) -> List[Optional[str]]:
+        """
+        Devuelve el texto principal de cada URL en el mismo orden (None si no
+        se pudo obtener). Solo se descargan las URLs que no están en caché.
+        """
+        texts: List[Optional[str]] = [None] * len(urls)
+        missing: Dict[str, List[int]] = {}
+
+        for index, url in enumerate(urls):
+            cached = self.cache.get(self._cache_key(url)) if self.cache else None
+            if cached is not None:
+                texts[index] = cached
+            else:
+                missing.setdefault(url, []).append(index)
+
+        if missing:
+            fetched = self.run(self._fetch_many(list(missing)))
+            for (url, indexes), text in zip(missing.items(), fetched):
+                for index in indexes:
+                    texts[index] = text
+                if text and self.cache:
+                    self.cache.set(self._cache_key(url), text)
+
+        return texts
+
+    @staticmethod
+    def _cache_key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_fetchable(url: Optional[str]) -> bool:
+        """Solo se descargan URLs http(s) que no apunten a documentos binarios"""
+        if not url:
+            return False
+        parsed = urlparse(url)
+        return parsed.scheme in ("http", "https") and not re.search(r'\.(pdf|zip|docx?|xlsx?|pptx?|mp4|mp3)$',
+                                                                     parsed.path, re.IGNORECASE)
+
+
+_page_fetcher: Optional[PageFetcher] = None
+_page_fetcher_lock = threading.Lock()
+
+
+def get_page_fetcher() -> Optional[PageFetcher]:
+    """Obtiene el fetcher de páginas del proceso (None si la descarga está deshabilitada)"""
+    global _page_fetcher
+    settings = AcademicConfig.PAGE_FETCH
+    if not settings["enabled"]:
+        return None
+    if _page_fetcher is None:
+        with _page_fetcher_lock:
+            if _page_fetcher is None:
+                _page_fetcher = PageFetcher(
+                    timeout_seconds=settings["timeout_seconds"],
+                    max_bytes=settings["max_bytes"],
+                    max_chars=settings["max_chars"],
+                    per_host_limit=settings["per_host_limit"],
+                    max_concurrency=settings["max_concurrency"],
+                    cache=DiskCache(settings["cache_path"], settings["cache_max_bytes"], settings["cache_ttl_seconds"])
+                )
+                atexit.register(_page_fetcher.close)
+    return _page_fetcher
@@ -0,0 +1,250 @@
+import re
+import time
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from functools import cached_property
+from itertools import chain
+from typing import Dict, List, Any, Optional, Set
+from config.settings import AcademicConfig
+from tools.analyzer_terms import AnalyzerTerms, get_analyzer_terms
+from tools.document_model import (ParsedDocument, count_syllables, HEADER_RE, BULLET_RE, NUMBERED_RE, LINK_RE,
+                                  EMAIL_RE, BOLD_RE, ITALIC_RE, SENTENCE_SPLIT_RE, PUNCTUATION_RE)
+from tools.tool_metrics import add_tool_call_detail
+
+# Última línea de un bloque (sin espacios finales) que es solo un marcador de header o de lista:
+# en el texto completo sus regex se extenderían sobre la línea en blanco hasta el bloque siguiente
+OPEN_TAIL_RE = re.compile(r'(?:#+|\s*[-*•]|\s*\d+\.)')
+STRUCTURE_CHARS_RE = re.compile(r'[-*•]')
+
+
+def has_open_tail(text: str) -> bool:
+    """True si ``text`` termina en un marcador de header o de lista que se uniría con el texto siguiente"""
+    tail = text.rstrip()
+    return bool(tail) and OPEN_TAIL_RE.fullmatch(tail[tail.rfind('\n') + 1:]) is not None
+
+
+_paragraph_cache: Optional["ParagraphCache"] = None
+_paragraph_cache_lock = threading.Lock()
+
+
+class ParagraphMetrics:
+    """Métricas parciales de un bloque (párrafo) que se suman para obtener las del documento"""
+
+    __slots__ = ("word_count", "sentence_breaks", "syllable_count", "clean_words", "headers", "bullet_points",
+                 "numbered_items", "links", "email_count", "bold_count", "italic_count", "mentions_conclusion",
+                 "seo_term_counts", "gap_terms_found", "open_tail", "compute_ms")
+
+    def __init__(self, block: str, terms: AnalyzerTerms):
+        # Mismas reglas que ParsedDocument, calculadas directamente: un borrador nuevo tiene
+        # muchos bloques pequeños y el coste fijo por bloque domina
+        start = time.perf_counter()
+        lower = block.lower()
+        words = block.split()
+        self.word_count = len(words)
+        self.sentence_breaks = len(SENTENCE_SPLIT_RE.findall(block))
+        self.syllable_count = sum(map(count_syllables, words))
+        self.clean_words = PUNCTUATION_RE.sub('', lower).split()
+        self.mentions_conclusion = "conclusión" in lower or "resumen" in lower
+        self.seo_term_counts = terms.seo_matcher.count(lower)
+        self.gap_terms_found = terms.gap_matcher.found(lower)
+        # Los marcadores de estructura son raros: solo se buscan si el bloque contiene el carácter
+        self.headers = HEADER_RE.findall(block) if '#' in block else []
+        self.bullet_points = len(BULLET_RE.findall(block)) if STRUCTURE_CHARS_RE.search(block) else 0
+        self.numbered_items = len(NUMBERED_RE.findall(block)) if '.' in block else 0
+        self.links = LINK_RE.findall(block) if '://' in block else []
+        self.email_count = len(EMAIL_RE.findall(block)) if '@' in block else 0
+        if '*' in block:
+            self.bold_count = len(BOLD_RE.findall(block))
+            self.italic_count = len(ITALIC_RE.findall(block))
+        else:
+            self.bold_count = self.italic_count = 0
+        self.open_tail = has_open_tail(block)
+        self.compute_ms = (time.perf_counter() - start) * 1000
+
+
+class IncrementalDocument(ParsedDocument):
+    """
+    Documento cuyas métricas se obtienen sumando las de sus párrafos cacheados.
+
+    Solo se sobrescriben las métricas que se descomponen exactamente por
+    bloques; el resto (``words``, ``sentences``...) se calcula sobre el texto
+    completo como en ``ParsedDocument``.
+    """
+
+    def __init__(self, content: str, blocks: List[str], partials: List[ParagraphMetrics]):
+        super().__init__(content)
+        self.__dict__["blocks"] = blocks
+        self.partials = partials
+
+    @cached_property
+    def word_count(self) -> int:
+        return sum(p.word_count for p in self.partials)
+
+    @cached_property
+    def sentence_count(self) -> int:
+        return sum(p.sentence_breaks for p in self.partials) + 1
+
+    @cached_property
+    def clean_word_counts(self) -> Counter:
+        return Counter(chain.from_iterable(p.clean_words for p in self.partials))
+
+    @cached_property
+    def headers(self) -> List[str]:
+        return [header for p in self.partials for header in p.headers]
+
+    @cached_property
+    def bullet_points(self) -> int:
+        return sum(p.bullet_points for p in self.partials)
+
+    @cached_property
+    def numbered_items(self) -> int:
+        return sum(p.numbered_items for p in self.partials)
+
+    @cached_property
+    def links(self) -> List[str]:
+        return [link for p in self.partials for link in p.links]
+
+    @cached_property
+    def email_count(self) -> int:
+        return sum(p.email_count for p in self.partials)
+
+    @cached_property
+    def bold_count(self) -> int:
+        return sum(p.bold_count for p in self.partials)
+
+    @cached_property
+    def italic_count(self) -> int:
+        return sum(p.italic_count for p in self.partials)
+
+    @cached_property
+    def mentions_conclusion(self) -> bool:
+        return any(p.mentions_conclusion for p in self.partials)
+
+    @cached_property
+    def seo_term_counts(self) -> Dict[str, int]:
+        totals = dict.fromkeys(get_analyzer_terms().seo_matcher.terms, 0)
+        for p in self.partials:
+            for term, count in p.seo_term_counts.items():
+                totals[term] += count
+        return totals
+
+    @cached_property
+    def gap_terms_found(self) -> Set[str]:
+        return set().union(*(p.gap_terms_found for p in self.partials))
+
+    @cached_property
+    def syllable_count(self) -> int:
+        return sum(p.syllable_count for p in self.partials)
+
+
+class ParagraphCache:
+    """
+    Caché LRU en memoria de métricas parciales por párrafo.
+
+    Los agentes analizan varias veces borradores que solo cambian en uno o
+    dos párrafos: cada bloque separado por línea en blanco se identifica por
+    el hash de su texto y solo se analizan los que no están en caché. Las
+    entradas dependen de las listas de términos activas, así que la caché se
+    vacía si se reconfiguran (``set_analyzer_terms``).
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, ParagraphMetrics]" = OrderedDict()
+        self._terms = None
+        self._lock = threading.Lock()
+        self._stats = {"documents": 0, "hits": 0, "misses": 0, "evictions": 0, "saved_ms": 0.0}
+
+    @staticmethod
+    def _key(block: str) -> bytes:
+        return hashlib.blake2b(block.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def _check_terms(self) -> AnalyzerTerms:
+        """Términos activos; vacía la caché si cambiaron desde la última llamada"""
+        terms = get_analyzer_terms()
+        if terms is not self._terms:
+            with self._lock:
+                self._entries.clear()
+                self._terms = terms
+        return terms
+
+    def document(self, content: str) -> ParsedDocument:
+        """Documento analizado de ``content`` reutilizando los párrafos ya vistos"""
+        terms = self._check_terms()
+        # Un término con salto de línea podría coincidir a caballo entre dos párrafos
+        if any('\n' in term for term in chain(terms.seo_matcher.terms, terms.gap_matcher.terms)):
+            return ParsedDocument(content)
+
+        blocks = content.split('\n\n')
+        partials, hits, saved_ms = [], 0, 0.0
+        for block in blocks:
+            key = self._key(block)
+            with self._lock:
+                partial = self._entries.get(key)
+                if partial is not None:
+                    self._entries.move_to_end(key)
+            if partial is not None:
+                hits += 1
+                saved_ms += partial.compute_ms
+            else:
+                partial = ParagraphMetrics(block, terms)
+                with self._lock:
+                    self._entries[key] = partial
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self._stats["evictions"] += 1
+            partials.append(partial)
+
+        misses = len(blocks) - hits
+        with self._lock:
+            self._stats["documents"] += 1
+            self._stats["hits"] += hits
+            self._stats["misses"] += misses
+            self._stats["saved_ms"] += saved_ms
+        add_tool_call_detail("paragraph_cache", {"paragraphs": len(blocks), "hits": hits, "misses": misses,
+                                                 "hit_rate": round(hits / len(blocks), 3),
+                                                 "saved_ms": round(saved_ms, 2)})
+
+        # Un marcador de header/lista al final de un bloque se une al siguiente en el texto completo
+        if any(partial.open_tail for partial in partials[:-1]):
+            return ParsedDocument(content)
+        return IncrementalDocument(content, blocks, partials)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        stats["saved_ms"] = round(stats["saved_ms"], 2)
+        return stats
+
+
+def get_paragraph_cache() -> Optional[ParagraphCache]:
+    """Caché de párrafos del proceso (None si ANALYZER_PARAGRAPH_CACHE_SIZE es 0)"""
+    global _paragraph_cache
+    max_entries = AcademicConfig.CONTENT_ANALYSIS["paragraph_cache_size"]
+    if max_entries <= 0:
+        return None
+    if _paragraph_cache is None:
+        with _paragraph_cache_lock:
+            if _paragraph_cache is None:
+                _paragraph_cache = ParagraphCache(max_entries)
+    return _paragraph_cache
+
+
+def get_paragraph_cache_stats() -> Dict[str, Any]:
+    """Aciertos, fallos y tiempo de análisis ahorrado por la caché de párrafos"""
+    cache = get_paragraph_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.get_stats()}
+
+
+def build_document(content: str) -> ParsedDocument:
+    """Documento analizado para el analizador: incremental si la caché de párrafos está activa"""
+    cache = get_paragraph_cache()
+    if cache is None:
+        return ParsedDocument(content)
+    return cache.document(content)
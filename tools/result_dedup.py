@@ -0,0 +1,126 @@
+import re
+import hashlib
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Parámetros de query que no cambian el contenido de la página
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|gclid|fbclid|msclkid|mc_cid|mc_eid|ref|ref_src|igshid|_ga|spm|cmpid)$',
+                             re.IGNORECASE)
+HOST_PREFIXES = ("www.", "m.", "amp.", "mobile.")
+
+SIMHASH_BITS = 64
+NEAR_DUPLICATE_DISTANCE = 3   # Bits distintos máximos entre huellas de textos casi idénticos
+SHINGLE_SIZE = 3
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Forma canónica de una URL para detectar el mismo documento con distintas URLs:
+    esquema y host normalizados (sin www./m./amp.), sin fragmento, sin parámetros
+    de tracking, parámetros ordenados y sin barra final ni sufijo /amp.
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+
+    host = (parts.hostname or "").lower()
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r'/+', '/', parts.path or "/")
+    path = re.sub(r'/amp/?$', '/', path)
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    query = urlencode(sorted((key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                             if not TRACKING_PARAMS.match(key)))
+
+    # http y https se tratan como el mismo documento
+    return urlunsplit(("https", host, path, query, ""))
+
+
+def _shingles(text: str) -> List[str]:
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+
+def simhash(text: str) -> Optional[int]:
+    """Huella SimHash de 64 bits sobre shingles de 3 palabras (None si no hay texto)"""
+    shingles = _shingles(text)
+    if not shingles:
+        return None
+
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+class ResultDeduplicator:
+    """
+    Elimina resultados duplicados antes de que lleguen al LLM.
+
+    Un resultado se descarta si su URL canónica ya apareció o si su texto
+    (el de la página descargada si existe; si no, título + snippet) es casi
+    idéntico al de un resultado anterior según SimHash. Los resultados se
+    recorren por ranking (orgánicos y después noticias), así que siempre se
+    conserva la copia mejor posicionada. El estado se comparte entre las
+    consultas de una misma búsqueda múltiple.
+    """
+
+    def __init__(self, max_distance: int = NEAR_DUPLICATE_DISTANCE):
+        self.max_distance = max_distance
+        self._urls = set()
+        self._fingerprints: List[int] = []
+
+    def _is_duplicate(self, result: Dict[str, Any], pages: Dict[str, str]) -> bool:
+        link = result.get('link')
+        if link:
+            canonical = canonicalize_url(link)
+            if canonical in self._urls:
+                return True
+
+        text = pages.get(link) or f"{result.get('title', '')} {result.get('snippet', '')}"
+        fingerprint = simhash(text)
+        if fingerprint is not None and any(hamming_distance(fingerprint, seen) <= self.max_distance
+                                           for seen in self._fingerprints):
+            return True
+
+        if link:
+            self._urls.add(canonical)
+        if fingerprint is not None:
+            self._fingerprints.append(fingerprint)
+        return False
+
+    def dedupe(self, data: Dict[str, Any], pages: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, Any], int]:
+        """Devuelve la respuesta de Serper sin duplicados y cuántos resultados se eliminaron"""
+        pages = pages or {}
+        deduped = dict(data)
+        removed = 0
+
+        for block in ('organic', 'news'):
+            if block not in data:
+                continue
+            kept = []
+            for result in data[block]:
+                if self._is_duplicate(result, pages):
+                    removed += 1
+                else:
+                    kept.append(result)
+            deduped[block] = kept
+
+        return deduped, removed
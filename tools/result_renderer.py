@@ -0,0 +1,101 @@
+import re
+from typing import Dict, List, Any, Optional, Tuple
+from config.tokens import count_tokens
+
+MAX_NEWS = 3  # Noticias que se muestran por consulta
+MIN_PAGE_CHARS = 200  # Por debajo de esto el extracto de la página no compensa
+FOOTER_TOKENS = 20    # Reservados para el aviso de resultados omitidos
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """Recorta ``text`` a ``max_chars`` por el último límite de palabra, marcando el corte con …"""
+    text = re.sub(r'\s+', ' ', text or "").strip()
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars].rsplit(' ', 1)[0] or text[:max_chars]
+    return cut.rstrip(' ,.;:') + "…"
+
+
+def _ranked_entries(data: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Resultados en orden de relevancia: orgánicos según su posición en Serper y después noticias"""
+    organic = sorted(data.get('organic', []), key=lambda result: result.get('position', float('inf')))
+    entries = [("organic", result) for result in organic]
+    entries.extend(("news", news) for news in data.get('news', [])[:MAX_NEWS])
+    return entries
+
+
+def _render_entry(rank: int, kind: str, result: Dict[str, Any], snippet_chars: int,
+                  page_text: Optional[str] = None) -> str:
+    title = result.get('title') or 'N/A'
+    if kind == "news":
+        date = result.get('date')
+        title = f"[NOTICIA{' ' + date if date else ''}] {title}"
+
+    lines = [f"{rank}. {title}", result.get('link') or 'N/A']
+    snippet = truncate_text(result.get('snippet', ''), snippet_chars)
+    if snippet:
+        lines.append(snippet)
+    if page_text:
+        lines.append(f"Contenido de la página: {page_text}")
+    return "\n".join(lines)
+
+
+def _fit_page_text(rank: int, kind: str, result: Dict[str, Any], snippet_chars: int, page_text: str,
+                   budget: int) -> Optional[str]:
+    """Extracto de la página más largo que cabe en ``budget`` tokens junto al resto de la entrada"""
+    max_chars = len(page_text)
+    while max_chars >= MIN_PAGE_CHARS:
+        excerpt = truncate_text(page_text, max_chars)
+        if count_tokens(_render_entry(rank, kind, result, snippet_chars, excerpt)) <= budget:
+            return excerpt
+        max_chars = int(max_chars * 0.7)
+    return None
+
+
+def render_results(data: Dict[str, Any], pages: Optional[Dict[str, str]] = None,
+                   token_budget: Optional[int] = None, snippet_chars: int = 300,
+                   page_chars: int = 1200) -> Tuple[str, int, int]:
+    """
+    Convierte la respuesta de Serper (y el texto de las páginas descargadas)
+    en el texto compacto que recibe el agente: una línea de título, la URL y
+    el snippet recortado por resultado, sin sangrías.
+
+    Con ``token_budget`` los resultados se añaden por relevancia mientras
+    quepan: primero se recorta el contenido de la página y, si ni así cabe
+    un resultado, se descartan ese y todos los menos relevantes. El primer
+    resultado se incluye siempre.
+
+    Devuelve (texto, tokens del texto, resultados descartados).
+    """
+    pages = pages or {}
+    entries = _ranked_entries(data)
+    if not entries:
+        text = "No se encontraron resultados"
+        return text, count_tokens(text), 0
+
+    rendered: List[str] = []
+    remaining = token_budget - FOOTER_TOKENS if token_budget is not None else None
+    for rank, (kind, result) in enumerate(entries, start=1):
+        page_text = pages.get(result.get('link')) if kind == "organic" else None
+        page_text = truncate_text(page_text, page_chars) if page_text else None
+        entry = _render_entry(rank, kind, result, snippet_chars, page_text)
+
+        if remaining is not None:
+            # Cada entrada va separada por una línea en blanco (≈1 token)
+            cost = count_tokens(entry) + 1
+            if cost > remaining and page_text:
+                page_text = _fit_page_text(rank, kind, result, snippet_chars, page_text, remaining - 1)
+                entry = _render_entry(rank, kind, result, snippet_chars, page_text)
+                cost = count_tokens(entry) + 1
+            if cost > remaining and rendered:
+                break
+            remaining -= cost
+
+        rendered.append(entry)
+
+    dropped = len(entries) - len(rendered)
+    if dropped:
+        rendered.append(f"[{dropped} resultados menos relevantes omitidos por el límite de {token_budget} tokens]")
+
+    text = "\n\n".join(rendered)
+    return text, count_tokens(text), dropped
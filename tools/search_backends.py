@@ -0,0 +1,323 @@
+import os
+import re
+import time
+import atexit
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Optional, Tuple
+from config.settings import AcademicConfig
+from tools.http_session import BackgroundHTTPClient
+
+logger = logging.getLogger(__name__)
+
+SEARCH_STRATEGIES = ("single", "failover", "race")
+
+
+class SearchBackend:
+    """
+    Backend de búsqueda para ``WebSearchTool``.
+
+    Recibe el payload de Serper (``q``, ``num``, ``gl``, ``hl``) y devuelve
+    una respuesta con la forma de la de Serper (``organic`` y, si las hay,
+    ``news``) para que el resto de la herramienta no dependa del proveedor.
+    """
+
+    name = "backend"
+
+    def is_available(self, api_key: Optional[str]) -> bool:
+        return True
+
+    def search(self, payload: Dict[str, Any], api_key: Optional[str]) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class SerperBackend(SearchBackend):
+    """Serper a través del cliente compartido (pool de conexiones, limitador y reintentos)"""
+
+    name = "serper"
+
+    def is_available(self, api_key: Optional[str]) -> bool:
+        return bool(api_key)
+
+    def search(self, payload: Dict[str, Any], api_key: Optional[str]) -> Dict[str, Any]:
+        from tools.serper_client import get_serper_client
+
+        return get_serper_client().search(payload, api_key)
+
+
+class SearxNGBackend(SearchBackend, BackgroundHTTPClient):
+    """Instancia de SearxNG (o compatible) con la API JSON habilitada (``format=json``)"""
+
+    name = "searxng"
+    thread_name = "searxng-client"
+
+    def __init__(self, endpoint: str, timeout_seconds: float = 15):
+        BackgroundHTTPClient.__init__(self)
+        self.endpoint = endpoint.rstrip("/")
+        self.timeout_seconds = timeout_seconds
+
+    def is_available(self, api_key: Optional[str]) -> bool:
+        return bool(self.endpoint)
+
+    def _create_session(self):
+        import aiohttp
+
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=16, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=self.timeout_seconds)
+        )
+
+    async def _get(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        session = await self._get_session()
+        params = {"q": payload["q"], "format": "json", "language": payload.get("hl", "en")}
+        try:
+            async with session.get(f"{self.endpoint}/search", params=params) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"timeout de {self.timeout_seconds}s consultando '{payload.get('q')}'")
+
+    def search(self, payload: Dict[str, Any], api_key: Optional[str]) -> Dict[str, Any]:
+        data = self.run(self._get(payload))
+        organic, news = [], []
+        for result in data.get("results", []):
+            entry = {"title": result.get("title"), "link": result.get("url"), "snippet": result.get("content", "")}
+            if result.get("category") == "news":
+                news.append({**entry, "date": result.get("publishedDate")})
+            else:
+                organic.append({**entry, "position": len(organic) + 1})
+        return {"organic": organic[:payload.get("num", 10)], "news": news}
+
+
+class LocalIndexBackend(SearchBackend):
+    """
+    Búsqueda sin red sobre los documentos de un directorio local (``.txt``,
+    ``.md``, ``.html``) con un índice BM25 persistente. El índice se
+    sincroniza con el corpus en la primera consulta y después cada
+    ``refresh_seconds`` (solo se indexan los documentos nuevos o modificados).
+    """
+
+    name = "local"
+
+    def __init__(self, corpus_path: str, index_path: str, refresh_seconds: float = 300):
+        self.corpus_path = corpus_path
+        self.index_path = index_path
+        self.refresh_seconds = refresh_seconds
+        self._index = None
+        self._last_refresh: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def is_available(self, api_key: Optional[str]) -> bool:
+        return os.path.isdir(self.corpus_path) or os.path.exists(os.path.join(self.index_path, "manifest.json"))
+
+    def _get_index(self):
+        from tools.bm25_index import BM25Index
+
+        with self._lock:
+            if self._index is None:
+                self._index = BM25Index(self.index_path)
+            now = time.monotonic()
+            due = self._last_refresh is None or (self.refresh_seconds > 0 and
+                                                 now - self._last_refresh >= self.refresh_seconds)
+            if due and os.path.isdir(self.corpus_path):
+                changes = self._index.update(self.corpus_path)
+                if any(changes.values()):
+                    logger.info(f"Índice local actualizado: {changes}")
+                self._last_refresh = now
+            return self._index
+
+    @staticmethod
+    def _snippet(text: str, terms: set, max_chars: int = 300) -> str:
+        """Frase con más términos de la consulta"""
+        sentences = [sentence.strip() for sentence in re.split(r'(?<=[.!?])\s+|\n+', text) if sentence.strip()]
+        if not sentences:
+            return ""
+        best = max(sentences, key=lambda sentence: len(terms & set(re.findall(r'\w+', sentence.lower()))))
+        return best[:max_chars]
+
+    def search(self, payload: Dict[str, Any], api_key: Optional[str]) -> Dict[str, Any]:
+        from tools.bm25_index import read_document, tokenize
+
+        terms = set(tokenize(payload["q"]))
+        organic = []
+        for position, (score, doc) in enumerate(self._get_index().search(payload["q"], payload.get("num", 10)),
+                                                start=1):
+            try:
+                body = read_document(doc["path"]).strip().partition("\n")[2]
+            except OSError:
+                body = ""
+            organic.append({"title": doc["title"], "link": f"file://{doc['path']}",
+                            "snippet": self._snippet(body, terms), "position": position,
+                            "score": round(score, 3)})
+        return {"organic": organic}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._index is not None:
+                self._index.close()
+
+
+class SearchRouter:
+    """
+    Reparte cada búsqueda entre los backends configurados.
+
+    Estrategias:
+      - ``single``: solo el primer backend disponible.
+      - ``failover``: el primero; si falla, responde vacío o supera
+        ``latency_budget_seconds`` sin contestar, se lanza el siguiente y
+        gana la primera respuesta buena de los que estén en vuelo.
+      - ``race``: los dos primeros a la vez; gana la primera respuesta
+        buena (el resto sigue como en ``failover``).
+
+    Cada respuesta va acompañada del backend que la sirvió y su latencia.
+    """
+
+    def __init__(self, backends: List[SearchBackend], strategy: str = "failover",
+                 latency_budget_seconds: float = 3.0, max_workers: int = 16):
+        if strategy not in SEARCH_STRATEGIES:
+            raise ValueError(f"Estrategia de búsqueda no válida: {strategy}")
+        self.backends = backends
+        self.strategy = strategy
+        self.latency_budget_seconds = latency_budget_seconds
+        # Pools separados: las consultas esperan a los backends y no deben competir por los mismos hilos
+        self._query_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search-query")
+        self._backend_pool = ThreadPoolExecutor(max_workers=max_workers * 2, thread_name_prefix="search-backend")
+        self._lock = threading.Lock()
+        self._stats = {backend.name: {"served": 0, "failures": 0, "hedged": 0, "latency_ms": 0.0}
+                       for backend in backends}
+
+    def available_backends(self, api_key: Optional[str]) -> List[SearchBackend]:
+        return [backend for backend in self.backends if backend.is_available(api_key)]
+
+    @staticmethod
+    def _is_good(result: Any) -> bool:
+        return not isinstance(result, Exception) and bool(result.get("organic") or result.get("news"))
+
+    def _call(self, backend: SearchBackend, payload: Dict[str, Any], api_key: Optional[str]) -> Tuple[Any, float]:
+        start = time.perf_counter()
+        try:
+            result = backend.search(payload, api_key)
+        except Exception as e:
+            result = e
+        return result, time.perf_counter() - start
+
+    def _record(self, backend: SearchBackend, key: str, latency: float = 0.0) -> None:
+        with self._lock:
+            self._stats[backend.name][key] += 1
+            if key == "served":
+                self._stats[backend.name]["latency_ms"] += latency * 1000
+
+    def search(self, payload: Dict[str, Any], api_key: Optional[str]) -> Tuple[Any, Dict[str, Any]]:
+        """Devuelve (respuesta o excepción, {backend, latency_ms, attempted})"""
+        candidates = self.available_backends(api_key)
+        if self.strategy == "single":
+            candidates = candidates[:1]
+        if not candidates:
+            return RuntimeError("ningún backend de búsqueda disponible"), {"backend": None, "latency_ms": 0.0,
+                                                                          "attempted": []}
+
+        start = time.perf_counter()
+        in_flight: Dict[Future, SearchBackend] = {}
+        attempted: List[str] = []
+        fallback: Optional[Tuple[Any, SearchBackend, float]] = None
+
+        def launch(backend: SearchBackend) -> None:
+            attempted.append(backend.name)
+            in_flight[self._backend_pool.submit(self._call, backend, payload, api_key)] = backend
+
+        for backend in candidates[:2 if self.strategy == "race" else 1]:
+            launch(backend)
+        remaining = candidates[len(attempted):]
+
+        while in_flight:
+            timeout = self.latency_budget_seconds if remaining else None
+            done, _ = wait(list(in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Se agotó el presupuesto de latencia: se cubre con el siguiente backend sin cancelar los demás
+                self._record(remaining[0], "hedged")
+                launch(remaining.pop(0))
+                continue
+
+            for future in done:
+                backend = in_flight.pop(future)
+                result, latency = future.result()
+                if self._is_good(result):
+                    self._record(backend, "served", latency)
+                    return result, {"backend": backend.name, "latency_ms": round(latency * 1000, 1),
+                                    "attempted": attempted}
+                if isinstance(result, Exception):
+                    self._record(backend, "failures")
+                    logger.warning(f"Backend {backend.name} falló en '{payload.get('q')}': "
+                                   f"{type(result).__name__} {str(result)}")
+                if fallback is None or isinstance(fallback[0], Exception):
+                    fallback = (result, backend, latency)
+
+            if not in_flight and remaining:
+                launch(remaining.pop(0))
+
+        # Ningún backend dio resultados: se devuelve la respuesta vacía (o el error) disponible
+        result, backend, latency = fallback
+        if not isinstance(result, Exception):
+            self._record(backend, "served", latency)
+        return result, {"backend": backend.name, "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+                        "attempted": attempted}
+
+    def search_many(self, payloads: List[Dict[str, Any]], api_key: Optional[str]) -> List[Tuple[Any, Dict[str, Any]]]:
+        """Búsquedas en paralelo; cada una con su respuesta (o excepción) y el backend que la sirvió"""
+        return list(self._query_pool.map(lambda payload: self.search(payload, api_key), payloads))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            backends = {name: dict(stats) for name, stats in self._stats.items()}
+        for stats in backends.values():
+            total_ms = stats.pop("latency_ms")
+            stats["mean_latency_ms"] = round(total_ms / stats["served"], 1) if stats["served"] else None
+        return {"strategy": self.strategy, "latency_budget_seconds": self.latency_budget_seconds,
+                "backends": backends}
+
+    def close(self) -> None:
+        self._query_pool.shutdown(wait=False)
+        self._backend_pool.shutdown(wait=False)
+        for backend in self.backends:
+            if isinstance(backend, (BackgroundHTTPClient, LocalIndexBackend)):
+                backend.close()
+
+
+def build_backend(name: str) -> SearchBackend:
+    """Crea un backend por nombre a partir de AcademicConfig.SEARCH_BACKENDS"""
+    settings = AcademicConfig.SEARCH_BACKENDS
+    if name == "serper":
+        return SerperBackend()
+    if name == "searxng":
+        return SearxNGBackend(settings["searxng_endpoint"], AcademicConfig.SEARCH["timeout_seconds"])
+    if name == "local":
+        return LocalIndexBackend(settings["local_corpus_path"], settings["local_index_path"],
+                                 settings["local_index_refresh_seconds"])
+    raise ValueError(f"Backend de búsqueda desconocido: {name}")
+
+
+_search_router: Optional[SearchRouter] = None
+_search_router_lock = threading.Lock()
+
+
+def get_search_router() -> SearchRouter:
+    """Router de búsquedas del proceso (backends, estrategia y presupuesto de SEARCH_BACKENDS)"""
+    global _search_router
+    if _search_router is None:
+        with _search_router_lock:
+            if _search_router is None:
+                settings = AcademicConfig.SEARCH_BACKENDS
+                _search_router = SearchRouter(
+                    [build_backend(name) for name in settings["backends"]],
+                    strategy=settings["strategy"],
+                    latency_budget_seconds=settings["latency_budget_seconds"]
+                )
+                atexit.register(_search_router.close)
+    return _search_router
+
+
+def get_search_router_stats() -> Optional[Dict[str, Any]]:
+    """Respuestas servidas, fallos y latencia media por backend (None si aún no se buscó nada)"""
+    return _search_router.get_stats() if _search_router is not None else None
@@ -0,0 +1,50 @@
+import re
+import json
+import hashlib
+import threading
+import unicodedata
+from typing import Dict, Any, Optional
+from config.disk_cache import DiskCache
+from config.settings import AcademicConfig
+
+_search_cache: Optional[DiskCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """Normaliza una consulta: Unicode NFKC, minúsculas y espacios colapsados"""
+    normalized = unicodedata.normalize("NFKC", query or "").lower()
+    return re.sub(r'\s+', ' ', normalized).strip()
+
+
+def build_search_cache_key(payload: Dict[str, Any]) -> str:
+    """Clave de caché de una búsqueda: consulta normalizada + gl/hl/num"""
+    key = json.dumps({
+        "q": normalize_query(payload.get("q", "")),
+        "gl": payload.get("gl"),
+        "hl": payload.get("hl"),
+        "num": payload.get("num")
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def get_search_cache() -> Optional[DiskCache]:
+    """Caché de respuestas de Serper del proceso (None si está deshabilitada)"""
+    global _search_cache
+    settings = AcademicConfig.SEARCH_CACHE
+    if not settings["enabled"]:
+        return None
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = DiskCache(settings["path"], settings["max_bytes"], settings["ttl_seconds"])
+    return _search_cache
+
+
+def get_search_cache_stats() -> Dict[str, Any]:
+    """Aciertos, fallos y bytes ahorrados (respuestas de Serper servidas desde caché)"""
+    cache = get_search_cache()
+    if cache is None:
+        return {"enabled": False}
+    stats = cache.get_stats()
+    return {"enabled": True, "bytes_saved": stats.pop("hit_bytes"), **stats}
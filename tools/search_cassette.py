@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+from config.settings import AcademicConfig
+from tools.search_cache import build_search_cache_key
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_MODES = ("off", "record", "replay")
+
+
+class CassetteMissError(LookupError):
+    """La petición no está grabada en el cassette"""
+
+
+class SearchCassette:
+    """
+    Grabación y reproducción de las búsquedas de ``WebSearchTool``.
+
+    En modo ``record`` cada búsqueda (y cada página descargada) se hace de
+    verdad a través de los backends configurados y se guarda en un fichero JSON junto con su latencia. En modo
+    ``replay`` las respuestas salen del fichero sin tocar la red, tras
+    esperar la latencia grabada o ``latency_ms`` si se indica. Las
+    búsquedas se identifican con la misma clave normalizada que la caché de
+    Serper; una búsqueda no grabada falla con ``CassetteMissError``.
+    """
+
+    def __init__(self, path: str, mode: str, latency_ms: Optional[float] = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Modo de cassette no válido: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self._lock = threading.Lock()
+        self._searches: Dict[str, Dict[str, Any]] = {}
+        self._pages: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            if self.replaying:
+                raise FileNotFoundError(f"No existe el cassette {self.path}")
+            return
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        self._searches = data.get("searches", {})
+        self._pages = data.get("pages", {})
+
+    def _save(self) -> None:
+        """Escribe el cassette de forma atómica (fichero temporal + rename)"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "searches": self._searches, "pages": self._pages}, f,
+                      ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def _simulate_latency(self, recorded_ms: List[float]) -> float:
+        """Las peticiones de un lote se harían en paralelo: se espera la más lenta, una sola vez"""
+        if self.latency_ms is not None:
+            delay_ms = self.latency_ms if recorded_ms else 0
+        else:
+            delay_ms = max(recorded_ms, default=0)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        return delay_ms
+
+    def search_many(self, payloads: List[Dict[str, Any]], api_key: Optional[str]) -> List[Tuple[Any, Dict[str, Any]]]:
+        """Misma interfaz que ``SearchRouter.search_many``: (respuesta o excepción, origen) en orden"""
+        keys = [build_search_cache_key(payload) for payload in payloads]
+        if self.replaying:
+            with self._lock:
+                entries = [self._searches.get(key) for key in keys]
+            delay_ms = self._simulate_latency([entry["latency_ms"] for entry in entries if entry])
+            return [(entry["response"], {"backend": "cassette", "latency_ms": delay_ms}) if entry else
+                    (CassetteMissError(f"búsqueda no grabada en el cassette: '{payload.get('q')}'"),
+                     {"backend": "cassette", "latency_ms": 0.0})
+                    for payload, entry in zip(payloads, entries)]
+
+        from tools.search_backends import get_search_router
+
+        served = get_search_router().search_many(payloads, api_key)
+        with self._lock:
+            for key, payload, (response, source) in zip(keys, payloads, served):
+                if not isinstance(response, Exception):
+                    self._searches[key] = {"request": payload, "response": response,
+                                           "backend": source["backend"], "latency_ms": source["latency_ms"]}
+            self._save()
+        return served
+
+    def fetch_many(self, urls: List[str]) -> List[Optional[str]]:
+        """Misma interfaz que ``PageFetcher.fetch_many``: texto de cada URL (None si no hay)"""
+        if self.replaying:
+            with self._lock:
+                entries = [self._pages.get(url) for url in urls]
+            self._simulate_latency([entry["latency_ms"] for entry in entries if entry])
+            return [entry["text"] if entry else None for entry in entries]
+
+        from tools.page_fetcher import get_page_fetcher
+
+        fetcher = get_page_fetcher()
+        if fetcher is None:
+            return [None] * len(urls)
+        start = time.perf_counter()
+        texts = fetcher.fetch_many(urls)
+        latency_ms = round((time.perf_counter() - start) * 1000, 1)
+        with self._lock:
+            for url, text in zip(urls, texts):
+                if text:
+                    self._pages[url] = {"text": text, "latency_ms": latency_ms}
+            self._save()
+        return texts
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"mode": self.mode, "path": self.path, "searches": len(self._searches),
+                    "pages": len(self._pages)}
+
+
+_cassette: Optional[SearchCassette] = None
+_cassette_lock = threading.Lock()
+
+
+def get_search_cassette() -> Optional[SearchCassette]:
+    """Cassette del proceso según SEARCH_CASSETTE_MODE (None si está en ``off``)"""
+    global _cassette
+    settings = AcademicConfig.SEARCH_CASSETTE
+    mode = settings["mode"]
+    if mode not in CASSETTE_MODES:
+        raise ValueError(f"SEARCH_CASSETTE_MODE debe ser uno de {', '.join(CASSETTE_MODES)}: {mode}")
+    if mode == "off":
+        return None
+    if _cassette is None or _cassette.mode != mode or _cassette.path != settings["path"]:
+        with _cassette_lock:
+            if _cassette is None or _cassette.mode != mode or _cassette.path != settings["path"]:
+                _cassette = SearchCassette(settings["path"], mode, settings["latency_ms"])
+                logger.info(f"Búsquedas en modo {mode} con el cassette {settings['path']}")
+    return _cassette
+
+
+def get_search_cassette_stats() -> Optional[Dict[str, Any]]:
+    """Modo y contenido del cassette activo (None si no se graba ni reproduce)"""
+    cassette = get_search_cassette()
+    return cassette.get_stats() if cassette else None
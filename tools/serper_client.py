@@ -0,0 +1,136 @@
+import atexit
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Tuple, Union
+from config.settings import AcademicConfig
+from config.rate_limiter import get_rate_limiter, parse_retry_after, RETRYABLE_STATUS
+from tools.http_session import BackgroundHTTPClient
+
+logger = logging.getLogger(__name__)
+
+
+class SerperClient(BackgroundHTTPClient):
+    """
+    Cliente HTTP asíncrono para Serper con una sesión aiohttp compartida.
+
+    Cada petición tiene timeout y la concurrencia está acotada.
+    """
+
+    thread_name = "serper-client"
+
+    def __init__(self, endpoint: str, timeout_seconds: float = 15, max_concurrency: int = 8,
+                 connection_limit: int = 16):
+        super().__init__()
+        self.endpoint = endpoint
+        self.timeout_seconds = timeout_seconds
+        self.max_concurrency = max_concurrency
+        self.connection_limit = connection_limit
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _create_session(self):
+        import aiohttp
+
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.connection_limit, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=self.timeout_seconds)
+        )
+
+    async def _post(self, payload: Dict[str, Any], api_key: str) -> Dict[str, Any]:
+        """Envía una búsqueda respetando el limitador de Serper; reintenta 429/5xx y timeouts"""
+        import aiohttp
+
+        session = await self._get_session()
+        headers = {"X-API-KEY": api_key, "Content-Type": "application/json"}
+        limiter = get_rate_limiter("serper")
+        max_retries = AcademicConfig.RATE_LIMITS["max_retries"]
+
+        async with self._semaphore:
+            for attempt in range(max_retries + 1):
+                await limiter.acquire_async()
+                status, retry_after, released = None, None, False
+                try:
+                    async with session.post(self.endpoint, json=payload, headers=headers) as response:
+                        status = response.status
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                        response.raise_for_status()
+                        data = await response.json(content_type=None)
+                    limiter.release(status)
+                    released = True
+                    return data
+                except (aiohttp.ClientResponseError, aiohttp.ClientConnectionError, aiohttp.ClientPayloadError,
+                        asyncio.TimeoutError, ValueError) as e:
+                    limiter.release(status, retry_after)
+                    released = True
+                    # Un cuerpo truncado o que no es JSON (aunque sea un 200) también se reintenta
+                    retryable = (status is None or status in RETRYABLE_STATUS
+                                 or not isinstance(e, aiohttp.ClientResponseError))
+                    if not retryable or attempt == max_retries:
+                        if isinstance(e, asyncio.TimeoutError):
+                            raise TimeoutError(f"timeout de {self.timeout_seconds}s consultando '{payload.get('q')}'")
+                        if isinstance(e, ValueError):
+                            raise ValueError(f"respuesta de Serper que no es JSON para '{payload.get('q')}'") from e
+                        raise
+                    delay = limiter.backoff_delay(attempt, retry_after)
+                    logger.warning(f"Serper respondió {status or type(e).__name__}; "
+                                   f"reintento {attempt + 1} en {delay:.1f}s")
+                finally:
+                    # Cualquier otra salida (cancelación, error inesperado) también devuelve el hueco
+                    if not released:
+                        limiter.abandon()
+                await asyncio.sleep(delay)
+
+    async def _timed_post(self, payload: Dict[str, Any], api_key: str) -> Tuple[Any, float]:
+        """Búsqueda y su latencia (incluidas esperas y reintentos); la excepción se devuelve en lugar del resultado"""
+        start = time.perf_counter()
+        try:
+            result = await self._post(payload, api_key)
+        except Exception as e:
+            result = e
+        return result, time.perf_counter() - start
+
+    async def _post_many(self, payloads: List[Dict[str, Any]], api_key: str) -> List[Tuple[Any, float]]:
+        return await asyncio.gather(*(self._timed_post(payload, api_key) for payload in payloads))
+
+    def search_many_timed(self, payloads: List[Dict[str, Any]], api_key: str) -> List[Tuple[Any, float]]:
+        """Como ``search_many`` pero devuelve pares (respuesta o excepción, segundos)"""
+        if not payloads:
+            return []
+        return self.run(self._post_many(payloads, api_key))
+
+    def search_many(self, payloads: List[Dict[str, Any]], api_key: str) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Ejecuta varias búsquedas en paralelo y devuelve sus respuestas en el
+        mismo orden; una búsqueda fallida devuelve su excepción en su posición.
+        """
+        return [result for result, _ in self.search_many_timed(payloads, api_key)]
+
+    def search(self, payload: Dict[str, Any], api_key: str) -> Dict[str, Any]:
+        """Ejecuta una búsqueda reutilizando la sesión compartida"""
+        result = self.search_many([payload], api_key)[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+_serper_client: Optional[SerperClient] = None
+_serper_client_lock = threading.Lock()
+
+
+def get_serper_client() -> SerperClient:
+    """Obtiene el cliente de Serper del proceso (se crea de forma perezosa)"""
+    global _serper_client
+    if _serper_client is None:
+        with _serper_client_lock:
+            if _serper_client is None:
+                settings = AcademicConfig.SEARCH
+                _serper_client = SerperClient(
+                    settings["endpoint"],
+                    timeout_seconds=settings["timeout_seconds"],
+                    max_concurrency=settings["max_concurrency"],
+                    connection_limit=settings["connection_limit"]
+                )
+                atexit.register(_serper_client.close)
+    return _serper_client
@@ -0,0 +1,105 @@
+import re
+import json
+import hashlib
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+from tools.tool_metrics import mark_coalesced_call
+
+
+class _Call:
+    """Ejecución en vuelo compartida por todos los llamadores con la misma clave"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalescencia de llamadas concurrentes (patrón singleflight).
+
+    Mientras una llamada con cierta clave está en vuelo, los demás
+    llamadores con la misma clave esperan su resultado en lugar de repetir
+    el trabajo. Al terminar, la clave se libera: no es una caché.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Ejecuta ``func`` (o espera a la ejecución en vuelo); devuelve (resultado, compartido)"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
+
+
+# Un solo grupo por proceso: coalesce llamadas de todos los crews que comparten contenedor
+_flights = SingleFlight()
+
+
+def normalize_arg(value: Any) -> Any:
+    """Normaliza argumentos de texto (minúsculas y espacios colapsados) para comparar consultas"""
+    if isinstance(value, str):
+        return re.sub(r'\s+', ' ', value).strip().lower()
+    if isinstance(value, (list, tuple)):
+        return [normalize_arg(item) for item in value]
+    if isinstance(value, dict):
+        return {key: normalize_arg(item) for key, item in value.items()}
+    return value
+
+
+def coalesce_tool_call(normalize: Optional[Callable[[Any], Any]] = None):
+    """
+    Decorador para ``_run`` de las herramientas: llamadas concurrentes con
+    los mismos argumentos (normalizados con ``normalize`` si se indica)
+    comparten una única ejecución.
+
+    Se aplica por debajo de ``track_tool_call`` para que cada llamador
+    registre su propia invocación, marcada como coalescida.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            arguments = {"args": list(args), "kwargs": kwargs}
+            if normalize is not None:
+                arguments = normalize(arguments)
+            signature = json.dumps({"tool": f"{type(self).__module__}.{type(self).__qualname__}", **arguments},
+                                   ensure_ascii=False, sort_keys=True, default=str)
+            key = hashlib.sha256(signature.encode("utf-8")).hexdigest()
+
+            result, shared = _flights.do(key, lambda: func(self, *args, **kwargs))
+            if shared:
+                mark_coalesced_call()
+            return result
+
+        return wrapper
+
+    return decorator
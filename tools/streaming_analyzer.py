@@ -0,0 +1,231 @@
+import os
+from collections import Counter
+from itertools import chain
+from typing import Dict, List, Iterable, Iterator, Optional, Union
+from config.settings import AcademicConfig
+from tools.analyzer_terms import get_analyzer_terms
+from tools.paragraph_cache import ParagraphMetrics, has_open_tail, OPEN_TAIL_RE
+
+# Tamaño de cada lectura al analizar un archivo
+FILE_CHUNK_CHARS = 64 * 1024
+
+
+class StreamedDocument:
+    """
+    Métricas de un texto analizado en streaming.
+
+    Expone los mismos atributos que ``ParsedDocument`` lee ContentAnalyzerTool
+    para calcular sus métricas, pero sin conservar el texto.
+    """
+
+    def __init__(self, **metrics):
+        self.__dict__.update(metrics)
+
+
+class StreamingAnalyzer:
+    """
+    Análisis incremental de un texto que llega por fragmentos, con memoria acotada.
+
+    El texto se corta en los separadores de bloque (línea en blanco) y, si un
+    bloque supera ``max_buffer_chars``, en un salto de línea. Cada trozo se
+    analiza con ``ParagraphMetrics`` y se suma a los totales, igual que hace
+    la caché de párrafos. Las palabras, oraciones y términos nunca cruzan un
+    salto de línea, así que los cortes no cambian ninguna métrica. Un trozo
+    que termina en un marcador de header o de lista se une con el siguiente
+    antes de analizarlo. Si el trozo arrastrado supera ``max_buffer_chars``,
+    se analiza hasta su última línea que no es un marcador ni está en blanco
+    (lo anterior no puede unirse con el texto siguiente) y solo se arrastra
+    la racha final de líneas de marcadores. Únicamente si esa racha por sí
+    sola supera ``max_buffer_chars`` se analiza sin esperar al texto
+    siguiente, y los conteos de headers y listas de esa frontera pueden
+    diferir del análisis del texto completo.
+
+    La memoria depende del bloque o línea más largos y del vocabulario (el
+    contador de keywords), no del tamaño total del texto. Si algún término
+    configurado contiene un salto de línea, el texto no se puede cortar y se
+    analiza entero al cerrar.
+    """
+
+    def __init__(self, max_buffer_chars: Optional[int] = None):
+        self.max_buffer_chars = max_buffer_chars or AcademicConfig.CONTENT_ANALYSIS["stream_buffer_chars"]
+        self._terms = get_analyzer_terms()
+        self._splittable = not any('\n' in term for term in
+                                   chain(self._terms.seo_matcher.terms, self._terms.gap_matcher.terms))
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        self._drain_at = self.max_buffer_chars
+        self._ends_with_newline = False
+        self._carry = ""
+        self._block_has_text = False
+        self._first_block_done = False
+        self._closed = False
+
+        self.character_count = 0
+        self.space_count = 0
+        self.paragraph_count = 0
+        self.intro_word_count = 0
+        self.word_count = 0
+        self._sentence_breaks = 0
+        self.syllable_count = 0
+        self.clean_word_counts: Counter = Counter()
+        self.headers: List[str] = []
+        self.bullet_points = 0
+        self.numbered_items = 0
+        self.link_count = 0
+        self.email_count = 0
+        self.bold_count = 0
+        self.italic_count = 0
+        self.mentions_conclusion = False
+        self.seo_term_counts: Dict[str, int] = dict.fromkeys(self._terms.seo_matcher.terms, 0)
+        self.gap_terms_found = set()
+
+    def feed(self, chunk: str) -> None:
+        """Añade el siguiente fragmento del texto"""
+        if not chunk:
+            return
+        self.character_count += len(chunk)
+        self.space_count += chunk.count(" ")
+
+        # El separador de bloque puede quedar partido entre dos fragmentos
+        has_separator = '\n\n' in chunk or (self._ends_with_newline and chunk[0] == '\n')
+        self._ends_with_newline = chunk[-1] == '\n'
+        self._pending.append(chunk)
+        self._pending_chars += len(chunk)
+
+        if self._splittable and (has_separator or self._pending_chars > self._drain_at):
+            self._drain()
+
+    def _drain(self) -> None:
+        """Analiza los bloques completos del buffer y, si sigue siendo grande, corta en un salto de línea"""
+        blocks = ''.join(self._pending).split('\n\n')
+        rest = blocks.pop()
+        for block in blocks:
+            self._add_piece(block, '\n\n')
+            self._end_block()
+
+        if len(rest) > self.max_buffer_chars:
+            # Un salto de línea al final del buffer puede ser la mitad de un separador de bloque
+            cut = rest.rfind('\n', 0, len(rest) - 1)
+            while cut > 0 and has_open_tail(rest[:cut]):
+                cut = rest.rfind('\n', 0, cut)
+            if cut > 0:
+                self._add_piece(rest[:cut], '\n')
+                rest = rest[cut + 1:]
+
+        self._pending = [rest]
+        self._pending_chars = len(rest)
+        # Una línea más larga que el buffer no se puede cortar: se espera a otro bloque de datos
+        self._drain_at = len(rest) + self.max_buffer_chars
+
+    def _add_piece(self, piece: str, separator: str) -> None:
+        """Suma las métricas de un trozo seguido de ``separator`` en el texto original"""
+        if not self._block_has_text and piece.strip():
+            self._block_has_text = True
+        if not self._first_block_done:
+            self.intro_word_count += len(piece.split())
+
+        piece = self._carry + piece
+        if separator and has_open_tail(piece):
+            if len(piece) > self.max_buffer_chars:
+                cut = _marker_run_start(piece)
+                if cut > 0:
+                    self._accumulate(ParagraphMetrics(piece[:cut], self._terms))
+                    piece = piece[cut + 1:]
+            if len(piece) <= self.max_buffer_chars:
+                self._carry = piece + separator
+                return
+        self._carry = ""
+        self._accumulate(ParagraphMetrics(piece, self._terms))
+
+    def _end_block(self) -> None:
+        if self._block_has_text:
+            self.paragraph_count += 1
+        self._block_has_text = False
+        self._first_block_done = True
+
+    def _accumulate(self, partial: ParagraphMetrics) -> None:
+        self.word_count += partial.word_count
+        self._sentence_breaks += partial.sentence_breaks
+        self.syllable_count += partial.syllable_count
+        self.clean_word_counts.update(partial.clean_words)
+        self.headers.extend(partial.headers)
+        self.bullet_points += partial.bullet_points
+        self.numbered_items += partial.numbered_items
+        self.link_count += len(partial.links)
+        self.email_count += partial.email_count
+        self.bold_count += partial.bold_count
+        self.italic_count += partial.italic_count
+        self.mentions_conclusion = self.mentions_conclusion or partial.mentions_conclusion
+        for term, count in partial.seo_term_counts.items():
+            self.seo_term_counts[term] += count
+        self.gap_terms_found |= partial.gap_terms_found
+
+    def close(self) -> StreamedDocument:
+        """Analiza el texto que queda en el buffer y devuelve las métricas del texto completo"""
+        if not self._closed:
+            if self._splittable:
+                self._add_piece(''.join(self._pending), '')
+                self._end_block()
+            else:
+                self._add_whole(''.join(self._pending))
+            self._pending, self._closed = [], True
+
+        return StreamedDocument(
+            character_count=self.character_count,
+            space_count=self.space_count,
+            paragraph_count=self.paragraph_count,
+            intro_word_count=self.intro_word_count if self.character_count else 0,
+            word_count=self.word_count,
+            sentence_count=self._sentence_breaks + 1,
+            syllable_count=self.syllable_count,
+            clean_word_counts=self.clean_word_counts,
+            headers=self.headers,
+            bullet_points=self.bullet_points,
+            numbered_items=self.numbered_items,
+            link_count=self.link_count,
+            email_count=self.email_count,
+            bold_count=self.bold_count,
+            italic_count=self.italic_count,
+            mentions_conclusion=self.mentions_conclusion,
+            seo_term_counts=self.seo_term_counts,
+            gap_terms_found=self.gap_terms_found
+        )
+
+    def _add_whole(self, content: str) -> None:
+        """Texto sin cortes (términos con saltos de línea): bloques e introducción del texto completo"""
+        blocks = content.split('\n\n')
+        self.paragraph_count = sum(1 for block in blocks if block.strip())
+        self.intro_word_count = len(blocks[0].split())
+        self._accumulate(ParagraphMetrics(content, self._terms))
+
+
+def _marker_run_start(text: str) -> int:
+    """Posición del salto de línea que precede a la racha final de líneas de marcadores o en blanco (-1 si no hay)"""
+    end = len(text)
+    while end > 0:
+        start = text.rfind('\n', 0, end) + 1
+        line = text[start:end].rstrip()
+        if line and not OPEN_TAIL_RE.fullmatch(line):
+            return end
+        end = start - 1
+    return -1
+
+
+def iter_file_chunks(path: Union[str, os.PathLike], chunk_chars: int = FILE_CHUNK_CHARS) -> Iterator[str]:
+    """Lee un archivo de texto UTF-8 por fragmentos (mismos saltos de línea que ``open(path).read()``)"""
+    with open(path, encoding="utf-8") as f:
+        while True:
+            chunk = f.read(chunk_chars)
+            if not chunk:
+                return
+            yield chunk
+
+
+def stream_document(source: Union[str, os.PathLike, Iterable[str]],
+                    max_buffer_chars: Optional[int] = None) -> StreamedDocument:
+    """Métricas de una ruta de archivo (``str`` o ``PathLike``) o de un iterable de fragmentos de texto"""
+    chunks = iter_file_chunks(source) if isinstance(source, (str, os.PathLike)) else source
+    analyzer = StreamingAnalyzer(max_buffer_chars)
+    for chunk in chunks:
+        analyzer.feed(chunk)
+    return analyzer.close()
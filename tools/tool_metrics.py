@@ -0,0 +1,53 @@
+import time
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+# Destino de las métricas de herramientas para el hilo actual (la tarea en ejecución)
+_local = threading.local()
+
+
+def set_tool_call_sink(sink: Optional[Callable[..., None]]) -> None:
+    """Registra quién recibe las llamadas a herramientas hechas desde este hilo"""
+    _local.sink = sink
+
+
+def record_tool_call(tool_name: str, seconds: float, success: bool = True, coalesced: bool = False,
+                     details: Optional[Dict[str, Any]] = None) -> None:
+    """Notifica una invocación de herramienta al sink del hilo (si hay uno activo)"""
+    sink = getattr(_local, 'sink', None)
+    if sink is not None:
+        sink(tool_name, seconds, success, coalesced, details or {})
+
+
+def mark_coalesced_call() -> None:
+    """Indica que la invocación en curso reutilizó el resultado de otra idéntica en vuelo"""
+    _local.coalesced = True
+
+
+def add_tool_call_detail(key: str, value: Any) -> None:
+    """Adjunta un dato (p. ej. el informe de deduplicación de una consulta) a la invocación en curso"""
+    details = getattr(_local, 'details', None)
+    if details is not None:
+        details.setdefault(key, []).append(value)
+
+
+def track_tool_call(func):
+    """Decorador para ``_run`` de las herramientas: mide latencia y resultado de cada invocación"""
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        success = False
+        _local.coalesced = False
+        _local.details = {}
+        try:
+            result = func(self, *args, **kwargs)
+            # Las herramientas devuelven los errores como texto en lugar de lanzar excepciones
+            success = not (isinstance(result, str) and result.startswith("Error"))
+            return result
+        finally:
+            record_tool_call(getattr(self, 'name', type(self).__name__), time.perf_counter() - start, success,
+                             coalesced=getattr(_local, 'coalesced', False), details=_local.details)
+            _local.details = None
+
+    return wrapper
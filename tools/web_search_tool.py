@@ -1,20 +1,35 @@
 import os
-import requests
-from typing import Dict, List, Any
+import json
+import logging
+from typing import Dict, List, Any, Optional, Tuple
 from crewai_tools import BaseTool
 from pydantic import BaseModel, Field
+from tools.tool_metrics import track_tool_call, add_tool_call_detail
+from tools.singleflight import coalesce_tool_call, normalize_arg
+from tools.search_backends import get_search_router
+from tools.search_cache import get_search_cache, build_search_cache_key
+from tools.search_cassette import get_search_cassette
+from tools.page_fetcher import PageFetcher, get_page_fetcher
+from tools.result_dedup import ResultDeduplicator
+from tools.result_renderer import render_results
+from tools.analyzer_terms import get_analyzer_terms
+from config.settings import AcademicConfig
+
+logger = logging.getLogger(__name__)
 
 class WebSearchInput(BaseModel):
     """Input para la herramienta de búsqueda web"""
     query: str = Field(..., description="Consulta de búsqueda")
     num_results: int = Field(default=10, description="Número de resultados")
+    queries: Optional[List[str]] = Field(default=None, description="Consultas adicionales a ejecutar en paralelo con la principal")
 
 class WebSearchTool(BaseTool):
     name: str = "Web Search Tool"
     description: str = """
     Herramienta para buscar información actualizada en internet.
     Úsala para encontrar las últimas tendencias, estadísticas y 
-    artículos sobre content marketing.
+    artículos sobre content marketing. Para varias búsquedas relacionadas,
+    pásalas juntas en 'queries': se ejecutan en paralelo.
     """
     args_schema: type[BaseModel] = WebSearchInput
     
@@ -22,55 +37,140 @@ class WebSearchTool(BaseTool):
         super().__init__()
         self.serper_api_key = os.getenv('SERPER_API_KEY')
         
-    def _run(self, query: str, num_results: int = 10) -> str:
+    @track_tool_call
+    @coalesce_tool_call(normalize=normalize_arg)
+    def _run(self, query: str, num_results: int = 10, queries: Optional[List[str]] = None) -> str:
         """Ejecuta la búsqueda web"""
-        if not self.serper_api_key:
-            return "Error: SERPER_API_KEY no configurada"
+        if queries:
+            all_queries = list(dict.fromkeys([query] + list(queries)))
+            results = self.run_many(all_queries, num_results)
+            return "\n\n".join(f"### Resultados para: {q}\n{result}" for q, result in zip(all_queries, results))
+        
+        return self.run_many([query], num_results)[0]
+    
+    def run_many(self, queries: List[str], num_results: int = 10,
+                 token_budget: Optional[int] = None) -> List[str]:
+        """
+        Ejecuta varias búsquedas de forma concurrente sobre la sesión HTTP
+        compartida y devuelve los resultados formateados en el orden de ``queries``.
+        Las respuestas se sirven desde la caché persistente cuando es posible y
+        se completan con el texto principal de las páginas de los primeros resultados.
+        ``token_budget`` (por defecto el de AcademicConfig.SEARCH_RENDER) se
+        reparte a partes iguales entre las consultas.
+        """
+        cassette = get_search_cassette()
+        if not get_search_router().available_backends(self.serper_api_key) and not (cassette and cassette.replaying):
+            return ["Error: SERPER_API_KEY no configurada y ningún otro backend de búsqueda disponible"
+                    for _ in queries]
+        
+        payloads = [self._build_payload(query, num_results) for query in queries]
+        served = self._search_with_cache(payloads)
+        responses = [response for response, _ in served]
+        pages = self._fetch_top_pages(responses)
+        
+        if token_budget is None:
+            token_budget = AcademicConfig.SEARCH_RENDER["token_budget"]
+        query_budget = token_budget // len(queries) if token_budget else None
+        
+        # Los duplicados se eliminan también entre consultas: se conserva la primera copia
+        deduplicator = ResultDeduplicator()
+        results = []
+        for query, (response, source) in zip(queries, served):
+            logger.info(f"Búsqueda '{query}' servida por {source['backend']} en {source['latency_ms']} ms")
+            add_tool_call_detail("backend", {"query": query, **source})
+            if isinstance(response, Exception):
+                results.append(f"Error en la búsqueda: {str(response)}")
+                continue
+            
+            deduped, removed = deduplicator.dedupe(response, pages)
+            if removed:
+                # Ahorro medido sin presupuesto: con él, los duplicados solo dejarían sitio a otros resultados
+                tokens_removed = self._format_results(response, pages)[1] - self._format_results(deduped, pages)[1]
+                logger.info(f"Búsqueda '{query}': {removed} resultados duplicados eliminados ({tokens_removed} tokens)")
+                add_tool_call_detail("dedup", {"query": query, "results_removed": removed,
+                                               "tokens_removed": tokens_removed})
             
-        url = "https://google.serper.dev/search"
+            formatted, tokens, dropped = self._format_results(deduped, pages, query_budget)
+            add_tool_call_detail("render", {"query": query, "tokens": tokens, "token_budget": query_budget,
+                                            "results_dropped": dropped})
+            results.append(formatted)
+        
+        return results
+    
+    @staticmethod
+    def _fetch_top_pages(responses: List[Any]) -> Dict[str, str]:
+        """Descarga en paralelo las páginas de los primeros resultados orgánicos de cada búsqueda"""
+        fetcher = get_page_fetcher()
+        if fetcher is None:
+            return {}
+        
+        top_n = AcademicConfig.PAGE_FETCH["top_n"]
+        selected = []
+        for response in responses:
+            if isinstance(response, Exception):
+                continue
+            links = [result.get('link') for result in response.get('organic', [])]
+            selected.extend([link for link in links if PageFetcher.is_fetchable(link)][:top_n])
+        selected = list(dict.fromkeys(selected))
+        
+        cassette = get_search_cassette()
+        texts = (cassette or fetcher).fetch_many(selected)
+        return {url: text for url, text in zip(selected, texts) if text}
+    
+    def _search_with_cache(self, payloads: List[Dict[str, Any]]) -> List[Tuple[Any, Dict[str, Any]]]:
+        """
+        Consulta la caché y envía a los backends solo las búsquedas que no
+        están en ella. Devuelve, por búsqueda, la respuesta (o su excepción) y
+        de dónde salió: {backend, latency_ms}.
+        """
+        # Con cassette no se usa la caché: se graban (o reproducen) todas las búsquedas
+        cassette = get_search_cassette()
+        if cassette is not None:
+            return cassette.search_many(payloads, self.serper_api_key)
+        
+        cache = get_search_cache()
+        if cache is None:
+            return get_search_router().search_many(payloads, self.serper_api_key)
         
-        payload = {
+        keys = [build_search_cache_key(payload) for payload in payloads]
+        responses: List[Tuple[Any, Dict[str, Any]]] = []
+        missing = []
+        for index, key in enumerate(keys):
+            cached = cache.get(key)
+            responses.append((json.loads(cached), {"backend": "cache", "latency_ms": 0.0})
+                             if cached is not None else None)
+            if cached is None:
+                missing.append(index)
+        
+        fetched = get_search_router().search_many([payloads[index] for index in missing], self.serper_api_key)
+        for index, (response, source) in zip(missing, fetched):
+            responses[index] = (response, source)
+            # El índice local responde al instante y puede cambiar: no se guarda en caché
+            if not isinstance(response, Exception) and source["backend"] != "local":
+                cache.set(keys[index], json.dumps(response, ensure_ascii=False))
+        
+        return responses
+    
+    @staticmethod
+    def _build_payload(query: str, num_results: int) -> Dict[str, Any]:
+        return {
             "q": query,
             "num": num_results,
             "gl": "us",
             "hl": "en"
         }
-        
-        headers = {
-            "X-API-KEY": self.serper_api_key,
-            "Content-Type": "application/json"
-        }
-        
-        try:
-            response = requests.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            
-            data = response.json()
-            results = []
-            
-            # Procesar resultados orgánicos
-            if 'organic' in data:
-                for result in data['organic']:
-                    results.append(f"""
-                    Título: {result.get('title', 'N/A')}
-                    URL: {result.get('link', 'N/A')}
-                    Snippet: {result.get('snippet', 'N/A')}
-                    """)
-            
-            # Procesar noticias si están disponibles
-            if 'news' in data:
-                for news in data['news'][:3]:  # Solo las primeras 3 noticias
-                    results.append(f"""
-                    [NOTICIA] Título: {news.get('title', 'N/A')}
-                    URL: {news.get('link', 'N/A')}
-                    Snippet: {news.get('snippet', 'N/A')}
-                    Fecha: {news.get('date', 'N/A')}
-                    """)
-            
-            return "\n".join(results) if results else "No se encontraron resultados"
-            
-        except Exception as e:
-            return f"Error en la búsqueda: {str(e)}"
+    
+    @staticmethod
+    def _format_results(data: Dict[str, Any], pages: Optional[Dict[str, str]] = None,
+                        token_budget: Optional[int] = None) -> Tuple[str, int, int]:
+        """
+        Convierte la respuesta de Serper (y el texto de las páginas descargadas)
+        en el texto compacto que recibe el agente; devuelve (texto, tokens,
+        resultados descartados por el presupuesto)
+        """
+        settings = AcademicConfig.SEARCH_RENDER
+        return render_results(data, pages, token_budget=token_budget,
+                              snippet_chars=settings["snippet_chars"], page_chars=settings["page_chars"])
 
 class ContentAnalyzerTool(BaseTool):
     name: str = "Content Analyzer Tool"
@@ -79,21 +179,16 @@ class ContentAnalyzerTool(BaseTool):
     Identifica tendencias, métricas importantes y puntos clave.
     """
     
+    @track_tool_call
+    @coalesce_tool_call()
     def _run(self, content: str) -> str:
         """Analiza el contenido y extrae insights"""
-        # Palabras clave relacionadas con content marketing
-        marketing_keywords = [
-            'AI', 'artificial intelligence', 'automation', 'personalization',
-            'video marketing', 'social media', 'SEO', 'content strategy',
-            'engagement', 'conversion', 'ROI', 'analytics', 'influencer',
-            'user-generated content', 'interactive content', 'storytelling'
-        ]
-        
         insights = []
-        content_lower = content.lower()
         
-        # Buscar palabras clave
-        found_keywords = [kw for kw in marketing_keywords if kw.lower() in content_lower]
+        # Buscar palabras clave de content marketing
+        terms = get_analyzer_terms()
+        present = terms.trend_matcher.found(content.lower())
+        found_keywords = [kw for kw in terms.trend_keywords if kw.lower() in present]
         
         if found_keywords:
             insights.append(f"Tendencias identificadas: {', '.join(found_keywords[:5])}")